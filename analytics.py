@@ -0,0 +1,290 @@
+# analytics.py
+import math
+import threading
+import time
+
+import numpy as np
+import sqlalchemy as sa
+
+# Claims checked at or after a high-water mark; the overlap re-reads recent claims in case
+# a save with an earlier timestamp committed after the last refresh
+CLAIM_QUERY = """
+    SELECT claim.id, claim.date_checked, claim.veracity_probability, claim.final_truth_score
+    FROM claim WHERE {condition}
+"""
+SOURCE_QUERY = "SELECT source.id, source.claim_id, source.intent_category FROM source WHERE {condition}"
+# Criteria come back as their index in `criteria`, so score rows are all numbers
+SCORE_QUERY = """
+    SELECT craap_score.source_id, CASE craap_score.criterion {cases} END, craap_score.score
+    FROM craap_score JOIN source ON source.id = craap_score.source_id
+    WHERE craap_score.criterion IN ({names}) AND {condition}
+"""
+# Claims per query when reloading just the ones that changed
+CHUNK_SIZE = 500
+
+CLAIM_RECORD = np.dtype([('id', '<i8'), ('checked', '<M8[us]'), ('day', '<i4'), ('veracity', '<f8'), ('final', '<f8')])
+SOURCE_RECORD = np.dtype([('id', '<i8'), ('claim_id', '<i8'), ('day', '<i4'), ('intent', '<i4')])
+SCORE_ROW = np.dtype([('source_id', '<i8'), ('criterion', '<i4'), ('score', '<f4')])
+SCORE_RECORD = np.dtype([('claim_id', '<i8'), ('day', '<i4'), ('intent', '<i4'), ('criterion', '<i4'), ('score', '<f4')])
+
+PERIODS = {'day': 'D', 'week': 'W', 'month': 'M'}
+VERDICTS = ('True', 'Uncertain', 'False', 'Unknown')
+
+
+def verdict_codes(values, true_at=0.7, false_at=0.3):
+    # Index into VERDICTS, with the thresholds of interpret_final_score
+    return np.select([values >= true_at, values <= false_at, np.isnan(values)], [0, 2, 3], default=1)
+
+
+def _float(value):
+    return math.nan if value is None else value
+
+
+def _mean(sums, counts):
+    # Elementwise sums / counts as a flat list of JSON-ready numbers (None where there is nothing to average)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.asarray(sums / counts, dtype=np.float64)
+    return [None if math.isnan(value) else round(value, 4) for value in means.ravel().tolist()]
+
+
+def _positions(keys, values):
+    # Where each of `values` sits in the sorted array `keys`, and whether it is there at all
+    if not len(keys):
+        return np.zeros(len(values), dtype=np.intp), np.zeros(len(values), dtype=bool)
+    at = np.minimum(np.searchsorted(keys, values), len(keys) - 1)
+    return at, keys[at] == values
+
+
+class ScoreAnalytics:
+    """Columnar copy of the stored claims, sources and CRAAP scores, for aggregate statistics.
+
+    Each table is held as a NumPy structured array of numbers: intent
+    categories and criteria become integer codes into `intents` /
+    `criteria`, and every source and score row carries its claim's id and
+    the day it was checked. A summary bins all score rows into one
+    (day, intent, criterion) table of counts and sums with `np.bincount`
+    and reads every aggregate off that table, which is only rebuilt after a
+    refresh changed something.
+
+    `refresh` only reads claims checked since the last one (plus an
+    overlap); a re-verified claim's old rows are dropped and replaced with
+    its current ones. The new arrays are swapped in once read, so summaries
+    keep being served from the previous data while a refresh runs.
+    """
+
+    def __init__(self, criteria, overlap=300):
+        self.criteria = list(criteria)
+        self.intents = []
+        self._intent_codes = {}
+        self.overlap = np.timedelta64(overlap, 's')
+        # _lock guards the arrays and tables; _refresh_lock lets one refresh run at a time
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._claims = np.zeros(0, dtype=CLAIM_RECORD)
+        self._sources = np.zeros(0, dtype=SOURCE_RECORD)
+        self._scores = np.zeros(0, dtype=SCORE_RECORD)
+        self._since = None
+        self._tables = None
+        self.loaded = False
+        self.refreshed_at = 0.0
+        self.refresh_seconds = 0.0
+
+    def _intent_code(self, category):
+        category = category or 'Unknown'
+        code = self._intent_codes.get(category)
+        if code is None:
+            code = self._intent_codes[category] = len(self.intents)
+            self.intents.append(category)
+        return code
+
+    def refresh(self, connection, max_age=0, wait=True):
+        """Load whatever changed since the last refresh, unless that was less than `max_age` seconds ago.
+
+        With `wait` false, a refresh already running in another thread is
+        left to finish rather than waited for. Returns whether this call
+        refreshed.
+        """
+        if not self._refresh_lock.acquire(blocking=wait):
+            return False
+        try:
+            if max_age and time.time() - self.refreshed_at < max_age:
+                return False
+            start = time.perf_counter()
+            statement = sa.text(CLAIM_QUERY.format(
+                condition='1 = 1' if self._since is None else 'claim.date_checked >= :since'
+            )).columns(
+                sa.column('id'), sa.column('date_checked', sa.DateTime),
+                sa.column('veracity_probability'), sa.column('final_truth_score')
+            )
+            params = {} if self._since is None else {'since': (self._since - self.overlap).astype(object)}
+            claims = np.array(
+                [(claim_id, checked, 0, _float(veracity), _float(final))
+                 for claim_id, checked, veracity, final in connection.execute(statement, params)
+                 if checked is not None],
+                dtype=CLAIM_RECORD
+            )
+            claims['day'] = claims['checked'].astype('M8[D]').astype(np.int64)
+            claims = claims[np.argsort(claims['id'], kind='stable')]
+            if self._since is None:
+                sources, scores = self._rows(connection, claims)
+                with self._lock:
+                    self._claims, self._sources, self._scores = claims, sources, scores
+                    self._tables = None
+            else:
+                # Claims re-read through the overlap that haven't changed need no work
+                at, same = _positions(self._claims['id'], claims['id'])
+                same[same] = self._claims['checked'][at[same]] == claims['checked'][same]
+                if not same.all():
+                    self._replace(connection, claims[~same])
+            if len(claims):
+                latest = claims['checked'].max()
+                self._since = latest if self._since is None else max(self._since, latest)
+            self.loaded = True
+            self.refreshed_at = time.time()
+            self.refresh_seconds = time.perf_counter() - start
+            return True
+        finally:
+            self._refresh_lock.release()
+
+    def _read(self, connection, query, params):
+        statement = sa.text(query)
+        if 'ids' in params:
+            statement = statement.bindparams(sa.bindparam('ids', expanding=True))
+        return connection.execute(statement, params).all()
+
+    def _read_sources(self, connection, condition, params):
+        return np.array(
+            [(source_id, claim_id, 0, self._intent_code(intent))
+             for source_id, claim_id, intent in self._read(connection, SOURCE_QUERY.format(condition=condition), params)],
+            dtype=SOURCE_RECORD
+        )
+
+    def _read_scores(self, connection, condition, params):
+        names = {f'criterion_{code}': criterion for code, criterion in enumerate(self.criteria)}
+        query = SCORE_QUERY.format(
+            cases=' '.join(f'WHEN :{name} THEN {code}' for code, name in enumerate(names)),
+            names=', '.join(f':{name}' for name in names),
+            condition=condition
+        )
+        return np.array([tuple(row) for row in self._read(connection, query, {**names, **params})], dtype=SCORE_ROW)
+
+    def _rows(self, connection, claims, claim_ids=None):
+        # Source and score rows of `claims` (of every claim when `claim_ids` is None), joined in NumPy
+        if claim_ids is None:
+            sources = self._read_sources(connection, '1 = 1', {})
+            score_rows = self._read_scores(connection, '1 = 1', {})
+        else:
+            chunks = [{'ids': claim_ids[i:i + CHUNK_SIZE].tolist()} for i in range(0, len(claim_ids), CHUNK_SIZE)]
+            sources = np.concatenate([np.zeros(0, dtype=SOURCE_RECORD)] + [
+                self._read_sources(connection, 'source.claim_id IN :ids', params) for params in chunks
+            ])
+            score_rows = np.concatenate([np.zeros(0, dtype=SCORE_ROW)] + [
+                self._read_scores(connection, 'source.claim_id IN :ids', params) for params in chunks
+            ])
+        # Rows of claims that weren't read (saved since, or never checked) are left for a later refresh
+        at, found = _positions(claims['id'], sources['claim_id'])
+        sources = sources[found]
+        sources['day'] = claims['day'][at[found]]
+        sources = sources[np.argsort(sources['id'], kind='stable')]
+        at, found = _positions(sources['id'], score_rows['source_id'])
+        score_rows, at = score_rows[found], at[found]
+        scores = np.zeros(len(score_rows), dtype=SCORE_RECORD)
+        for name in ('claim_id', 'day', 'intent'):
+            scores[name] = sources[name][at]
+        scores['criterion'] = score_rows['criterion']
+        scores['score'] = score_rows['score']
+        return sources, scores
+
+    def _replace(self, connection, changed):
+        # A re-verified claim's previous rows are replaced, not added to
+        ids = changed['id']
+        sources, scores = self._rows(connection, changed, ids)
+        claims = np.concatenate([self._claims[~np.isin(self._claims['id'], ids)], changed])
+        claims = claims[np.argsort(claims['id'], kind='stable')]
+        sources = np.concatenate([self._sources[~np.isin(self._sources['claim_id'], ids)], sources])
+        scores = np.concatenate([self._scores[~np.isin(self._scores['claim_id'], ids)], scores])
+        with self._lock:
+            self._claims, self._sources, self._scores = claims, sources, scores
+            self._tables = None
+
+    def _build_tables(self):
+        # Counts and sums per (day, intent, criterion) for scores, and per (day, verdict) for claims
+        claims, sources, scores = self._claims, self._sources, self._scores
+        intents, criteria = len(self.intents), len(self.criteria)
+        first = int(claims['day'].min()) if len(claims) else 0
+        days = int(claims['day'].max()) - first + 1 if len(claims) else 0
+        cells = days * intents * criteria
+        keys = ((scores['day'] - first) * intents + scores['intent']) * criteria + scores['criterion']
+        claim_days = claims['day'] - first
+        scored = ~np.isnan(claims['final'])
+        return {
+            'first': first,
+            'intents': list(self.intents),
+            'rows': (len(claims), len(sources), len(scores)),
+            'score_counts': np.bincount(keys, minlength=cells).reshape(days, intents, criteria),
+            'score_sums': np.bincount(keys, weights=scores['score'], minlength=cells).reshape(days, intents, criteria),
+            'verdicts': np.bincount(
+                claim_days * len(VERDICTS) + verdict_codes(claims['final']), minlength=days * len(VERDICTS)
+            ).reshape(days, len(VERDICTS)),
+            'final_counts': np.bincount(claim_days[scored], minlength=days),
+            'final_sums': np.bincount(claim_days[scored], weights=claims['final'][scored], minlength=days),
+            'sources_by_intent': np.bincount(sources['intent'], minlength=intents),
+        }
+
+    def summary(self, period='month'):
+        """Row counts, verdict distribution, criterion means overall and by intent, and drift per period."""
+        with self._lock:
+            if self._tables is None:
+                self._tables = self._build_tables()
+            tables = self._tables
+        claims, sources, scores = tables['rows']
+        score_counts, score_sums = tables['score_counts'], tables['score_sums']
+        criteria_counts = score_counts.sum(axis=(0, 1))
+        criteria_means = _mean(score_sums.sum(axis=(0, 1)), criteria_counts)
+        criteria = len(self.criteria)
+        by_intent = _mean(score_sums.sum(axis=0), score_counts.sum(axis=0))
+        return {
+            'claims': claims,
+            'sources': sources,
+            'scores': scores,
+            'verdicts': dict(zip(VERDICTS, tables['verdicts'].sum(axis=0).tolist())),
+            'mean_final_truth_score': _mean(tables['final_sums'].sum(), tables['final_counts'].sum())[0],
+            'criteria': {
+                criterion: {'mean': criteria_means[code], 'scores': int(criteria_counts[code])}
+                for code, criterion in enumerate(self.criteria)
+            },
+            'by_intent': {
+                intent: {
+                    'sources': int(tables['sources_by_intent'][code]),
+                    **dict(zip(self.criteria, by_intent[code * criteria:(code + 1) * criteria])),
+                }
+                for code, intent in enumerate(tables['intents']) if tables['sources_by_intent'][code]
+            },
+            'drift': self._drift(tables, PERIODS[period]),
+            'refresh_seconds': round(self.refresh_seconds, 4),
+        }
+
+    def _drift(self, tables, unit):
+        # The per-day tables folded into calendar periods, oldest first; periods without claims are skipped
+        days = len(tables['final_counts'])
+        if not days:
+            return []
+        periods = np.arange(tables['first'], tables['first'] + days).astype('M8[D]').astype(f'M8[{unit}]')
+        starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+        verdicts = np.add.reduceat(tables['verdicts'], starts, axis=0)
+        final = _mean(np.add.reduceat(tables['final_sums'], starts), np.add.reduceat(tables['final_counts'], starts))
+        criteria = len(self.criteria)
+        means = _mean(
+            np.add.reduceat(tables['score_sums'].sum(axis=1), starts, axis=0),
+            np.add.reduceat(tables['score_counts'].sum(axis=1), starts, axis=0)
+        )
+        return [
+            {
+                'period': str(periods[start]),
+                'claims': int(verdicts[index].sum()),
+                'verdicts': dict(zip(VERDICTS, verdicts[index].tolist())),
+                'mean_final_truth_score': final[index],
+                'criteria': dict(zip(self.criteria, means[index * criteria:(index + 1) * criteria])),
+            }
+            for index, start in enumerate(starts) if verdicts[index].sum()
+        ]
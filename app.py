@@ -1,34 +1,220 @@
            # app.py
-from flask import Flask, render_template, request
-import requests
-from bs4 import BeautifulSoup
-import nltk
+import click
+from flask import Flask, Response, abort, jsonify, redirect, render_template, request, stream_with_context, url_for
 import os
-nltk.download('punkt')
-from newspaper import Article
-import groq
-from azure.cognitiveservices.search.websearch import WebSearchClient
-from msrest.authentication import CognitiveServicesCredentials
+import html
+import re
+import hashlib
+import json
+import time
+import contextvars
+import sqlite3
+import threading
+import uuid
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from flask_migrate import Migrate
+from sqlalchemy import and_, event, func, or_
+from werkzeug.http import is_resource_modified
+from sqlalchemy.dialects import postgresql, sqlite as sqlite_dialect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import load_only, selectinload
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrency import EventFeed, PipelinePool
+from llm_cache import CachedChatClient, LLMResponseCache
+from search_cache import InFlightGroup, SearchResultCache, normalize_query
+from claim_search import create_search_index, rebuild_search_index, search_claims
+from http_client import HTTPClient
+from metrics import MetricsRegistry, TracedChatClient, Tracer
+from article_cache import ArticleCache, canonicalize_url, content_hash
+from source_profiles import SOURCE_CRITERIA, SourceProfileCache
+from page_cache import PageCache
+from article_extract import merge_claims, split_into_windows, stream_article_html
+from batch_io import BatchCheckpoint, normalize_batch_item, read_batch_items
+from rate_limit import RateLimitedChatClient
+from startup import LazyObject, ensure_nltk_data
+from structured_output import (
+    Field, ParseStats, category_parser, complete_json, json_schema_hint, load_json_object, parse_probability,
+    parse_record, parse_score, parse_text, request_record
+)
 
 app = Flask(__name__)
 
-# Configure the SQLite database
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///fact_checker.db'
+# Every setting comes from the environment. Relative cache file paths are resolved against the
+# instance folder; the caches and clients built from them are only created on first use.
+
+# Configure the database: SQLite by default, or any SQLAlchemy URL (e.g. PostgreSQL) in DATABASE_URL
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///fact_checker.db').replace(
+    'postgres://', 'postgresql://', 1
+)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Connection pool per process; pre-ping and recycle drop connections the server has closed
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', '1') != '0',
+    'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+}
+if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'].update(
+        pool_size=int(os.getenv('DB_POOL_SIZE', 10)),
+        max_overflow=int(os.getenv('DB_MAX_OVERFLOW', 20)),
+        pool_timeout=int(os.getenv('DB_POOL_TIMEOUT', 30)),
+    )
+# Write-ahead logging lets readers carry on while a submission is being saved
+app.config['SQLITE_WAL'] = os.getenv('SQLITE_WAL', '1') != '0'
+
+# Concurrency limits for the claim pipeline (total calls in flight, and per provider)
+app.config['PIPELINE_MAX_WORKERS'] = int(os.getenv('PIPELINE_MAX_WORKERS', 16))
+app.config['PIPELINE_PROVIDER_LIMITS'] = {
+    'groq': int(os.getenv('GROQ_MAX_CONCURRENCY', 8)),
+    'bing': int(os.getenv('BING_MAX_CONCURRENCY', 3)),
+}
+
+# Stream per-claim results to the results page over server-sent events, from a background job
+app.config['STREAM_RESULTS'] = os.getenv('STREAM_RESULTS', '1') != '0'
+
+# Background fact-check jobs: POST / enqueues instead of running inline
+app.config['ASYNC_JOBS'] = os.getenv('ASYNC_JOBS', '1') != '0'
+app.config['JOB_WORKERS'] = int(os.getenv('JOB_WORKERS', 4))
+# Jobs stuck in 'running' this long (e.g. after a crash) are picked up again
+app.config['JOB_STALE_AFTER'] = int(os.getenv('JOB_STALE_AFTER', 3600))
+
+# Batch fact checks (POST /batch, run as a job, or flask factcheck-batch): inputs are fetched and their claims
+# extracted BATCH_FETCH_WORKERS at a time, and verified BATCH_CHUNK_SIZE inputs at a time
+app.config['BATCH_CHUNK_SIZE'] = int(os.getenv('BATCH_CHUNK_SIZE', 25))
+app.config['BATCH_FETCH_WORKERS'] = int(os.getenv('BATCH_FETCH_WORKERS', 8))
+app.config['BATCH_MAX_ITEMS'] = int(os.getenv('BATCH_MAX_ITEMS', 100))
+
+# Claims verified more recently than this are reused instead of re-checked (0 disables)
+app.config['CLAIM_MAX_AGE_HOURS'] = float(os.getenv('CLAIM_MAX_AGE_HOURS', 24))
+# Near-duplicates of a claim verified within CLAIM_MAX_AGE_HOURS (MinHash similarity of their words):
+# from CLAIM_SIMILARITY_REUSE up, and with the same words bar stopwords and punctuation, the stored
+# verdict is reused; any other match from CLAIM_SIMILARITY_SEED up is still scored, but against the
+# stored claim's sources instead of a new search
+app.config['CLAIM_SIMILARITY_ENABLED'] = os.getenv('CLAIM_SIMILARITY_ENABLED', '1') != '0'
+app.config['CLAIM_SIMILARITY_PATH'] = os.path.join(
+    app.instance_path, os.getenv('CLAIM_SIMILARITY_PATH', 'claim_similarity.idx')
+)
+app.config['CLAIM_SIMILARITY_REUSE'] = float(os.getenv('CLAIM_SIMILARITY_REUSE', 0.8))
+app.config['CLAIM_SIMILARITY_SEED'] = float(os.getenv('CLAIM_SIMILARITY_SEED', 0.5))
+
+# Claims per /news page, and sources listed per claim there
+app.config['NEWS_PAGE_SIZE'] = int(os.getenv('NEWS_PAGE_SIZE', 20))
+app.config['SEARCH_PAGE_SIZE'] = int(os.getenv('SEARCH_PAGE_SIZE', 20))
+app.config['NEWS_MAX_SOURCES'] = int(os.getenv('NEWS_MAX_SOURCES', 5))
+
+# Bing Web Search v7 endpoint (overridable to point at a proxy or the offline benchmark stub)
+app.config['BING_SEARCH_ENDPOINT'] = os.getenv('BING_SEARCH_ENDPOINT', 'https://api.bing.microsoft.com/v7.0/search')
+
+# Shared HTTP session for Bing and article downloads
+app.config['HTTP_POOL_MAXSIZE'] = int(os.getenv('HTTP_POOL_MAXSIZE', 10))
+app.config['HTTP_CONNECT_TIMEOUT'] = float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.05))
+app.config['HTTP_READ_TIMEOUT'] = float(os.getenv('HTTP_READ_TIMEOUT', 20))
+app.config['HTTP_MAX_RETRIES'] = int(os.getenv('HTTP_MAX_RETRIES', 3))
+# Seconds a fetch waits for a free connection once HTTP_POOL_MAXSIZE are busy to the same host
+app.config['HTTP_POOL_TIMEOUT'] = float(os.getenv('HTTP_POOL_TIMEOUT', 30))
+
+# Local NLTK data for newspaper's sentence tokenizer; checked once on the first URL, and
+# only downloaded there when NLTK_DOWNLOAD is set
+app.config['NLTK_DATA_DIR'] = os.getenv('NLTK_DATA_DIR', os.path.join(app.root_path, 'nltk_data'))
+app.config['NLTK_DOWNLOAD'] = os.getenv('NLTK_DOWNLOAD', '0') != '0'
+
+# Article downloads stop after this many bytes, or once this much body text has been read
+app.config['ARTICLE_MAX_BYTES'] = int(os.getenv('ARTICLE_MAX_BYTES', 2 * 1024 * 1024))
+app.config['ARTICLE_MAX_CHARS'] = int(os.getenv('ARTICLE_MAX_CHARS', 60000))
+
+# Extracted article text per canonical URL, revalidated with conditional GETs once older
+# than ARTICLE_CACHE_FRESH_FOR seconds; claim lists are cached per extracted-text hash
+app.config['ARTICLE_CACHE_ENABLED'] = os.getenv('ARTICLE_CACHE_ENABLED', '1') != '0'
+app.config['ARTICLE_CACHE_PATH'] = os.path.join(
+    app.instance_path, os.getenv('ARTICLE_CACHE_PATH', 'article_cache.db')
+)
+app.config['ARTICLE_CACHE_MAX_BYTES'] = int(os.getenv('ARTICLE_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+app.config['ARTICLE_CACHE_FRESH_FOR'] = int(os.getenv('ARTICLE_CACHE_FRESH_FOR', 300))
+
+# Long texts are split into overlapping windows whose claims are extracted in parallel
+app.config['CLAIM_WINDOW_CHARS'] = int(os.getenv('CLAIM_WINDOW_CHARS', 8000))
+app.config['CLAIM_WINDOW_OVERLAP'] = int(os.getenv('CLAIM_WINDOW_OVERLAP', 400))
+app.config['CLAIM_MAX_WINDOWS'] = int(os.getenv('CLAIM_MAX_WINDOWS', 8))
+app.config['MAX_CLAIMS'] = int(os.getenv('MAX_CLAIMS', 5))
+
+# Ask Groq for JSON-mode responses (the parser still accepts "Label: value" text either way)
+app.config['LLM_JSON_MODE'] = os.getenv('LLM_JSON_MODE', '1') != '0'
+
+# Score intent and CRAAP for all of a claim's sources in one Groq call
+app.config['CRAAP_BATCH_MODE'] = os.getenv('CRAAP_BATCH_MODE', '1') != '0'
+
+# Groq budgets per model: requests/minute, tokens/minute and the starting concurrency
+# ceiling that AIMD backs off from on 429s. Override with a JSON GROQ_MODEL_LIMITS.
+app.config['GROQ_DEFAULT_LIMITS'] = {'rpm': 30, 'tpm': 20000, 'concurrency': 8}
+app.config['GROQ_MODEL_LIMITS'] = {
+    'llama-3.1-70b-versatile': {'rpm': 30, 'tpm': 20000},
+    'llama3-groq-70b-8192-tool-use-preview': {'rpm': 30, 'tpm': 15000},
+    **json.loads(os.getenv('GROQ_MODEL_LIMITS', '{}')),
+}
+
+# Cache of Groq completions keyed by model, messages, max_tokens and temperature
+app.config['LLM_CACHE_ENABLED'] = os.getenv('LLM_CACHE_ENABLED', '1') != '0'
+app.config['LLM_CACHE_PATH'] = os.path.join(
+    app.instance_path, os.getenv('LLM_CACHE_PATH', 'llm_cache.db')
+)
+app.config['LLM_CACHE_TTL'] = int(os.getenv('LLM_CACHE_TTL', 7 * 24 * 3600))
+app.config['LLM_CACHE_MAX_ENTRIES'] = int(os.getenv('LLM_CACHE_MAX_ENTRIES', 10000))
+
+# Cache of parsed Bing results keyed by the normalized claim
+app.config['SEARCH_CACHE_ENABLED'] = os.getenv('SEARCH_CACHE_ENABLED', '1') != '0'
+app.config['SEARCH_CACHE_PATH'] = os.path.join(
+    app.instance_path, os.getenv('SEARCH_CACHE_PATH', 'search_cache.db')
+)
+app.config['SEARCH_CACHE_TTL'] = int(os.getenv('SEARCH_CACHE_TTL', 24 * 3600))
+
+# Intent and the claim-independent CRAAP criteria (Currency, Authority, Purpose) per source URL,
+# and intent/Authority/Purpose per domain; known sources are then only scored on Relevance and Accuracy
+app.config['SOURCE_PROFILE_ENABLED'] = os.getenv('SOURCE_PROFILE_ENABLED', '1') != '0'
+app.config['SOURCE_PROFILE_PATH'] = os.path.join(
+    app.instance_path, os.getenv('SOURCE_PROFILE_PATH', 'source_profiles.db')
+)
+app.config['SOURCE_PROFILE_TTL'] = int(os.getenv('SOURCE_PROFILE_TTL', 7 * 24 * 3600))
+
+# Rendered /claim/<id> and /news pages, served with an ETag and Last-Modified from
+# Claim.date_checked (and 304s); saving a claim drops its page and every /news page here,
+# and each hit is checked against date_checked so other nodes' saves are seen too
+app.config['PAGE_CACHE_ENABLED'] = os.getenv('PAGE_CACHE_ENABLED', '1') != '0'
+app.config['PAGE_CACHE_PATH'] = os.path.join(
+    app.instance_path, os.getenv('PAGE_CACHE_PATH', 'page_cache.db')
+)
+app.config['PAGE_CACHE_MAX_BYTES'] = int(os.getenv('PAGE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+# Cache-Control max-age for those pages; at 0 browsers and proxies revalidate every time
+app.config['PAGE_MAX_AGE'] = int(os.getenv('PAGE_MAX_AGE', 0))
+
+# /stats reloads claims checked since its last refresh at most this often (seconds)
+app.config['STATS_REFRESH_INTERVAL'] = int(os.getenv('STATS_REFRESH_INTERVAL', 60))
+
+# Per-request trace spans as JSON lines appended to this file ('-' for stdout; empty disables).
+# Stage timings and counters are served at /metrics either way.
+app.config['TRACE_LOG'] = os.getenv('TRACE_LOG', '')
 
 db = SQLAlchemy(app)
-#db.create_all()
-# Initialize the database
-# After initializing `db`
 migrate = Migrate(app, db)
 
 
+def claim_text_hash(text):
+    # Identity used for claim lookups: ignores case, spacing and trailing punctuation
+    normalized = ' '.join(text.casefold().split()).rstrip('.!? ')
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
 class Claim(db.Model):
+    __table_args__ = (
+        # Serves the (date_checked, id) keyset ordering on /news
+        db.Index('ix_claim_date_checked_id', 'date_checked', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     text = db.Column(db.Text, nullable=False)
+    text_hash = db.Column(
+        db.String(64), unique=True, index=True,
+        default=lambda context: claim_text_hash(context.get_current_parameters()['text'])
+    )
     date_checked = db.Column(db.DateTime, default=datetime.utcnow)
     veracity_probability = db.Column(db.Float)
     veracity_justification = db.Column(db.Text)
@@ -39,7 +225,7 @@ class Claim(db.Model):
 
 class Source(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    claim_id = db.Column(db.Integer, db.ForeignKey('claim.id'), nullable=False)
+    claim_id = db.Column(db.Integer, db.ForeignKey('claim.id'), nullable=False, index=True)
     name = db.Column(db.String(512), nullable=False)
     url = db.Column(db.String(512), nullable=False)
     snippet = db.Column(db.Text)
@@ -51,17 +237,61 @@ class Source(db.Model):
 
 class CRAAPScore(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    source_id = db.Column(db.Integer, db.ForeignKey('source.id'), nullable=False)
+    source_id = db.Column(db.Integer, db.ForeignKey('source.id'), nullable=False, index=True)
     criterion = db.Column(db.String(64), nullable=False)
     score = db.Column(db.Float, nullable=False)
     explanation = db.Column(db.Text)
 
 class OverallCRAAPScore(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    claim_id = db.Column(db.Integer, db.ForeignKey('claim.id'), nullable=False)
+    claim_id = db.Column(db.Integer, db.ForeignKey('claim.id'), nullable=False, index=True)
     criterion = db.Column(db.String(64), nullable=False)
     score = db.Column(db.Float, nullable=False)
 
+class FactCheckJob(db.Model):
+    id = db.Column(db.String(32), primary_key=True, default=lambda: uuid.uuid4().hex)
+    status = db.Column(db.String(16), nullable=False, default='queued')
+    input_type = db.Column(db.String(16), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    claims = db.Column(db.Text)
+    results = db.Column(db.Text)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'claims': json.loads(self.claims) if self.claims else [],
+            'results': json.loads(self.results) if self.results else [],
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+@event.listens_for(Engine, 'connect')
+def configure_sqlite_connection(dbapi_connection, connection_record):
+    if not app.config['SQLITE_WAL'] or not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # With WAL, NORMAL only fsyncs at checkpoints; commits survive an app crash, though not a power cut
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+@event.listens_for(db.metadata, 'after_create')
+def create_claim_search_index(target, connection, **kw):
+    # db.create_all() builds the FTS5 index too; migrations create it for existing databases
+    if connection.dialect.name == 'sqlite':
+        create_search_index(connection)
+
+
 def calculate_final_truth_score(overall_craap_scores, veracity_probability):
     # Normalize CRAAP score (assuming maximum CRAAP score per criterion is 10)
     normalized_craap_score = sum(overall_craap_scores.values()) / (10 * len(overall_craap_scores))
@@ -73,20 +303,193 @@ def calculate_final_truth_score(overall_craap_scores, veracity_probability):
     return final_score
 
 
-# Initialize Groq client
-client = groq.Groq()
+# Prometheus metrics and stage timing for the whole pipeline
+metrics = MetricsRegistry()
+tracer = Tracer(metrics, log_path=lambda: app.config['TRACE_LOG'])
+
+# The clients and caches below are built on first use rather than at import, so they see the final
+# app.config and importing the app creates no files
+
+
+def instance_file(setting):
+    # Cache files default to the instance folder, which is created when the first of them is opened
+    path = app.config[setting]
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    return path
+
+
+def make_llm_cache():
+    return LLMResponseCache(
+        instance_file('LLM_CACHE_PATH'),
+        ttl=app.config['LLM_CACHE_TTL'],
+        max_entries=app.config['LLM_CACHE_MAX_ENTRIES'],
+        enabled=app.config['LLM_CACHE_ENABLED']
+    )
+
+
+def make_groq_client():
+    # The SDK is slow to import, so it is loaded and the client built on the first completion.
+    # Retries are left to the rate limiter, which backs off on 429s instead of failing the call
+    import groq
+    return groq.Groq(max_retries=0)
+
+
+def make_rate_limited_client():
+    return RateLimitedChatClient(
+        LazyObject(make_groq_client),
+        model_limits=app.config['GROQ_MODEL_LIMITS'],
+        default_limits=app.config['GROQ_DEFAULT_LIMITS']
+    )
+
+
+def make_chat_client():
+    return TracedChatClient(CachedChatClient(groq_client, llm_cache), tracer)
+
+
+# Initialize Groq client; repeated completions are served from the response cache
+# without touching the rate limiter
+llm_cache = LazyObject(make_llm_cache)
+groq_client = LazyObject(make_rate_limited_client)
+client = LazyObject(make_chat_client)
+
+
+def make_http_client():
+    return HTTPClient(
+        pool_maxsize=app.config['HTTP_POOL_MAXSIZE'],
+        timeout=(app.config['HTTP_CONNECT_TIMEOUT'], app.config['HTTP_READ_TIMEOUT']),
+        max_retries=app.config['HTTP_MAX_RETRIES'],
+        pool_timeout=app.config['HTTP_POOL_TIMEOUT']
+    )
+
+
+# Pooled keep-alive connections, per-host limits and retries for every outbound fetch
+http = LazyObject(make_http_client)
+
+
+def make_search_cache():
+    return SearchResultCache(
+        instance_file('SEARCH_CACHE_PATH'),
+        ttl=app.config['SEARCH_CACHE_TTL'],
+        enabled=app.config['SEARCH_CACHE_ENABLED']
+    )
+
+
+# Search results are shared across rewordings of a claim and across concurrent requests
+search_cache = LazyObject(make_search_cache)
+search_in_flight = InFlightGroup()
+
+
+def make_article_cache():
+    return ArticleCache(
+        instance_file('ARTICLE_CACHE_PATH'),
+        max_bytes=app.config['ARTICLE_CACHE_MAX_BYTES'],
+        enabled=app.config['ARTICLE_CACHE_ENABLED']
+    )
+
+
+# Repeat submissions of a popular URL skip the download and newspaper parse
+article_cache = LazyObject(make_article_cache)
+
+
+def make_source_profiles():
+    return SourceProfileCache(
+        instance_file('SOURCE_PROFILE_PATH'),
+        ttl=app.config['SOURCE_PROFILE_TTL'],
+        enabled=app.config['SOURCE_PROFILE_ENABLED']
+    )
+
+
+# Sources cited again (or other pages of a known site) keep their claim-independent scores
+source_profiles = LazyObject(make_source_profiles)
+
 
+def make_page_cache():
+    return PageCache(
+        instance_file('PAGE_CACHE_PATH'),
+        max_bytes=app.config['PAGE_CACHE_MAX_BYTES'],
+        enabled=app.config['PAGE_CACHE_ENABLED']
+    )
+
+
+# Popular claim pages are served without touching the claim tables or the template engine
+page_cache = LazyObject(make_page_cache)
 
-def extract_text_from_url(url):
+
+def make_similarity_index():
+    # NumPy is loaded with the index, on the first claim lookup
+    from claim_similarity import ClaimSimilarityIndex
+    return ClaimSimilarityIndex(
+        instance_file('CLAIM_SIMILARITY_PATH'), enabled=app.config['CLAIM_SIMILARITY_ENABLED']
+    )
+
+
+# Signatures of every stored claim, for reusing verdicts across near-duplicate claims
+similarity_index = LazyObject(make_similarity_index)
+similar_claims = metrics.counter(
+    'factcheck_similar_claims_total', 'Claims matched to a near-duplicate stored claim, by how it was used.',
+    labels=('use',)
+)
+
+def make_pipeline():
+    return PipelinePool(
+        max_workers=app.config['PIPELINE_MAX_WORKERS'],
+        provider_limits=app.config['PIPELINE_PROVIDER_LIMITS']
+    )
+
+
+# Shared worker pool for searches and LLM calls
+pipeline = LazyObject(make_pipeline)
+
+
+def new_article(url):
+    # newspaper pulls in nltk and is the slowest import in the app, so it is loaded on the first URL
+    from newspaper import Article
+    ensure_nltk_data('tokenizers/punkt', app.config['NLTK_DATA_DIR'], download=app.config['NLTK_DOWNLOAD'])
+    return Article(url)
+
+
+@tracer.timed('fetch')
+def extract_text_from_url(url, strict=False):
+    # With `strict`, a failed fetch with no cached copy to fall back on raises instead of returning ''
+    canonical_url = canonicalize_url(url)
+    cached = article_cache.get(canonical_url)
+    if cached and time.time() - cached['fetched_at'] < app.config['ARTICLE_CACHE_FRESH_FOR']:
+        article_cache.hit(canonical_url)
+        return cached['text']
     try:
-        article = Article(url)
-        article.download()
+        response = http.get(url, stream=True, headers=article_cache.conditional_headers(cached))
+        # Closed on every path, error statuses included, so the connection goes back to the pool
+        with response:
+            if cached and response.status_code == 304:
+                article_cache.hit(canonical_url, revalidated=True)
+                return cached['text']
+            response.raise_for_status()
+            page_html, fallback_text, truncated = stream_article_html(
+                response, app.config['ARTICLE_MAX_BYTES'], app.config['ARTICLE_MAX_CHARS']
+            )
+        if truncated:
+            tracer.annotate(truncated_at=len(page_html))
+            app.logger.info("Stopped reading %s after %d characters of HTML", url, len(page_html))
+        article = new_article(url)
+        article.download(input_html=page_html)
         article.parse()
-        return article.text
+        # newspaper can come up empty on pages cut off mid-document; use the streamed paragraphs
+        text = article.text or fallback_text
+        if text:
+            article_cache.set(
+                canonical_url, text, response.headers.get('ETag'), response.headers.get('Last-Modified')
+            )
+        return text
     except Exception as e:
         print(f"Error extracting {url}: {e}")
+        # A stale copy beats nothing when the site is down
+        if cached:
+            return cached['text']
+        if strict:
+            raise
         return ''
 
+@tracer.timed('extract_claims')
 def extract_claims(text):
     prompt = f"""
     Analyze the following text and extract the main factual claims (up to 5). Provide each claim in a numbered list.
@@ -121,54 +524,164 @@ def extract_claims(text):
     return claims
 
 
-def search_sources_for_claim(claim):
-    import os
-    import requests
-    import html
+def extract_claims_windowed(text):
+    """Extract claims from text of any length.
+
+    Short texts take a single `extract_claims` call. Longer ones are split
+    into overlapping windows (at most CLAIM_MAX_WINDOWS) that are sent to
+    Groq in parallel; the per-window claims are then merged round-robin with
+    duplicates removed, up to MAX_CLAIMS. The merged list is cached by the
+    hash of the text, so the same article submitted again (by any URL, or
+    pasted) skips extraction.
+    """
+    text_hash = content_hash(text)
+    cached_claims = article_cache.get_claims(text_hash)
+    if cached_claims is not None:
+        return cached_claims
+    windows = split_into_windows(text, app.config['CLAIM_WINDOW_CHARS'], app.config['CLAIM_WINDOW_OVERLAP'])
+    windows = windows[:app.config['CLAIM_MAX_WINDOWS']]
+    if len(windows) == 1:
+        claim_lists = [extract_claims(windows[0])]
+    else:
+        futures = [pipeline.submit('groq', extract_claims, window) for window in windows]
+        claim_lists = []
+        for future in futures:
+            try:
+                claim_lists.append(future.result())
+            except Exception as e:
+                print(f"Error extracting claims from a window: {e}")
+    claims = merge_claims(claim_lists, app.config['MAX_CLAIMS'], key=claim_text_hash)
+    if claims:
+        article_cache.set_claims(text_hash, claims)
+    return claims
+
+
+def clean_text(text):
+    text = html.unescape(text)
+    # Snippets only ever contain Bing's <b> highlighting, so skip the markup
+    # parser entirely when there are no tags to strip
+    if '<' not in text:
+        return text
     from bs4 import BeautifulSoup
+    return BeautifulSoup(text, 'html.parser').get_text()
+
+
+@tracer.timed('bing')
+def bing_search(claim):
+    # Get the Bing Search API key from environment variable
+    subscription_key = os.getenv('BING_SEARCH_V7_SUBSCRIPTION_KEY')
+    if not subscription_key:
+        raise ValueError("Bing Search API key not found. Set the 'BING_SEARCH_V7_SUBSCRIPTION_KEY' environment variable.")
+
+    search_url = app.config['BING_SEARCH_ENDPOINT']
+
+    headers = {"Ocp-Apim-Subscription-Key": subscription_key}
+    params = {"q": claim, "textDecorations": True, "textFormat": "HTML"}
+
+    response = http.get(search_url, headers=headers, params=params)
+    response.raise_for_status()
+    search_results = response.json()
+
+    sources = []
+    if "webPages" in search_results and "value" in search_results["webPages"]:
+        for result in search_results["webPages"]["value"][:5]:  # Limit to top 5 results
+            name = clean_text(result.get('name', ''))
+            snippet = clean_text(result.get('snippet', ''))
+            source = {
+                'name': name,
+                'url': result.get('url'),
+                'snippet': snippet,
+                'date_last_crawled': result.get('dateLastCrawled')
+            }
+            sources.append(source)
+    else:
+        print(f"No web pages found for claim: '{claim}'")
+    return sources
 
-    def clean_text(text):
-        text = html.unescape(text)
-        soup = BeautifulSoup(text, 'html.parser')
-        return soup.get_text()
 
+def _search_and_cache(claim, query_key):
+    sources = bing_search(claim)
+    search_cache.set(query_key, sources)
+    return sources
+
+
+@tracer.timed('search')
+def search_sources_for_claim(claim):
+    query_key = normalize_query(claim)
     try:
-        # Get the Bing Search API key from environment variable
-        subscription_key = os.getenv('BING_SEARCH_V7_SUBSCRIPTION_KEY')
-        if not subscription_key:
-            raise ValueError("Bing Search API key not found. Set the 'BING_SEARCH_V7_SUBSCRIPTION_KEY' environment variable.")
-
-        search_url = "https://api.bing.microsoft.com/v7.0/search"
-
-        headers = {"Ocp-Apim-Subscription-Key": subscription_key}
-        params = {"q": claim, "textDecorations": True, "textFormat": "HTML"}
-
-        response = requests.get(search_url, headers=headers, params=params)
-        response.raise_for_status()
-        search_results = response.json()
-
-        sources = []
-        if "webPages" in search_results and "value" in search_results["webPages"]:
-            for result in search_results["webPages"]["value"][:5]:  # Limit to top 5 results
-                name = clean_text(result.get('name', ''))
-                snippet = clean_text(result.get('snippet', ''))
-                source = {
-                    'name': name,
-                    'url': result.get('url'),
-                    'snippet': snippet,
-                    'date_last_crawled': result.get('dateLastCrawled')
-                }
-                sources.append(source)
-        else:
-            print(f"No web pages found for claim: '{claim}'")
-        return sources
+        sources = search_cache.get(query_key)
+        if sources is None:
+            # Concurrent searches for the same claim share one Bing call
+            sources = search_in_flight.do(query_key, _search_and_cache, claim, query_key)
+        # Callers get their own copies so the shared result is never mutated
+        return [dict(source) for source in sources]
     except Exception as e:
         print(f"Error searching for claim '{claim}': {e}")
         return []
 
 
 
+CRAAP_CRITERIA = ['Currency', 'Relevance', 'Authority', 'Accuracy', 'Purpose']
+
+INTENT_CATEGORIES = {
+    1: 'News/Journalism',
+    2: 'Opinion/Editorial',
+    3: 'Scientific/Scholarly',
+    4: 'Marketing/Advertising',
+    5: 'Entertainment',
+    6: 'Propaganda',
+    7: 'Satire/Parody',
+    8: 'Advocacy/Non-Profit',
+    9: 'Personal Blog/Opinion',
+    10: 'Government/Official',
+    11: 'Educational',
+    12: 'Social Media Post'
+}
+
+# Values expected back from the scoring prompts, as JSON keys or "Label: value" lines
+CRAAP_FIELDS = [Field(criterion, parse_score) for criterion in CRAAP_CRITERIA]
+INTENT_FIELDS = [
+    Field('Category Number', category_parser(INTENT_CATEGORIES), aliases=('Category',)),
+    Field('Explanation', parse_text, required=False, default=''),
+]
+VERACITY_FIELDS = [
+    Field('Probability', parse_probability),
+    Field('Justification', parse_text, required=False, default=''),
+]
+EVALUATION_FIELDS = INTENT_FIELDS + CRAAP_FIELDS
+CRAAP_QUESTIONS = {
+    'Currency': 'Is the information up-to-date?',
+    'Relevance': 'Does the source relate to the claim?',
+    'Authority': 'Is the author/publisher/source reputable?',
+    'Accuracy': 'Is the information reliable, truthful, and correct?',
+    'Purpose': 'Is the purpose of the information clear? Is it free of bias?',
+}
+# Placeholders shown in the JSON format each prompt asks for
+CRAAP_FORMAT = {criterion: '{"score": [0-10], "explanation": "[Explanation]"}' for criterion in CRAAP_CRITERIA}
+VERACITY_FORMAT = {
+    'Probability': '[value between 0 and 1]',
+    'Justification': '"[Your brief justification]"',
+}
+INTENT_FORMAT = {
+    'Category Number': '[Select the most appropriate category number]',
+    'Explanation': '"[Briefly explain why this category was chosen]"',
+}
+EVALUATION_FORMAT = {'Source': '[Number]', **INTENT_FORMAT, **CRAAP_FORMAT}
+
+
+def craap_rubric(criteria, indent=''):
+    return '\n'.join(f"{indent}- {criterion} ({CRAAP_QUESTIONS[criterion]})" for criterion in criteria)
+
+
+# Parse outcomes per prompt type: first try, recovered by a re-ask, or failed
+parse_stats = ParseStats()
+
+
+@tracer.timed('craap')
 def compute_craap_score(claim, source):
+    # Criteria already known from the source's profile are reused; only the rest are asked for
+    profile = source_profiles.get(source['url'])
+    criteria = [criterion for criterion in CRAAP_CRITERIA if criterion not in profile]
     prompt = f"""
     Evaluate the following source for the claim "{claim}" using the CRAAP test.
 
@@ -179,178 +692,549 @@ def compute_craap_score(claim, source):
     Date Last Crawled: {source['date_last_crawled']}
 
     Assess each of the following criteria on a scale from 0 (lowest) to 10 (highest):
-    - Currency (Is the information up-to-date?)
-    - Relevance (Does the source relate to the claim?)
-    - Authority (Is the author/publisher/source reputable?)
-    - Accuracy (Is the information reliable, truthful, and correct?)
-    - Purpose (Is the purpose of the information clear? Is it free of bias?)
+{craap_rubric(criteria, indent='    ')}
 
     Provide a score for each criterion and a brief explanation.
 
-    Format:
-    Currency: [Score] - [Explanation]
-    Relevance: [Score] - [Explanation]
-    Authority: [Score] - [Explanation]
-    Accuracy: [Score] - [Explanation]
-    Purpose: [Score] - [Explanation]
+    Respond with a JSON object in this format:
+    {json_schema_hint({criterion: CRAAP_FORMAT[criterion] for criterion in criteria}, indent='      ')}
     """
 
-    response = client.chat.completions.create(
-        model="llama3-groq-70b-8192-tool-use-preview",
-        messages=[
-            {
-                "role": "system",
-                "content": "You are a helpful assistant that evaluates sources based on the CRAAP test."
-            },
-            {"role": "user", "content": prompt}
-        ],
-        max_tokens=500,
-        temperature=0.2
-    )
+    try:
+        craap_scores, missing = request_record(
+            client, parse_stats, 'craap', [field for field in CRAAP_FIELDS if field.name in criteria],
+            [
+                {
+                    "role": "system",
+                    "content": "You are a helpful assistant that evaluates sources based on the CRAAP test."
+                },
+                {"role": "user", "content": prompt}
+            ],
+            json_mode=app.config['LLM_JSON_MODE'],
+            model="llama3-groq-70b-8192-tool-use-preview",
+            max_tokens=100 * len(criteria),
+            temperature=0.2
+        )
+        if missing:
+            print(f"CRAAP scores missing for {source['url']}: {', '.join(missing)}")
+    except Exception as e:
+        # Criteria that could not be scored are left out, as when they are missing from the answer
+        print(f"Error computing CRAAP scores for {source['url']}: {e}")
+        craap_scores = {}
+    remember_source_profile(source, craap_scores=craap_scores)
+    craap_scores.update({criterion: profile[criterion] for criterion in CRAAP_CRITERIA if criterion in profile})
+    return {criterion: craap_scores[criterion] for criterion in CRAAP_CRITERIA if criterion in craap_scores}
 
-    content = response.choices[0].message.content
 
-    # Parse the response to extract scores
-    craap_scores = {}
-    for line in content.split('\n'):
-        line = line.strip()
-        if line.startswith('Currency:'):
-            score_explanation = line.split(':',1)[1].strip()
-            score, explanation = score_explanation.split('-',1)
-            craap_scores['Currency'] = {'score': float(score.strip()), 'explanation': explanation.strip()}
-        elif line.startswith('Relevance:'):
-            score_explanation = line.split(':',1)[1].strip()
-            score, explanation = score_explanation.split('-',1)
-            craap_scores['Relevance'] = {'score': float(score.strip()), 'explanation': explanation.strip()}
-        elif line.startswith('Authority:'):
-            score_explanation = line.split(':',1)[1].strip()
-            score, explanation = score_explanation.split('-',1)
-            craap_scores['Authority'] = {'score': float(score.strip()), 'explanation': explanation.strip()}
-        elif line.startswith('Accuracy:'):
-            score_explanation = line.split(':',1)[1].strip()
-            score, explanation = score_explanation.split('-',1)
-            craap_scores['Accuracy'] = {'score': float(score.strip()), 'explanation': explanation.strip()}
-        elif line.startswith('Purpose:'):
-            score_explanation = line.split(':',1)[1].strip()
-            score, explanation = score_explanation.split('-',1)
-            craap_scores['Purpose'] = {'score': float(score.strip()), 'explanation': explanation.strip()}
-    return craap_scores
+def remember_source_profile(source, intent=None, craap_scores=None):
+    # Keep the claim-independent parts of a fresh evaluation for the next claim citing this source
+    profile = {criterion: craap_scores[criterion] for criterion in SOURCE_CRITERIA if criterion in (craap_scores or {})}
+    if intent and intent['category'] != 'Unknown':
+        profile['intent'] = intent
+    source_profiles.set(source['url'], profile)
 
 
 def compute_overall_craap_score(craap_scores_list):
-    # craap_scores_list is a list of dictionaries of CRAAP scores for each source
-    aggregated_scores = {'Currency': 0, 'Relevance': 0, 'Authority': 0, 'Accuracy': 0, 'Purpose': 0}
-    num_sources = len(craap_scores_list)
+    # Average each criterion over the sources that have a score for it; criteria
+    # no source could be scored on are left out rather than counted as zero
+    totals = {}
+    counts = {}
     for scores in craap_scores_list:
-        for criterion in aggregated_scores.keys():
-            aggregated_scores[criterion] += scores[criterion]['score']
-    # Compute average scores
-    for criterion in aggregated_scores.keys():
-        aggregated_scores[criterion] /= num_sources
-    return aggregated_scores
+        for criterion in CRAAP_CRITERIA:
+            if criterion in scores:
+                totals[criterion] = totals.get(criterion, 0) + scores[criterion]['score']
+                counts[criterion] = counts.get(criterion, 0) + 1
+    return {criterion: totals[criterion] / counts[criterion] for criterion in totals}
+
+
+def iter_claim_pipeline(claims, seed_sources=None):
+    """Search and score every claim concurrently, yielding (event, payload) as work finishes.
+
+    Searches are fanned out first; as soon as a claim's sources arrive, its
+    intent, CRAAP and veracity calls are submitted. With CRAAP_BATCH_MODE on,
+    intent and CRAAP for all of a claim's sources share a single call.
+    Claims with an entry in `seed_sources` ({claim index: sources}) skip the
+    search and are scored against those sources.
+    Progress is reported as 'sources', 'intent', 'craap' and 'veracity'
+    events, and each claim ends with an 'outcome' event once all of its calls
+    are done. A call that raises is logged and counted as giving nothing
+    (intent Unknown, criteria unscored, no veracity) so the other calls and
+    claims still finish. Nothing here touches the database.
+    """
+    batch_mode = app.config['CRAAP_BATCH_MODE']
+    seed_sources = seed_sources or {}
+    items = [None] * len(claims)
+    remaining = [0] * len(claims)
+    # future -> (kind, claim index, source index)
+    futures = {
+        pipeline.submit('bing', search_sources_for_claim, claim_text): ('search', index, None)
+        for index, claim_text in enumerate(claims)
+        if index not in seed_sources
+    }
+    for index, sources in seed_sources.items():
+        seeded = Future()
+        seeded.set_result(sources)
+        futures[seeded] = ('search', index, None)
+
+    def submit(kind, index, source_index, fn, *args):
+        futures[pipeline.submit('groq', fn, *args)] = (kind, index, source_index)
+        remaining[index] += 1
+
+    def outcome_event(index):
+        return 'outcome', {'claim_index': index, 'outcome': items[index]}
+
+    while futures:
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            kind, index, source_index = futures.pop(future)
+            claim_text = claims[index]
+            try:
+                result = future.result()
+            except Exception as e:
+                # A failed call only loses its own values; the claim and the rest of the submission carry on
+                print(f"Error in {kind} call for claim '{claim_text}': {e}")
+                result = failed_call_result(kind, items[index])
+            if kind == 'search':
+                sources = result
+                items[index] = {
+                    'sources': sources,
+                    'intents': [None] * len(sources),
+                    'craap_scores': [None] * len(sources),
+                    'veracity_assessment': None,
+                }
+                yield 'sources', {'claim_index': index, 'sources': sources}
+                if not sources:
+                    yield outcome_event(index)
+                    continue
+                submit('veracity', index, None, assess_claim_veracity, claim_text, sources)
+                if batch_mode:
+                    submit('evaluation', index, None, evaluate_sources, claim_text, sources)
+                else:
+                    for number, source in enumerate(sources):
+                        submit('intent', index, number, categorize_source_intent, source)
+                        submit('craap', index, number, compute_craap_score, claim_text, source)
+                continue
+
+            item = items[index]
+            remaining[index] -= 1
+            if kind == 'veracity':
+                item['veracity_assessment'] = result
+                yield 'veracity', {'claim_index': index, 'veracity_assessment': result}
+            elif kind == 'evaluation':
+                intents, craap_scores_list = result
+                for number, (intent, craap_scores) in enumerate(zip(intents, craap_scores_list)):
+                    item['intents'][number] = intent
+                    item['craap_scores'][number] = craap_scores
+                    yield 'intent', {'claim_index': index, 'source_index': number, 'intent': intent}
+                    yield 'craap', {'claim_index': index, 'source_index': number, 'craap_scores': craap_scores}
+            elif kind == 'intent':
+                item['intents'][source_index] = result
+                yield 'intent', {'claim_index': index, 'source_index': source_index, 'intent': result}
+            elif kind == 'craap':
+                item['craap_scores'][source_index] = result
+                yield 'craap', {'claim_index': index, 'source_index': source_index, 'craap_scores': result}
+            if not remaining[index]:
+                yield outcome_event(index)
+
+
+def failed_call_result(kind, item):
+    # What a pipeline call that raised contributes: intent Unknown, criteria unscored, no veracity
+    if kind == 'search':
+        return []
+    if kind == 'evaluation':
+        return [unknown_intent() for _ in item['sources']], [{} for _ in item['sources']]
+    if kind == 'intent':
+        return unknown_intent()
+    if kind == 'craap':
+        return {}
+    return None
+
+
+def run_claim_pipeline(claims):
+    # Same as iter_claim_pipeline, but returns the outcomes in the order of `claims`
+    outcomes = [None] * len(claims)
+    for event, payload in iter_claim_pipeline(claims):
+        if event == 'outcome':
+            outcomes[payload['claim_index']] = payload['outcome']
+    return outcomes
+
+
+def build_claim_result(claim_text, outcome):
+    # Turn one claim's pipeline outcome into the dict the templates render
+    sources = outcome['sources']
+    veracity_assessment = outcome['veracity_assessment']
+    overall_craap_scores = None
+    final_truth_score = None
 
-  
+    sources_data = []
+    if sources:
+        for source_data, intent_categorization, craap_scores in zip(
+                sources, outcome['intents'], outcome['craap_scores']):
+            # Prepare source-specific CRAAP scores for display
+            source_craap_scores_list = [
+                {
+                    'criterion': criterion,
+                    'score': details['score'],
+                    'explanation': details['explanation']
+                }
+                for criterion, details in craap_scores.items()
+                if criterion != 'source'
+            ]
+
+            # Add source data to sources_data list
+            sources_data.append({
+                'name': source_data['name'],
+                'url': source_data['url'],
+                'snippet': source_data['snippet'],
+                'date_last_crawled': source_data['date_last_crawled'],
+                'intent_category': intent_categorization['category'],
+                'intent_explanation': intent_categorization['explanation'],
+                'craap_scores': source_craap_scores_list
+            })
+
+        # Compute overall CRAAP scores
+        overall_craap_scores = compute_overall_craap_score(outcome['craap_scores'])
+
+    # Calculate final truth score
+    if overall_craap_scores and veracity_assessment and veracity_assessment['probability'] is not None:
+        final_truth_score = calculate_final_truth_score(
+            overall_craap_scores,
+            veracity_assessment['probability']
+        )
 
-def extract_and_verify_claims(text):
-    claims = extract_claims(text)
-    results = []
-    
-    for claim_text in claims:
-        # Initialize variables
-        overall_craap_scores = None
-        veracity_assessment = None
-        final_truth_score = None
-
-        print(f"Processing claim: '{claim_text}'")
-
-        # Check if the claim already exists in the database
-        claim = Claim.query.filter_by(text=claim_text).first()
-        if not claim:
-            claim = Claim(text=claim_text)
-            db.session.add(claim)
-            db.session.commit()
-
-        sources = search_sources_for_claim(claim_text)
-        if not sources:
-            print(f"No sources found for claim: '{claim_text}'")
-            craap_scores_list = []
-            sources_data = []
+    return {
+        'claim': claim_text,
+        'sources': sources_data,
+        'overall_craap_scores': overall_craap_scores,
+        'veracity_assessment': veracity_assessment,
+        'final_truth_score': final_truth_score
+    }
+
+
+@tracer.timed('db_lookup')
+def find_fresh_claim(claim_text):
+    # A claim verified within CLAIM_MAX_AGE_HOURS is served from the database as is
+    max_age = app.config['CLAIM_MAX_AGE_HOURS']
+    if not max_age:
+        return None
+    checked_after = datetime.utcnow() - timedelta(hours=max_age)
+    return Claim.query.options(
+        selectinload(Claim.overall_scores),
+        selectinload(Claim.sources).selectinload(Source.craap_scores)
+    ).filter(
+        Claim.text_hash == claim_text_hash(claim_text),
+        Claim.final_truth_score.isnot(None),
+        Claim.date_checked >= checked_after
+    ).first()
+
+
+def sync_similarity_index():
+    # Sign the claims saved since the last lookup, by this process or any other, including ones
+    # that committed under an id below the newest indexed one (concurrent writers on PostgreSQL)
+    condition = Claim.id > similarity_index.max_id
+    pending = similarity_index.pending_ids()
+    if pending:
+        condition = or_(condition, Claim.id.in_(pending))
+    rows = db.session.execute(db.select(Claim.id, Claim.text).where(condition).order_by(Claim.id)).all()
+    similarity_index.add_many(rows)
+
+
+@tracer.timed('similarity')
+def find_similar_claim(claim_text):
+    """The stored claim most similar to `claim_text`, as (claim, similarity), or None.
+
+    Only claims at least CLAIM_SIMILARITY_SEED similar and verified within
+    CLAIM_MAX_AGE_HOURS are candidates.
+    """
+    max_age = app.config['CLAIM_MAX_AGE_HOURS']
+    if not max_age or not app.config['CLAIM_SIMILARITY_ENABLED']:
+        return None
+    sync_similarity_index()
+    matches = similarity_index.query(claim_text, app.config['CLAIM_SIMILARITY_SEED'])
+    if not matches:
+        return None
+    checked_after = datetime.utcnow() - timedelta(hours=max_age)
+    candidates = {
+        claim.id: claim
+        for claim in Claim.query.options(
+            selectinload(Claim.overall_scores),
+            selectinload(Claim.sources).selectinload(Source.craap_scores)
+        ).filter(
+            Claim.id.in_([claim_id for claim_id, _ in matches]),
+            Claim.final_truth_score.isnot(None),
+            Claim.date_checked >= checked_after
+        )
+    }
+    for claim_id, similarity in matches:
+        if claim_id in candidates:
+            return candidates[claim_id], similarity
+    return None
+
+
+def match_similar_claim(claim_text):
+    """Use a near-duplicate stored claim for a claim with no fresh exact match.
+
+    Returns (result, seed). The stored verdict is only reused, as a finished
+    result, for a match of at least CLAIM_SIMILARITY_REUSE whose content
+    words are the same as the claim's (see `content_words`): similar wording
+    can still mean the opposite ("increases" / "decreases"). Any other match
+    gives a seed, {'sources', 'similar_claim'}, to score the claim afresh
+    against the stored claim's sources. Either may be None.
+    """
+    similar = find_similar_claim(claim_text)
+    if similar is None:
+        return None, None
+    # Already imported with the index (and NumPy) by find_similar_claim
+    from claim_similarity import content_words
+    claim, similarity = similar
+    match = {
+        'id': claim.id,
+        'text': claim.text,
+        'similarity': round(similarity, 3),
+        'date_checked': claim.date_checked.isoformat(),
+    }
+    same_content = content_words(claim.text) == content_words(claim_text)
+    if similarity >= app.config['CLAIM_SIMILARITY_REUSE'] and same_content:
+        similar_claims.inc(use='reused')
+        result = load_claim_result(claim)
+        result.update(claim=claim_text, similar_claim=match)
+        return result, None
+    sources = [
+        {'name': source.name, 'url': source.url, 'snippet': source.snippet,
+         'date_last_crawled': source.date_last_crawled}
+        for source in claim.sources
+    ]
+    if not sources:
+        return None, None
+    similar_claims.inc(use='seeded')
+    return None, {'sources': sources, 'similar_claim': match}
+
+
+def load_claim_result(claim):
+    # Rebuild the result dict for a stored claim, in the same shape as build_claim_result
+    sources_data = []
+    for source in claim.sources:
+        sources_data.append({
+            'name': source.name,
+            'url': source.url,
+            'snippet': source.snippet,
+            'date_last_crawled': source.date_last_crawled,
+            'intent_category': source.intent_category,
+            'intent_explanation': source.intent_explanation,
+            'craap_scores': [
+                {
+                    'criterion': score.criterion,
+                    'score': score.score,
+                    'explanation': score.explanation
+                }
+                for score in source.craap_scores
+            ]
+        })
+    return {
+        'claim': claim.text,
+        'sources': sources_data,
+        'overall_craap_scores': {score.criterion: score.score for score in claim.overall_scores} or None,
+        'veracity_assessment': {
+            'probability': claim.veracity_probability,
+            'justification': claim.veracity_justification
+        },
+        'final_truth_score': claim.final_truth_score,
+        'reused': True,
+        'claim_id': claim.id,
+        'date_checked': claim.date_checked.isoformat()
+    }
+
+
+def upsert_claims(rows):
+    """Insert claims or refresh the existing ones with the same text_hash.
+
+    Returns ({text_hash: id}, kept), where `kept` holds the text_hashes of
+    claims left as they were: a new row without a final score doesn't
+    replace a stored verdict, nor move its date_checked. On PostgreSQL and
+    SQLite this is a single INSERT ... ON CONFLICT, which also stays correct
+    when another worker inserts the same claim concurrently. Other backends
+    look up and update in two steps.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite_dialect.insert
+        claim_table = Claim.__table__
+        statement = insert(claim_table).values(rows)
+        keep = and_(statement.excluded.final_truth_score.is_(None), claim_table.c.final_truth_score.isnot(None))
+        statement = statement.on_conflict_do_update(
+            index_elements=[claim_table.c.text_hash],
+            set_={
+                column: db.case((keep, claim_table.c[column]), else_=statement.excluded[column])
+                for column in ('date_checked', 'veracity_probability', 'veracity_justification', 'final_truth_score')
+            }
+        ).returning(claim_table.c.text_hash, claim_table.c.id, claim_table.c.final_truth_score)
+        returned = db.session.execute(statement).all()
+        no_verdict = {row['text_hash'] for row in rows if row['final_truth_score'] is None}
+        kept = {text_hash for text_hash, _, score in returned if text_hash in no_verdict and score is not None}
+        return {text_hash: claim_id for text_hash, claim_id, _ in returned}, kept
+
+    existing = db.session.execute(
+        db.select(Claim.text_hash, Claim.id, Claim.final_truth_score)
+        .where(Claim.text_hash.in_([row['text_hash'] for row in rows]))
+    ).all()
+    claim_ids = {text_hash: claim_id for text_hash, claim_id, _ in existing}
+    no_verdict = {row['text_hash'] for row in rows if row['final_truth_score'] is None}
+    kept = {text_hash for text_hash, _, score in existing if text_hash in no_verdict and score is not None}
+    update_rows = [
+        {key: value for key, value in dict(row, id=claim_ids[row['text_hash']]).items()
+         if key not in ('text', 'text_hash')}
+        for row in rows if row['text_hash'] in claim_ids and row['text_hash'] not in kept
+    ]
+    new_rows = [row for row in rows if row['text_hash'] not in claim_ids]
+    if update_rows:
+        db.session.execute(db.update(Claim), update_rows)
+    if new_rows:
+        new_ids = db.session.scalars(
+            db.insert(Claim).returning(Claim.id, sort_by_parameter_order=True), new_rows
+        ).all()
+        claim_ids.update(zip((row['text_hash'] for row in new_rows), new_ids))
+    return claim_ids, kept
+
+
+@tracer.timed('db_save')
+def save_claim_results(results):
+    """Persist claims with their sources, CRAAP scores and overall scores in one transaction.
+
+    Claims are upserted in one statement (see `upsert_claims`), their old
+    sources and scores are cleared with three deletes, and everything new
+    goes in as one bulk INSERT per table, with the generated ids returned
+    for the child rows. A re-run without a verdict (e.g. no search results)
+    leaves a previously verified claim and its sources untouched.
+    """
+    now = datetime.utcnow()
+    # Later results win if the same claim appears twice
+    by_hash = {claim_text_hash(result['claim']): result for result in results}
+    if not by_hash:
+        return
+    without_sources = [result['claim'] for result in by_hash.values() if not result['sources']]
+    tracer.annotate(claims=len(by_hash), claims_without_sources=len(without_sources))
+    for claim_text in without_sources:
+        app.logger.info("No sources found for claim: %r", claim_text)
+
+    claim_rows = []
+    for text_hash, result in by_hash.items():
+        assessment = result['veracity_assessment'] if result['final_truth_score'] is not None else {}
+        claim_rows.append({
+            'text': result['claim'],
+            'text_hash': text_hash,
+            'date_checked': now,
+            'veracity_probability': assessment.get('probability'),
+            'veracity_justification': assessment.get('justification'),
+            'final_truth_score': result['final_truth_score'],
+        })
+    # Upserting in text_hash order gives concurrent saves the same lock order, so they can't deadlock
+    claim_ids, kept = upsert_claims(sorted(claim_rows, key=lambda row: row['text_hash']))
+    claim_ids = {text_hash: claim_id for text_hash, claim_id in claim_ids.items() if text_hash not in kept}
+
+    # A re-run replaces the previous sources and scores instead of adding to them
+    ids = list(claim_ids.values())
+    old_sources = db.select(Source.id).where(Source.claim_id.in_(ids))
+    db.session.execute(db.delete(CRAAPScore).where(CRAAPScore.source_id.in_(old_sources)))
+    db.session.execute(db.delete(Source).where(Source.claim_id.in_(ids)))
+    db.session.execute(db.delete(OverallCRAAPScore).where(OverallCRAAPScore.claim_id.in_(ids)))
+
+    source_rows = []
+    source_scores = []
+    overall_rows = []
+    for text_hash, claim_id in claim_ids.items():
+        result = by_hash[text_hash]
+        for source_data in result['sources']:
+            source_rows.append({
+                'claim_id': claim_id,
+                # Columns are VARCHAR(512); PostgreSQL rejects longer values instead of storing them
+                'name': source_data['name'][:512],
+                'url': source_data['url'][:512],
+                'snippet': source_data['snippet'],
+                'date_last_crawled': source_data['date_last_crawled'],
+                'intent_category': source_data['intent_category'],
+                'intent_explanation': source_data['intent_explanation'],
+            })
+            source_scores.append(source_data['craap_scores'])
+        for criterion, score in (result['overall_craap_scores'] or {}).items():
+            overall_rows.append({'claim_id': claim_id, 'criterion': criterion, 'score': score})
+
+    if source_rows:
+        source_ids = db.session.scalars(
+            db.insert(Source).returning(Source.id, sort_by_parameter_order=True), source_rows
+        ).all()
+        score_rows = [
+            {'source_id': source_id, 'criterion': score['criterion'], 'score': score['score'],
+             'explanation': score['explanation']}
+            for source_id, scores in zip(source_ids, source_scores)
+            for score in scores
+        ]
+        if score_rows:
+            db.session.execute(db.insert(CRAAPScore), score_rows)
+    if overall_rows:
+        db.session.execute(db.insert(OverallCRAAPScore), overall_rows)
+    db.session.commit()
+    page_cache.invalidate(['news'] + [f'claim:{claim_id}' for claim_id in ids])
+
+
+def stream_claim_verification(text):
+    """Generator form of `extract_and_verify_claims`.
+
+    Yields ('claims', ...) once the claims are extracted, then the pipeline's
+    progress events, a ('result', ...) for each claim as soon as it is fully
+    scored, and finally ('done', {'results': [...]}) after the results have
+    been saved. Claims verified recently enough are answered from the
+    database straight away and skip the pipeline, as are near-duplicates of
+    them (see `match_similar_claim`).
+    """
+    claims = extract_claims_windowed(text)
+    yield 'claims', {'claims': claims}
+
+    results = [None] * len(claims)
+    stale = []
+    # pipeline index -> seed from a similar stored claim
+    seeds = {}
+    for index, claim_text in enumerate(claims):
+        fresh = find_fresh_claim(claim_text)
+        if fresh is not None:
+            results[index] = load_claim_result(fresh)
         else:
-            craap_scores_list = []
-            sources_data = []
-            for source_data in sources:
-                # Save source to database
-                source = Source(
-                    claim_id=claim.id,
-                    name=source_data['name'],
-                    url=source_data['url'],
-                    snippet=source_data['snippet'],
-                    date_last_crawled=source_data['date_last_crawled']
-                )
-                # Intentionality Categorization
-                intent_categorization = categorize_source_intent(source_data)
-                source.intent_category = intent_categorization['category']
-                source.intent_explanation = intent_categorization['explanation']
-                db.session.add(source)
-                db.session.commit()
-
-                # Prepare CRAAP scores
-                craap_scores = compute_craap_score(claim_text, source_data)
-                # Append the CRAAP scores dictionary to the list
-                craap_scores_list.append(craap_scores)
-
-                # Prepare source-specific CRAAP scores for display
-                source_craap_scores_list = [
-                    {
-                        'criterion': criterion,
-                        'score': details['score'],
-                        'explanation': details['explanation']
-                    }
-                    for criterion, details in craap_scores.items()
-                    if criterion != 'source'
-                ]
-
-                # Add source data to sources_data list
-                sources_data.append({
-                    'name': source.name,
-                    'url': source.url,
-                    'snippet': source.snippet,
-                    'intent_category': source.intent_category,
-                    'intent_explanation': source.intent_explanation,
-                    'craap_scores': source_craap_scores_list
-                })
-
-            # Compute overall CRAAP scores
-            overall_craap_scores = compute_overall_craap_score(craap_scores_list)
-            # Assess the claim's veracity
-            veracity_assessment = assess_claim_veracity(claim_text, sources)
-
-        # Calculate final truth score
-        if overall_craap_scores and veracity_assessment:
-            final_truth_score = calculate_final_truth_score(
-                overall_craap_scores,
-                veracity_assessment['probability']
-            )
-            # Update claim with veracity assessment and final truth score
-            claim.veracity_probability = veracity_assessment['probability']
-            claim.veracity_justification = veracity_assessment['justification']
-            claim.final_truth_score = final_truth_score
-            db.session.commit()
+            results[index], seed = match_similar_claim(claim_text)
+            if results[index] is None:
+                if seed:
+                    seeds[len(stale)] = seed
+                stale.append(index)
+                continue
+        yield 'result', {'claim_index': index, 'result': results[index]}
+
+    seed_sources = {position: seed['sources'] for position, seed in seeds.items()}
+    for event, payload in iter_claim_pipeline([claims[index] for index in stale], seed_sources):
+        # The pipeline only sees the stale claims; map its indices back
+        position = payload['claim_index']
+        index = stale[position]
+        if event == 'outcome':
+            results[index] = build_claim_result(claims[index], payload['outcome'])
+            if position in seeds:
+                results[index]['similar_claim'] = seeds[position]['similar_claim']
+            yield 'result', {'claim_index': index, 'result': results[index]}
         else:
-            final_truth_score = None
-
-        # Add everything to the results list
-        results.append({
-            'claim': claim_text,
-            'sources': sources_data if sources else [],
-            'overall_craap_scores': overall_craap_scores,
-            'veracity_assessment': veracity_assessment,
-            'final_truth_score': final_truth_score
-        })
+            yield event, dict(payload, claim_index=index)
+
+    save_claim_results([results[index] for index in stale])
+    yield 'done', {'results': results}
+
+
+def extract_and_verify_claims(text, on_event=None):
+    results = []
+    for event, payload in stream_claim_verification(text):
+        if on_event:
+            on_event(event, payload)
+        if event == 'done':
+            results = payload['results']
     return results
 
 
 
+@tracer.timed('veracity')
 def assess_claim_veracity(claim, sources):
     try:
         # Combine the content from the top sources
@@ -368,45 +1252,38 @@ Claim:
 Evidence:
 {source_texts}
 
-Format:
-Probability: [value between 0 and 1]
-Justification: [Your brief justification]
+Respond with a JSON object in this format:
+{json_schema_hint(VERACITY_FORMAT)}
 """
 
-        response = client.chat.completions.create(
-            model="llama-3.1-70b-versatile",
-            messages=[
+        values, _ = request_record(
+            client, parse_stats, 'veracity', VERACITY_FIELDS,
+            [
                 {
                     "role": "system",
                     "content": "You are a helpful assistant that assesses the truthfulness of claims based on evidence."
                 },
                 {"role": "user", "content": prompt}
             ],
+            json_mode=app.config['LLM_JSON_MODE'],
+            model="llama-3.1-70b-versatile",
             max_tokens=300,
             temperature=0.2
         )
-
-        # Parse the response
-        content = response.choices[0].message.content.strip()
-        probability = None
-        justification = ''
-        lines = content.split('\n')
-        for line in lines:
-            if line.startswith('Probability:'):
-                probability = float(line.split('Probability:')[1].strip())
-            elif line.startswith('Justification:'):
-                justification = line.split('Justification:')[1].strip()
-
         return {
-            'probability': probability,
-            'justification': justification
+            'probability': values.get('Probability'),
+            'justification': values.get('Justification', '')
         }
     except Exception as e:
         print(f"Error assessing claim veracity: {e}")
         return None
 
 
+@tracer.timed('intent')
 def categorize_source_intent(source):
+    cached = source_profiles.get(source['url']).get('intent')
+    if cached:
+        return cached
     try:
         # Prepare the prompt
         prompt = f"""
@@ -428,64 +1305,209 @@ You are an expert analyst. Given the following source content, categorize the so
 Source Snippet:
 "{source['snippet']}"
 
-Format:
-Category Number: [Select the most appropriate category number]
-Explanation: [Briefly explain why this category was chosen]
+Respond with a JSON object in this format:
+{json_schema_hint(INTENT_FORMAT)}
 """
 
-        response = client.chat.completions.create(
-            model="llama-3.1-70b-versatile",
-            messages=[
+        values, _ = request_record(
+            client, parse_stats, 'intent', INTENT_FIELDS,
+            [
                 {
                     "role": "system",
                     "content": "You are a helpful assistant that categorizes sources based on their intent."
                 },
                 {"role": "user", "content": prompt}
             ],
+            json_mode=app.config['LLM_JSON_MODE'],
+            model="llama-3.1-70b-versatile",
             max_tokens=150,
             temperature=0.2
         )
-
-        # Parse the response
-        content = response.choices[0].message.content.strip()
-        category_number = None
-        explanation = ''
-        lines = content.split('\n')
-        for line in lines:
-            if line.startswith('Category Number:'):
-                category_number = int(line.split('Category Number:')[1].strip())
-            elif line.startswith('Explanation:'):
-                explanation = line.split('Explanation:')[1].strip()
-
-        # Map the category number to the category name
-        categories = {
-            1: 'News/Journalism',
-            2: 'Opinion/Editorial',
-            3: 'Scientific/Scholarly',
-            4: 'Marketing/Advertising',
-            5: 'Entertainment',
-            6: 'Propaganda',
-            7: 'Satire/Parody',
-            8: 'Advocacy/Non-Profit',
-            9: 'Personal Blog/Opinion',
-            10: 'Government/Official',
-            11: 'Educational',
-            12: 'Social Media Post'
-        }
-        category_name = categories.get(category_number, 'Unknown')
-
-        return {
-            'category': category_name,
-            'explanation': explanation
-        }
+        intent = intent_from_values(values)
+        remember_source_profile(source, intent=intent)
+        return intent
     except Exception as e:
         print(f"Error categorizing source intent: {e}")
-        return {
-            'category': 'Unknown',
-            'explanation': 'Could not determine the category.'
-        }
+        return unknown_intent()
+
+
+def unknown_intent():
+    return {
+        'category': 'Unknown',
+        'explanation': 'Could not determine the category.'
+    }
+
+
+def intent_from_values(values):
+    # Map the category number to the category name
+    return {
+        'category': INTENT_CATEGORIES.get(values.get('Category Number'), 'Unknown'),
+        'explanation': values.get('Explanation', '')
+    }
+
+
+_SOURCE_HEADER = re.compile(r'^\s*\**\s*Source\s+(\d+)\s*:?\s*\**\s*$', re.MULTILINE)
+
+
+def split_source_sections(content):
+    # Map "Source N:" headers to the text that follows them
+    sections = {}
+    headers = list(_SOURCE_HEADER.finditer(content))
+    for header, next_header in zip(headers, headers[1:] + [None]):
+        end = next_header.start() if next_header else len(content)
+        sections[int(header.group(1))] = content[header.end():end]
+    return sections
+
+
+def split_evaluations(content):
+    # Per-source records from a {"sources": [...]} JSON answer, or "Source N:" text sections
+    data = load_json_object(content)
+    entries = data.get('sources') if data else None
+    if not isinstance(entries, list):
+        return split_source_sections(content)
+    records = {}
+    for position, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict):
+            continue
+        number = next((value for key, value in entry.items() if key.lower() == 'source'), position)
+        try:
+            records[int(number)] = entry
+        except (TypeError, ValueError):
+            records[position] = entry
+    return records
+
+
+@tracer.timed('evaluation')
+def evaluate_sources(claim, sources):
+    """Categorize intent and CRAAP-score all of a claim's sources in one completion.
+
+    Intent and criteria already held in a source's profile are reused, so
+    known sources are only asked for Relevance and Accuracy (plus Currency
+    for a new page on a known domain). Values that are missing or unreadable
+    for some sources are asked for again in a single follow-up listing just
+    those fields; whatever is still missing after that is left out (intent
+    'Unknown', criterion unscored). If the call itself fails, each source is
+    scored with the per-source `categorize_source_intent` /
+    `compute_craap_score` calls instead.
+    Returns (intents, craap_scores_list), both in the order of `sources`.
+    """
+    profiles = [source_profiles.get(source['url']) for source in sources]
+    # Names of the values still wanted per source number
+    wanted = {
+        number: [field.name for field in EVALUATION_FIELDS
+                 if field.name not in profile and not (field in INTENT_FIELDS and 'intent' in profile)]
+        for number, profile in enumerate(profiles, 1)
+    }
+    asked = [name for name in EVALUATION_FORMAT if any(name in names for names in wanted.values())]
+    criteria = [criterion for criterion in CRAAP_CRITERIA if criterion in asked]
+    listing = '\n\n'.join(
+        f"""Source {number}:
+Title: {source['name']}
+URL: {source['url']}
+Snippet: {source['snippet']}
+Date Last Crawled: {source['date_last_crawled']}"""
+        + ('' if wanted[number] == asked else '\nOnly evaluate: ' + ', '.join(f'"{name}"' for name in wanted[number]))
+        for number, source in enumerate(sources, 1)
+    )
+    steps = []
+    if any(field.name in asked for field in INTENT_FIELDS):
+        categories = '\n'.join(f"{number}. {name}" for number, name in INTENT_CATEGORIES.items())
+        steps.append(f"Categorize the source's intent into one of the following categories:\n{categories}")
+    steps.append(
+        "Assess the source using the CRAAP test, scoring each criterion from 0 (lowest) to 10 (highest):\n"
+        + craap_rubric(criteria)
+    )
+    instructions = '\n\n'.join(f"{number}. {step}" for number, step in enumerate(steps, 1))
+    prompt = f"""
+Evaluate each of the following sources for the claim "{claim}".
+
+For every source:
+{instructions}
 
+Sources:
+{listing}
+
+Respond with a JSON object holding one entry per source, in the same order, in this format
+(for a source marked "Only evaluate", give just the keys listed there):
+{{"sources": [
+  {json_schema_hint({'Source': EVALUATION_FORMAT['Source'], **{name: EVALUATION_FORMAT[name] for name in asked}}, indent='    ')},
+  ...
+]}}
+"""
+    messages = [
+        {
+            "role": "system",
+            "content": "You are a helpful assistant that categorizes sources by intent and evaluates them based on the CRAAP test."
+        },
+        {"role": "user", "content": prompt}
+    ]
+    options = dict(
+        json_mode=app.config['LLM_JSON_MODE'],
+        model="llama3-groq-70b-8192-tool-use-preview",
+        # About 450 tokens for a source evaluated in full
+        max_tokens=sum(65 * len(names) for names in wanted.values()),
+        temperature=0.2
+    )
+    try:
+        content = complete_json(client, parse_stats, 'evaluation', messages, **options)
+    except Exception as e:
+        print(f"Error evaluating sources for claim '{claim}': {e}")
+        return (
+            [categorize_source_intent(source) for source in sources],
+            [compute_craap_score(claim, source) for source in sources]
+        )
 
+    parse_stats.record('evaluation', 'responses')
+    records = split_evaluations(content)
+    values = {}
+    missing = {}
+    for number in range(1, len(sources) + 1):
+        fields = [field for field in EVALUATION_FIELDS if field.name in wanted[number]]
+        values[number], missing_fields, _ = parse_record(records.get(number, ''), fields)
+        if missing_fields:
+            missing[number] = missing_fields
+
+    if not missing:
+        parse_stats.record('evaluation', 'parsed')
+    else:
+        # One follow-up for every gap, asking only for the values that are missing
+        parse_stats.record('evaluation', 'reasked')
+        gaps = '\n'.join(
+            f"Source {number}: " + ', '.join(f'"{name}"' for name in names) for number, names in missing.items()
+        )
+        followup = messages + [
+            {'role': 'assistant', 'content': content},
+            {'role': 'user', 'content': (
+                f"Some values in your answer were missing or unreadable:\n{gaps}\n"
+                'Reply with a JSON object {"sources": [...]} holding an entry for each of these sources '
+                'with its "Source" number and only the keys listed, in the format asked for above.'
+            )},
+        ]
+        try:
+            retry_records = split_evaluations(complete_json(client, parse_stats, 'evaluation', followup, **options))
+            for number, names in list(missing.items()):
+                fields = [field for field in EVALUATION_FIELDS if field.name in names]
+                retry_values, still_missing, _ = parse_record(retry_records.get(number, ''), fields)
+                values[number].update(retry_values)
+                if still_missing:
+                    missing[number] = still_missing
+                else:
+                    del missing[number]
+        except Exception as e:
+            print(f"Error re-asking for missing source evaluations for claim '{claim}': {e}")
+        parse_stats.record('evaluation', 'failed' if missing else 'recovered')
+        for number, names in missing.items():
+            print(f"Source {number} evaluation missing {', '.join(names)} for claim '{claim}'")
+
+    intents = []
+    craap_scores_list = []
+    for number, (source, profile) in enumerate(zip(sources, profiles), 1):
+        fresh_intent = None if 'intent' in profile else intent_from_values(values[number])
+        remember_source_profile(source, intent=fresh_intent, craap_scores=values[number])
+        scores = {**profile, **values[number]}
+        intents.append(profile.get('intent') or fresh_intent)
+        craap_scores_list.append({criterion: scores[criterion] for criterion in CRAAP_CRITERIA if criterion in scores})
+    return intents, craap_scores_list
 
 
 def interpret_probability(probability):
@@ -512,33 +1534,626 @@ def interpret_final_score(final_score):
 
 
 
+def get_input_text(input_type, content, strict=False):
+    if input_type == 'url':
+        return extract_text_from_url(content, strict=strict)
+    return content
+
+
+def fact_check(input_type, content, on_event=None):
+    with tracer.trace('fact_check', input_type=input_type):
+        return extract_and_verify_claims(get_input_text(input_type, content), on_event=on_event)
+
+
+def prepare_batch_item(item):
+    # Runs on the batch fetch threads: download/extract the input and pull out its claims
+    try:
+        text = get_input_text(item['input_type'], item['content'], strict=True)
+        if not text:
+            return [], 'No article text could be extracted from the URL.'
+        return extract_claims_windowed(text), None
+    except Exception as e:
+        print(f"Error preparing batch item {item['id']}: {e}")
+        return [], str(e)
+
+
+def iter_fact_check_batch(items):
+    """Fact-check many inputs, yielding one output record per input in order.
+
+    Inputs are processed BATCH_CHUNK_SIZE at a time. Within a chunk the
+    inputs are fetched and their claims extracted in parallel; the claims of
+    the whole chunk are then de-duplicated (by claim hash, and against
+    claims already verified earlier in the batch or recently enough in the
+    database, exactly or as a near-duplicate) and only the unique stale ones
+    go through the claim pipeline,
+    whose searches are shared per normalized query by the search cache.
+    Each chunk's results are saved before its records are yielded.
+    """
+    chunk_size = app.config['BATCH_CHUNK_SIZE']
+    verified = {}
+    with ThreadPoolExecutor(max_workers=app.config['BATCH_FETCH_WORKERS'],
+                            thread_name_prefix='factcheck-batch') as executor:
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            with tracer.trace('batch_chunk', first_item=start, items=len(chunk)):
+                futures = [executor.submit(contextvars.copy_context().run, prepare_batch_item, item) for item in chunk]
+                prepared = [future.result() for future in futures]
+
+                pending = {}
+                seeds = {}
+                for claims, _ in prepared:
+                    for claim_text in claims:
+                        key = claim_text_hash(claim_text)
+                        if key in verified or key in pending:
+                            continue
+                        fresh = find_fresh_claim(claim_text)
+                        if fresh is not None:
+                            verified[key] = load_claim_result(fresh)
+                            continue
+                        reused, seed = match_similar_claim(claim_text)
+                        if reused is not None:
+                            verified[key] = reused
+                            continue
+                        pending[key] = claim_text
+                        if seed:
+                            seeds[key] = seed
+
+                stale = list(pending.values())
+                stale_keys = list(pending)
+                seed_sources = {
+                    index: seeds[key]['sources'] for index, key in enumerate(stale_keys) if key in seeds
+                }
+                results = [None] * len(stale)
+                for event, payload in iter_claim_pipeline(stale, seed_sources):
+                    if event == 'outcome':
+                        index = payload['claim_index']
+                        results[index] = build_claim_result(stale[index], payload['outcome'])
+                        if stale_keys[index] in seeds:
+                            results[index]['similar_claim'] = seeds[stale_keys[index]]['similar_claim']
+                save_claim_results(results)
+                verified.update(zip(pending, results))
+
+            for item, (claims, error) in zip(chunk, prepared):
+                record = dict(item, claims=claims, results=[verified[claim_text_hash(claim)] for claim in claims])
+                if error:
+                    record['error'] = error
+                yield record
+
+
+job_executor = None
+# Live progress of the jobs this process runs, for their /jobs/<id>/events streams
+job_feed = EventFeed()
+
+
+def start_job_workers():
+    """Start the worker pool and pick up jobs left queued or stuck by a previous process."""
+    global job_executor
+    if job_executor is not None:
+        return
+    job_executor = ThreadPoolExecutor(max_workers=app.config['JOB_WORKERS'], thread_name_prefix='factcheck-job')
+    stale_before = datetime.utcnow() - timedelta(seconds=app.config['JOB_STALE_AFTER'])
+    leftover = FactCheckJob.query.filter(
+        (FactCheckJob.status == 'queued')
+        | ((FactCheckJob.status == 'running') & (FactCheckJob.started_at < stale_before))
+    ).order_by(FactCheckJob.created_at).all()
+    for job in leftover:
+        job.status = 'queued'
+    db.session.commit()
+    for job in leftover:
+        job_executor.submit(run_fact_check_job, job.id)
+
+
+def enqueue_fact_check(input_type, content):
+    start_job_workers()
+    job = FactCheckJob(input_type=input_type, content=content)
+    db.session.add(job)
+    db.session.commit()
+    job_feed.open(job.id)
+    job_executor.submit(run_fact_check_job, job.id)
+    return job
+
+
+def claim_job(job_id):
+    # Claim the job atomically so two processes never run the same one
+    claimed = FactCheckJob.query.filter(
+        FactCheckJob.id == job_id, FactCheckJob.status == 'queued'
+    ).update({'status': 'running', 'started_at': datetime.utcnow()})
+    db.session.commit()
+    if not claimed:
+        return None
+    return db.session.get(FactCheckJob, job_id)
+
+
+def iter_job_events(job):
+    """Run a claimed job, recording claims and per-claim results on its row as they arrive.
+
+    Yields the same events as `stream_claim_verification`, or ('error', ...)
+    if the pipeline fails. Batch jobs yield ('record', ...) events instead
+    (see `iter_batch_job_events`).
+    """
+    results = []
+    try:
+        if job.input_type == 'batch':
+            yield from iter_batch_job_events(job)
+            return
+        with tracer.trace('job', job_id=job.id, input_type=job.input_type):
+            text = get_input_text(job.input_type, job.content)
+            for event, payload in stream_claim_verification(text):
+                if event == 'claims':
+                    results = [None] * len(payload['claims'])
+                    job.claims = json.dumps(payload['claims'])
+                    db.session.commit()
+                elif event == 'result':
+                    results[payload['claim_index']] = payload['result']
+                    job.results = json.dumps(results)
+                    db.session.commit()
+                elif event == 'done':
+                    job.results = json.dumps(payload['results'])
+                    job.status = 'done'
+                    job.finished_at = datetime.utcnow()
+                    db.session.commit()
+                yield event, payload
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error running fact-check job {job.id}: {e}")
+        job.status = 'failed'
+        job.error = str(e)
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        yield 'error', {'message': str(e)}
+
+
+def iter_batch_job_events(job):
+    """Run a batch job, saving each input's output record on the job's row as it is produced.
+
+    The row's content holds the normalized items, and its results the
+    records so far, in input order. A job picked up again after a crash
+    carries on after the records it had already saved.
+    """
+    items = json.loads(job.content)
+    records = json.loads(job.results) if job.results else []
+    for record in iter_fact_check_batch(items[len(records):]):
+        records.append(record)
+        job.results = json.dumps(records)
+        db.session.commit()
+        yield 'record', {'item_index': len(records) - 1, 'record': record}
+    job.status = 'done'
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+    yield 'done', {'results': records}
+
+
+def follow_job(job_id, interval=1.0):
+    """Replay a job's recorded progress as events, polling its row until it finishes."""
+    claims_sent = False
+    results_sent = set()
+    while True:
+        job = db.session.get(FactCheckJob, job_id, populate_existing=True)
+        data = job.to_dict()
+        if data['claims'] and not claims_sent:
+            claims_sent = True
+            yield 'claims', {'claims': data['claims']}
+        for index, result in enumerate(data['results']):
+            if result and index not in results_sent:
+                results_sent.add(index)
+                if job.input_type == 'batch':
+                    yield 'record', {'item_index': index, 'record': result}
+                else:
+                    yield 'result', {'claim_index': index, 'result': result}
+        if job.status == 'done':
+            yield 'done', {'results': data['results']}
+            return
+        if job.status == 'failed':
+            yield 'error', {'message': job.error}
+            return
+        # End the read transaction so the next poll sees the worker's commits
+        db.session.rollback()
+        time.sleep(interval)
+
+
+def run_fact_check_job(job_id):
+    with app.app_context():
+        try:
+            job = claim_job(job_id)
+            if job is None:
+                return
+            job_feed.open(job_id)
+            for event, payload in iter_job_events(job):
+                job_feed.publish(job_id, event, payload)
+        finally:
+            job_feed.close(job_id)
+
+
+def wants_json():
+    best = request.accept_mimetypes.best_match(['application/json', 'text/html'])
+    return request.is_json or best == 'application/json'
+
+
+def sse_message(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
     if request.method == 'POST':
         input_type = request.form['input_type']
         content = request.form['content']
 
-        if input_type == 'url':
-            text = extract_text_from_url(content)
-        else:
-            text = content
+        if app.config['STREAM_RESULTS']:
+            # A job worker runs the check; the results page follows it over /jobs/<id>/events
+            job = enqueue_fact_check(input_type, content)
+            return render_template('results.html', results=[], stream_url=url_for('job_events', job_id=job.id))
+
+        if app.config['ASYNC_JOBS']:
+            job = enqueue_fact_check(input_type, content)
+            return redirect(url_for('job_detail', job_id=job.id))
 
-        fact_check_results = extract_and_verify_claims(text)
+        fact_check_results = fact_check(input_type, content)
 
         return render_template('results.html', results=fact_check_results)
     return render_template('index.html')
 
+
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    data = request.get_json(silent=True) or request.form
+    input_type = data.get('input_type', 'text')
+    content = data.get('content')
+    if not content or input_type not in ('text', 'url'):
+        return jsonify({'error': "Provide 'content' and an 'input_type' of 'text' or 'url'."}), 400
+    return job_accepted(enqueue_fact_check(input_type, content))
+
+
+def job_accepted(job):
+    response = jsonify({
+        'id': job.id,
+        'status': job.status,
+        'status_url': url_for('job_status', job_id=job.id),
+        'events_url': url_for('job_events', job_id=job.id),
+    })
+    response.status_code = 202
+    response.headers['Location'] = url_for('job_detail', job_id=job.id)
+    return response
+
+
+@app.route('/jobs/<job_id>/status')
+def job_status(job_id):
+    job = db.get_or_404(FactCheckJob, job_id)
+    return jsonify(job.to_dict())
+
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Server-sent events for a job; the job itself always runs on a job worker.
+
+    A job queued or running in this process is followed live through
+    `job_feed`; one run by another process (or already finished) is followed
+    through its recorded progress instead. 'result' events carry the
+    rendered claim card; batch jobs send a 'record' event per input instead.
+    """
+    db.get_or_404(FactCheckJob, job_id)
+
+    def iter_events():
+        finished = False
+        for event, payload in job_feed.follow(job_id) or ():
+            finished = event in ('done', 'error')
+            yield event, payload
+        if not finished:
+            # Not run here, or claimed by another process after all
+            yield from follow_job(job_id)
+
+    def generate():
+        for event, payload in iter_events():
+            if event == 'result':
+                payload = dict(payload, html=render_template('_claim_card.html', result=payload['result']))
+            elif event == 'done':
+                # Every result has already gone out on its own
+                payload = {}
+            yield sse_message(event, payload)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/jobs/<job_id>')
+def job_detail(job_id):
+    job = db.get_or_404(FactCheckJob, job_id)
+    if wants_json() or job.input_type == 'batch':
+        return jsonify(job.to_dict())
+    if job.status == 'done':
+        return render_template('results.html', results=json.loads(job.results))
+    return render_template('job_status.html', job=job.to_dict())
+
+@app.route('/batch', methods=['POST'])
+def fact_check_batch():
+    """Queue a batch of inputs as one job on the job workers.
+
+    Answers 202 like POST /jobs. The output records (one per input, in
+    order) build up in the job's results at /jobs/<id>/status, and
+    /jobs/<id>/events streams a 'record' event for each.
+    """
+    data = request.get_json(silent=True) or {}
+    raw_items = data.get('items')
+    if not isinstance(raw_items, list) or not raw_items:
+        return jsonify({'error': "Provide a non-empty 'items' list."}), 400
+    if len(raw_items) > app.config['BATCH_MAX_ITEMS']:
+        return jsonify({
+            'error': f"At most {app.config['BATCH_MAX_ITEMS']} items per request; use flask factcheck-batch for more."
+        }), 413
+    try:
+        items = [normalize_batch_item(raw, index) for index, raw in enumerate(raw_items)]
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return job_accepted(enqueue_fact_check('batch', json.dumps(items)))
+
+
+@app.cli.command('factcheck-batch')
+@click.argument('input_path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--output', '-o', 'output_path', required=True, type=click.Path(dir_okay=False),
+              help='JSONL file for the results; re-running with the same file resumes the batch.')
+def factcheck_batch_command(input_path, output_path):
+    """Fact-check every {"input_type", "content"} line of a JSONL file."""
+    try:
+        items = read_batch_items(input_path)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    checkpoint = BatchCheckpoint(output_path)
+    todo = [item for item in items if item['id'] not in checkpoint.done]
+    click.echo(f"{len(items)} inputs, {len(items) - len(todo)} already done")
+    try:
+        for record in iter_fact_check_batch(todo):
+            checkpoint.write(record)
+            click.echo(f"{len(checkpoint.done)}/{len(items)} {record['id']}: {len(record['claims'])} claims")
+    finally:
+        checkpoint.close()
+
+
+@app.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """Rebuild the /search full-text index from the stored claims and sources."""
+    if db.engine.dialect.name != 'sqlite':
+        raise click.ClickException('The full-text index is only used with SQLite.')
+    with db.engine.begin() as connection:
+        create_search_index(connection)
+        rebuild_search_index(connection)
+        indexed = connection.exec_driver_sql("SELECT count(*) FROM claim_fts").scalar()
+    click.echo(f"Indexed {indexed} claims")
+
+
+@metrics.collector
+def collect_pipeline_stats():
+    # Counters kept by the rate limiter, caches, HTTP client and parser, read at scrape time
+    budgets = groq_client.stats()
+    llm, search, article = llm_cache.stats(), search_cache.stats(), article_cache.stats()
+    profiles, pages = source_profiles.stats(), page_cache.stats()
+    lookups = [
+        ({'cache': 'llm', 'outcome': 'hit'}, llm['hits']),
+        ({'cache': 'llm', 'outcome': 'miss'}, llm['misses']),
+        ({'cache': 'search', 'outcome': 'hit'}, search['hits']),
+        ({'cache': 'search', 'outcome': 'miss'}, search['misses']),
+        ({'cache': 'article', 'outcome': 'hit'}, article['hits']),
+        ({'cache': 'article', 'outcome': 'revalidated'}, article['revalidated']),
+        ({'cache': 'article', 'outcome': 'miss'}, article['downloads']),
+        ({'cache': 'article_claims', 'outcome': 'hit'}, article['claim_hits']),
+        ({'cache': 'source_profile', 'outcome': 'url_hit'}, profiles['url_hits']),
+        ({'cache': 'source_profile', 'outcome': 'domain_hit'}, profiles['domain_hits']),
+        ({'cache': 'source_profile', 'outcome': 'miss'}, profiles['misses']),
+        ({'cache': 'page', 'outcome': 'hit'}, pages['hits']),
+        ({'cache': 'page', 'outcome': 'miss'}, pages['misses']),
+    ]
+    http_stats = http.stats.snapshot()
+    parse_counts = [
+        ({'call': name, 'outcome': outcome}, count)
+        for name, counts in parse_stats.snapshot().items()
+        for outcome, count in counts.items()
+        if outcome != 'first_pass_rate'
+    ]
+    return [
+        ('factcheck_groq_requests_total', 'counter', 'Completions sent to Groq, by model.',
+         [({'model': model}, budget['calls']) for model, budget in budgets.items()]),
+        ('factcheck_groq_tokens_total', 'counter', 'Tokens billed by Groq (from the usage field), by model.',
+         [({'model': model, 'type': kind}, budget[f'{kind}_tokens'])
+          for model, budget in budgets.items() for kind in ('prompt', 'completion')]),
+        ('factcheck_groq_throttled_total', 'counter', 'Groq 429 responses that were backed off and retried.',
+         [({'model': model}, budget['throttled']) for model, budget in budgets.items()]),
+        ('factcheck_groq_wait_seconds_total', 'counter', 'Time spent waiting on the Groq rate limiter.',
+         [({'model': model}, budget['wait_seconds']) for model, budget in budgets.items()]),
+        ('factcheck_groq_concurrency_limit', 'gauge', 'Current AIMD concurrency ceiling per model.',
+         [({'model': model}, budget['concurrency_limit']) for model, budget in budgets.items()]),
+        ('factcheck_cache_lookups_total', 'counter', 'Cache lookups by cache and outcome.', lookups),
+        ('factcheck_http_requests_total', 'counter', 'Outbound HTTP requests (Bing and articles).',
+         [({}, http_stats['requests'])]),
+        ('factcheck_http_retries_total', 'counter', 'Outbound HTTP requests retried.', [({}, http_stats['retries'])]),
+        ('factcheck_http_connections_opened_total', 'counter', 'New outbound HTTP connections.',
+         [({}, http_stats['connections_opened'])]),
+        ('factcheck_http_seconds_total', 'counter',
+         'Outbound HTTP time by phase: connect (DNS, TCP and TLS) or transfer (request, server time and body).',
+         [({'phase': 'connect'}, http_stats['connect_seconds']),
+          ({'phase': 'transfer'}, http_stats['transfer_seconds'])]),
+        ('factcheck_http_connection_reuse_ratio', 'gauge',
+         'Share of outbound HTTP requests sent on an already open connection.',
+         [({}, http_stats['connection_reuse_rate'])]),
+        ('factcheck_llm_parse_total', 'counter',
+         'Structured LLM responses by call and parse outcome (failed = still missing fields after the re-ask).',
+         parse_counts),
+    ]
+
+
+def make_score_analytics():
+    # NumPy arrays of every stored score; loaded in full in the background by start_stats_load
+    from analytics import ScoreAnalytics
+    return ScoreAnalytics(CRAAP_CRITERIA)
+
+
+score_analytics = LazyObject(make_score_analytics)
+stats_loader = None
+stats_loader_lock = threading.Lock()
+
+
+def load_score_analytics():
+    with app.app_context():
+        with tracer.span('stats_load'):
+            score_analytics.refresh(db.session.connection())
+
+
+def start_stats_load():
+    """Start the full /stats load in a background thread, unless it is running or done."""
+    global stats_loader
+    with stats_loader_lock:
+        if score_analytics.loaded or (stats_loader is not None and stats_loader.is_alive()):
+            return
+        stats_loader = threading.Thread(target=load_score_analytics, name='stats-load', daemon=True)
+        stats_loader.start()
+
+
+@app.route('/stats')
+def stats():
+    period = request.args.get('period', 'month')
+    if period not in ('day', 'week', 'month'):
+        return jsonify({'error': "period must be 'day', 'week' or 'month'."}), 400
+    if not score_analytics.loaded:
+        # The first load reads every score; answer straight away rather than queue behind it
+        start_stats_load()
+        response = jsonify({'error': 'Statistics are still loading; try again shortly.'})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+    with tracer.span('stats_refresh'):
+        # A refresh already running elsewhere is not waited for; this request gets the last summary
+        score_analytics.refresh(
+            db.session.connection(), max_age=app.config['STATS_REFRESH_INTERVAL'], wait=False
+        )
+    return jsonify(score_analytics.summary(period=period))
+
+
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
+_template_fingerprint = None
+
+
+def template_fingerprint():
+    # Hash of every template, so pages rendered before a deploy get new ETags after it
+    global _template_fingerprint
+    if _template_fingerprint is None:
+        digest = hashlib.sha256()
+        folder = os.path.join(app.root_path, app.template_folder)
+        for name in sorted(os.listdir(folder)):
+            with open(os.path.join(folder, name), 'rb') as f:
+                digest.update(name.encode('utf-8') + b'\0' + f.read())
+        _template_fingerprint = digest.hexdigest()
+    return _template_fingerprint
+
+
+def page_etag(key, date_checked):
+    version = date_checked.isoformat() if date_checked else ''
+    return hashlib.sha256(f"{key}|{version}|{template_fingerprint()}".encode('utf-8')).hexdigest()[:32]
+
+
+def page_response(body, etag, last_modified):
+    response = Response(body, mimetype='text/html')
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['PAGE_MAX_AGE']
+    return response.make_conditional(request)
+
+
+def cached_page(key, group, validators, render):
+    """Serve a page from `page_cache`, answering conditional requests with 304 Not Modified.
+
+    `validators()` returns the page's (etag, last_modified) from a cheap
+    query on every request. A cached page is served only while its ETag still
+    matches, so a claim re-verified through another node (whose invalidation
+    only reached that node's cache) isn't served stale here. Otherwise the
+    validators answer a conditional request, or the page is rendered with
+    `render()` and cached in `group`.
+    """
+    page, version = page_cache.get(key, group)
+    etag, last_modified = validators()
+    if last_modified is not None:
+        # date_checked is naive UTC
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    if page is not None and page['etag'] == etag:
+        return page_response(page['body'], etag, last_modified)
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return page_response(b'', etag, last_modified)
+    body = render().encode('utf-8')
+    page_cache.set(key, group, version, body, etag, last_modified.timestamp() if last_modified else None)
+    return page_response(body, etag, last_modified)
+
+
+def parse_news_cursor(args):
+    # Keyset cursor for /news: the date_checked and id of the last claim on the previous page
+    try:
+        return datetime.fromisoformat(args['before']), int(args['before_id'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
 @app.route('/news')
 def news():
-    claims = Claim.query.order_by(Claim.date_checked.desc()).all()
+    cursor = parse_news_cursor(request.args)
+    key = 'news' if cursor is None else f"news:{cursor[0].isoformat()}:{cursor[1]}"
+
+    def validators():
+        # Any save moves the newest date_checked, and with it every page of the list
+        latest = db.session.scalar(db.select(func.max(Claim.date_checked)))
+        return page_etag(key, latest), latest
+
+    return cached_page(key, 'news', validators, lambda: render_news_page(cursor))
+
+
+def render_news_page(cursor):
+    page_size = app.config['NEWS_PAGE_SIZE']
+    max_sources = app.config['NEWS_MAX_SOURCES']
+
+    # Only the columns the list view shows; overall scores come in one extra query. Claims with no
+    # date_checked (only ever legacy rows) have no place in the keyset order, so they are left out
+    query = Claim.query.options(
+        load_only(
+            Claim.id, Claim.text, Claim.date_checked, Claim.veracity_probability,
+            Claim.veracity_justification, Claim.final_truth_score
+        ),
+        selectinload(Claim.overall_scores).load_only(OverallCRAAPScore.criterion, OverallCRAAPScore.score)
+    ).filter(Claim.date_checked.isnot(None)).order_by(Claim.date_checked.desc(), Claim.id.desc())
+    if cursor:
+        before_date, before_id = cursor
+        query = query.filter(or_(
+            Claim.date_checked < before_date,
+            and_(Claim.date_checked == before_date, Claim.id < before_id)
+        ))
+    claims = query.limit(page_size + 1).all()
+    has_more = len(claims) > page_size
+    claims = claims[:page_size]
+
+    # First `max_sources` sources of every claim on the page, plus how many were left out
+    claim_ids = [claim.id for claim in claims]
+    ranked = db.session.query(
+        Source.claim_id, Source.name, Source.url, Source.intent_category,
+        func.row_number().over(partition_by=Source.claim_id, order_by=Source.id).label('position'),
+        func.count().over(partition_by=Source.claim_id).label('total')
+    ).filter(Source.claim_id.in_(claim_ids)).subquery()
+    sources_by_claim = {}
+    source_totals = {}
+    for row in db.session.query(ranked).filter(ranked.c.position <= max_sources).order_by(ranked.c.position):
+        sources_by_claim.setdefault(row.claim_id, []).append({
+            'name': row.name,
+            'url': row.url,
+            'intent_category': row.intent_category
+        })
+        source_totals[row.claim_id] = row.total
+
     claims_data = []
     for claim in claims:
         overall_scores = {score.criterion: score.score for score in claim.overall_scores}
-        sources = [{
-            'name': source.name,
-            'url': source.url,
-            'intent_category': source.intent_category
-        } for source in claim.sources]
+        sources = sources_by_claim.get(claim.id, [])
         claims_data.append({
             'id': claim.id,
             'text': claim.text,
@@ -547,12 +2162,56 @@ def news():
             'veracity_probability': claim.veracity_probability,
             'veracity_justification': claim.veracity_justification,
             'final_truth_score': claim.final_truth_score,
-            'sources': sources
+            'sources': sources,
+            'more_sources': source_totals.get(claim.id, 0) - len(sources)
         })
-    return render_template('news.html', claims=claims_data)
+
+    next_cursor = None
+    if has_more:
+        last = claims[-1]
+        next_cursor = {'before': last.date_checked.isoformat(), 'before_id': last.id}
+    return render_template('news.html', claims=claims_data, next_cursor=next_cursor, is_first_page=cursor is None)
+
+@app.route('/search')
+def search():
+    query = request.args.get('q', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+    page_size = app.config['SEARCH_PAGE_SIZE']
+    hits = []
+    if query:
+        if db.engine.dialect.name == 'sqlite':
+            hits = search_claims(db.session.connection(), query, limit=page_size + 1, offset=(page - 1) * page_size)
+        else:
+            # No FTS5 outside SQLite; fall back to a plain substring match on the claim text
+            claims = Claim.query.filter(Claim.text.icontains(query, autoescape=True)).order_by(
+                Claim.date_checked.desc(), Claim.id.desc()
+            ).offset((page - 1) * page_size).limit(page_size + 1).all()
+            hits = [{
+                'id': claim.id,
+                'text': claim.text,
+                'date_checked': claim.date_checked,
+                'veracity_probability': claim.veracity_probability,
+                'final_truth_score': claim.final_truth_score,
+                'text_highlight': claim.text,
+                'match_highlight': None
+            } for claim in claims]
+    has_more = len(hits) > page_size
+    return render_template('search.html', query=query, hits=hits[:page_size], page=page, has_more=has_more)
 
 @app.route('/claim/<int:claim_id>')
 def claim_detail(claim_id):
+    key = f'claim:{claim_id}'
+
+    def validators():
+        row = db.session.execute(db.select(Claim.date_checked).where(Claim.id == claim_id)).first()
+        if row is None:
+            abort(404)
+        return page_etag(key, row.date_checked), row.date_checked
+
+    return cached_page(key, key, validators, lambda: render_claim_detail(claim_id))
+
+
+def render_claim_detail(claim_id):
     claim = Claim.query.get_or_404(claim_id)
     overall_scores = {score.criterion: score.score for score in claim.overall_scores}
     sources_data = []
@@ -627,4 +2286,7 @@ def utility_functions():
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
+        if app.config['ASYNC_JOBS']:
+            start_job_workers()
+    start_stats_load()
     app.run(host='0.0.0.0', port=8080)
\ No newline at end of file
@@ -0,0 +1,190 @@
+# article_cache.py
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from; they never change the page
+TRACKING_PARAMS = frozenset({'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid', 'ref', 'ref_src'})
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalize_url(url):
+    """Normalize a URL so trivially different links to one article share a cache entry.
+
+    Lower-cases the scheme and host, drops default ports, fragments,
+    utm_* and other tracking parameters, sorts the remaining query and
+    strips a trailing slash from the path.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ArticleCache:
+    """Extracted article text per canonical URL, plus claim lists per content hash, in SQLite.
+
+    Articles keep the ETag and Last-Modified they were served with so callers
+    can revalidate with a conditional GET instead of re-downloading and
+    re-parsing. Both tables share one size budget: once the stored text and
+    claim lists exceed `max_bytes`, the least recently used entries are evicted.
+    """
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, enabled=True):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.revalidated = 0
+        self.downloads = 0
+        self.claim_hits = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS article (
+                url TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS article_claims (
+                content_hash TEXT PRIMARY KEY,
+                claims TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_article_last_used ON article (last_used)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_article_claims_last_used ON article_claims (last_used)")
+        self._conn.commit()
+
+    def get(self, url):
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, content_hash, etag, last_modified, fetched_at FROM article WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE article SET last_used = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        return {'text': row[0], 'content_hash': row[1], 'etag': row[2], 'last_modified': row[3], 'fetched_at': row[4]}
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def hit(self, url, revalidated=False):
+        # The cached text was served; a revalidated hit also restarts its freshness clock
+        with self._lock:
+            if revalidated:
+                self.revalidated += 1
+                self._conn.execute("UPDATE article SET fetched_at = ? WHERE url = ?", (time.time(), url))
+                self._conn.commit()
+            else:
+                self.hits += 1
+
+    def set(self, url, text, etag=None, last_modified=None):
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            self.downloads += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO article "
+                "(url, text, content_hash, etag, last_modified, size, fetched_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, text, content_hash(text), etag, last_modified, len(text.encode('utf-8')), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def get_claims(self, text_hash):
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT claims FROM article_claims WHERE content_hash = ?", (text_hash,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE article_claims SET last_used = ? WHERE content_hash = ?", (time.time(), text_hash)
+            )
+            self._conn.commit()
+            self.claim_hits += 1
+        return json.loads(row[0])
+
+    def set_claims(self, text_hash, claims):
+        if not self.enabled:
+            return
+        payload = json.dumps(claims)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO article_claims (content_hash, claims, size, last_used) VALUES (?, ?, ?, ?)",
+                (text_hash, payload, len(payload), time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        (total,) = self._conn.execute(
+            "SELECT COALESCE((SELECT SUM(size) FROM article), 0) + COALESCE((SELECT SUM(size) FROM article_claims), 0)"
+        ).fetchone()
+        if not self.max_bytes or total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT 'article', url, size, last_used FROM article "
+            "UNION ALL SELECT 'article_claims', content_hash, size, last_used FROM article_claims "
+            "ORDER BY last_used ASC"
+        ).fetchall()
+        victims = {'article': [], 'article_claims': []}
+        for table, key, size, _ in rows:
+            if total <= self.max_bytes:
+                break
+            victims[table].append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM article WHERE url = ?", victims['article'])
+        self._conn.executemany("DELETE FROM article_claims WHERE content_hash = ?", victims['article_claims'])
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM article")
+            self._conn.execute("DELETE FROM article_claims")
+            self._conn.commit()
+
+    def stats(self):
+        total = self.hits + self.revalidated + self.downloads
+        return {
+            'hits': self.hits,
+            'revalidated': self.revalidated,
+            'downloads': self.downloads,
+            'hit_rate': (self.hits + self.revalidated) / total if total else 0.0,
+            'claim_hits': self.claim_hits,
+        }
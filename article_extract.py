@@ -0,0 +1,159 @@
+# article_extract.py
+import codecs
+import re
+
+from lxml import etree
+from requests.compat import chardet
+
+# Block-level elements whose text makes up the readable body of a page
+CONTENT_TAGS = ('title', 'h1', 'h2', 'h3', 'p', 'li', 'blockquote')
+SKIP_TAGS = ('script', 'style', 'noscript', 'nav', 'footer', 'aside', 'form')
+# Bytes read before the charset is judged; <meta charset> must appear within the first 1024 per the HTML spec
+SNIFF_BYTES = 4096
+
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="text/html; charset=...">
+_META_CHARSET = re.compile(rb'<meta[^>]*?charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+
+def sniff_encoding(response, head):
+    """The charset to decode an HTML response with, judged from its first bytes.
+
+    A charset in the Content-Type header wins, then one declared in a
+    <meta> tag, then UTF-8 if `head` is valid UTF-8, and a statistical guess
+    last. requests' own `encoding` is only used when the header names a
+    charset, since it falls back to ISO-8859-1 for any text/* response.
+    """
+    if 'charset' in response.headers.get('Content-Type', '').lower() and response.encoding:
+        return response.encoding
+    match = _META_CHARSET.search(head[:SNIFF_BYTES])
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode('ascii')).name
+        except LookupError:
+            pass
+    try:
+        # Incremental, so a character cut off at the end of `head` isn't held against it
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return chardet.detect(head).get('encoding') or 'utf-8'
+
+
+def html_pull_parser(encoding):
+    try:
+        return etree.HTMLPullParser(events=('end',), encoding=encoding)
+    except LookupError:
+        # An encoding Python knows but libxml2 doesn't; let libxml2 detect it
+        return etree.HTMLPullParser(events=('end',))
+
+
+def stream_article_html(response, max_bytes, max_chars, chunk_size=64 * 1024):
+    """Read an HTML response incrementally, stopping early once enough text is in.
+
+    The charset is judged from the first SNIFF_BYTES (see `sniff_encoding`);
+    from then on chunks are fed to an lxml pull parser as they arrive.
+    Reading stops after `max_bytes` of HTML, or once the content elements
+    seen so far hold `max_chars` of text, whichever is first. Returns (html,
+    fallback_text, truncated): the HTML read so far, decoded, the paragraph
+    text gathered while parsing (for pages the main-content extractor can't
+    handle), and whether the page was cut short.
+    """
+    parser = None
+    encoding = 'utf-8'
+    chunks = []
+    paragraphs = []
+    size = 0
+    chars = 0
+    truncated = False
+
+    def parse(data):
+        nonlocal chars
+        parser.feed(data)
+        for _, element in parser.read_events():
+            tag = element.tag if isinstance(element.tag, str) else ''
+            if tag in CONTENT_TAGS and not any(ancestor.tag in SKIP_TAGS for ancestor in element.iterancestors()):
+                text = ' '.join(''.join(element.itertext()).split())
+                if text:
+                    paragraphs.append(text)
+                    chars += len(text)
+            if tag in CONTENT_TAGS or tag in SKIP_TAGS:
+                # Drop parsed subtrees as we go so memory stays flat on huge pages
+                element.clear()
+
+    def start(head):
+        nonlocal encoding, parser
+        encoding = sniff_encoding(response, head)
+        parser = html_pull_parser(encoding)
+        parse(head)
+
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            chunks.append(chunk)
+            size += len(chunk)
+            if parser is not None:
+                parse(chunk)
+            elif size >= SNIFF_BYTES:
+                start(b''.join(chunks))
+            if size >= max_bytes or chars >= max_chars:
+                truncated = True
+                break
+        if parser is None and chunks:
+            # The whole page was shorter than SNIFF_BYTES
+            start(b''.join(chunks))
+    finally:
+        response.close()
+    html = b''.join(chunks)[:max_bytes].decode(encoding, errors='replace')
+    return html, '\n\n'.join(paragraphs), truncated
+
+
+def split_into_windows(text, window_chars, overlap_chars):
+    """Split text into windows of at most `window_chars`, breaking on paragraphs or sentences.
+
+    Consecutive windows share up to `overlap_chars` of trailing text so a claim
+    that straddles a boundary is still seen whole by one window.
+    """
+    if len(text) <= window_chars:
+        return [text]
+    pieces = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        if len(paragraph) <= window_chars:
+            pieces.append(paragraph)
+            continue
+        sentences = re.split(r'(?<=[.!?])\s+', paragraph)
+        for sentence in sentences:
+            # A single run-on "sentence" longer than a window is hard-cut
+            pieces.extend(sentence[start:start + window_chars] for start in range(0, len(sentence), window_chars))
+
+    windows = []
+    current = ''
+    for piece in pieces:
+        if current and len(current) + len(piece) + 2 > window_chars:
+            windows.append(current)
+            tail = current[-overlap_chars:] if overlap_chars else ''
+            current = tail[tail.find(' ') + 1:] if ' ' in tail else tail
+        current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        windows.append(current)
+    return windows
+
+
+def merge_claims(claim_lists, limit, key):
+    """Interleave per-window claim lists, dropping duplicates by `key`, up to `limit` claims.
+
+    Taking claims round-robin keeps the merged list representative of the
+    whole article instead of just its first window.
+    """
+    merged = []
+    seen = set()
+    for rank in range(max((len(claims) for claims in claim_lists), default=0)):
+        for claims in claim_lists:
+            if rank >= len(claims):
+                continue
+            claim_key = key(claims[rank])
+            if claim_key in seen:
+                continue
+            seen.add(claim_key)
+            merged.append(claims[rank])
+            if len(merged) >= limit:
+                return merged
+    return merged
@@ -0,0 +1,71 @@
+# batch_io.py
+import json
+import os
+
+INPUT_TYPES = ('text', 'url')
+
+
+def normalize_batch_item(raw, default_id):
+    """Validate one batch entry and fill in its id and input_type.
+
+    Entries look like the /jobs payload, {"input_type": "text"|"url",
+    "content": ...}, with an optional "id" that is echoed back in the output
+    (the entry's position is used when it is missing).
+    """
+    if not isinstance(raw, dict):
+        raise ValueError(f"item {default_id}: expected an object")
+    input_type = raw.get('input_type', 'text')
+    content = raw.get('content')
+    if not content or input_type not in INPUT_TYPES:
+        raise ValueError(f"item {default_id}: provide 'content' and an 'input_type' of 'text' or 'url'")
+    return {'id': str(raw.get('id', default_id)), 'input_type': input_type, 'content': content}
+
+
+def read_batch_items(path):
+    items = []
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                raw = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"line {line_number}: {e}")
+            items.append(normalize_batch_item(raw, line_number))
+    return items
+
+
+class BatchCheckpoint:
+    """JSONL results file that doubles as the checkpoint for resuming a batch.
+
+    Each finished item is appended as one line and fsynced, so after a crash
+    every id already in the file is known to be complete and is skipped on
+    the next run. A line cut short by the crash is truncated away.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        good_size = 0
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        self.done.add(json.loads(line)['id'])
+                    except (ValueError, KeyError):
+                        break
+                    good_size += len(line)
+            with open(path, 'r+b') as f:
+                f.truncate(good_size)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, record):
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.done.add(record['id'])
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,162 @@
+# benchmarks/claim_indexes.py
+"""Time the hot claim queries with and without the lookup indexes.
+
+Builds throwaway SQLite databases of synthetic claims (3 sources with 5 CRAAP
+scores each per claim) and times, before and after creating the indexes from
+migration b3e8f1a2c5d7:
+
+  * claim lookup by text (before) vs by text_hash (after)
+  * the first /news page ordered by (date_checked, id)
+  * loading sources and CRAAP scores for one page of claims
+
+    python benchmarks/claim_indexes.py
+    python benchmarks/claim_indexes.py --sizes 10000 100000
+"""
+import argparse
+import hashlib
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+SCHEMA = """
+CREATE TABLE claim (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL,
+    text_hash VARCHAR(64),
+    date_checked DATETIME,
+    veracity_probability FLOAT,
+    veracity_justification TEXT,
+    final_truth_score FLOAT
+);
+CREATE TABLE source (
+    id INTEGER PRIMARY KEY,
+    claim_id INTEGER NOT NULL REFERENCES claim (id),
+    name VARCHAR(512) NOT NULL,
+    url VARCHAR(512) NOT NULL,
+    snippet TEXT,
+    date_last_crawled VARCHAR(128),
+    intent_category VARCHAR(64),
+    intent_explanation TEXT
+);
+CREATE TABLE craap_score (
+    id INTEGER PRIMARY KEY,
+    source_id INTEGER NOT NULL REFERENCES source (id),
+    criterion VARCHAR(64) NOT NULL,
+    score FLOAT NOT NULL,
+    explanation TEXT
+);
+"""
+
+INDEXES = """
+CREATE UNIQUE INDEX ix_claim_text_hash ON claim (text_hash);
+CREATE INDEX ix_claim_date_checked_id ON claim (date_checked, id);
+CREATE INDEX ix_source_claim_id ON source (claim_id);
+CREATE INDEX ix_craap_score_source_id ON craap_score (source_id);
+"""
+
+CRITERIA = ['Currency', 'Relevance', 'Authority', 'Accuracy', 'Purpose']
+SOURCES_PER_CLAIM = 3
+PAGE_SIZE = 20
+
+
+def text_hash(text):
+    normalized = ' '.join(text.casefold().split()).rstrip('.!? ')
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def claim_text(number):
+    return f"Claim number {number}: the measured value rose by {number % 97}.{number % 10} percent last year."
+
+
+def populate(conn, size):
+    start = datetime(2024, 1, 1)
+    conn.executescript(SCHEMA)
+    claims = (
+        (n, claim_text(n), text_hash(claim_text(n)), start + timedelta(seconds=n * 37 % (size * 11)), 0.5, 'x', 0.5)
+        for n in range(1, size + 1)
+    )
+    conn.executemany("INSERT INTO claim VALUES (?, ?, ?, ?, ?, ?, ?)", claims)
+    sources = (
+        ((n - 1) * SOURCES_PER_CLAIM + k + 1, n, f'Source {k}', f'https://example.com/{n}/{k}', 'snippet ' * 20,
+         '2024-01-01', 'News/Journalism', 'x')
+        for n in range(1, size + 1) for k in range(SOURCES_PER_CLAIM)
+    )
+    conn.executemany("INSERT INTO source VALUES (?, ?, ?, ?, ?, ?, ?, ?)", sources)
+    scores = (
+        (None, source_id, criterion, 7.0, 'x')
+        for source_id in range(1, size * SOURCES_PER_CLAIM + 1) for criterion in CRITERIA
+    )
+    conn.executemany("INSERT INTO craap_score VALUES (?, ?, ?, ?, ?)", scores)
+    conn.commit()
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def run_queries(conn, size, indexed, repeat):
+    targets = [claim_text(random.randint(1, size)) for _ in range(repeat)]
+    lookups = iter(targets * 2)
+
+    def lookup():
+        text = next(lookups)
+        if indexed:
+            conn.execute("SELECT id FROM claim WHERE text_hash = ?", (text_hash(text),)).fetchone()
+        else:
+            conn.execute("SELECT id FROM claim WHERE text = ?", (text,)).fetchone()
+
+    def news_page():
+        conn.execute(
+            "SELECT id, text, date_checked FROM claim ORDER BY date_checked DESC, id DESC LIMIT ?", (PAGE_SIZE + 1,)
+        ).fetchall()
+
+    page_ids = [row[0] for row in conn.execute("SELECT id FROM claim ORDER BY id DESC LIMIT ?", (PAGE_SIZE,))]
+    placeholders = ','.join('?' * len(page_ids))
+
+    def page_details():
+        source_ids = [row[0] for row in conn.execute(
+            f"SELECT id FROM source WHERE claim_id IN ({placeholders})", page_ids
+        )]
+        conn.execute(
+            f"SELECT * FROM craap_score WHERE source_id IN ({','.join('?' * len(source_ids))})", source_ids
+        ).fetchall()
+
+    return {
+        'claim lookup': timed(lookup, repeat),
+        '/news page': timed(news_page, repeat),
+        'sources + scores': timed(page_details, repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'claims':>9}  {'query':<18} {'before (ms)':>12} {'after (ms)':>11} {'speedup':>8}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            conn = sqlite3.connect(os.path.join(directory, 'bench.db'))
+            populate(conn, size)
+            before = run_queries(conn, size, indexed=False, repeat=args.repeat)
+            conn.executescript(INDEXES)
+            conn.execute("ANALYZE")
+            after = run_queries(conn, size, indexed=True, repeat=args.repeat)
+            conn.close()
+        for query in before:
+            print(f"{size:>9}  {query:<18} {before[query]:>12.2f} {after[query]:>11.2f} "
+                  f"{before[query] / max(after[query], 1e-6):>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/craap_batch.py
+"""Compare the batched intent + CRAAP prompt against the per-source calls.
+
+Runs both paths against the live Groq API (GROQ_API_KEY must be set) with the
+response cache bypassed, and reports wall time, request count and tokens.
+
+    python benchmarks/craap_batch.py
+    python benchmarks/craap_batch.py --claim "The Eiffel Tower is 330 metres tall" --search
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import groq  # noqa: E402
+
+import app  # noqa: E402
+
+SAMPLE_CLAIM = "The Great Wall of China is visible from the Moon with the naked eye."
+SAMPLE_SOURCES = [
+    {
+        'name': 'Is the Great Wall of China visible from space? | NASA',
+        'url': 'https://www.nasa.gov/image-article/great-wall-from-space/',
+        'snippet': 'The Great Wall of China, frequently billed as the only man-made object visible from space, '
+                   'generally is not, at least to the unaided eye in low Earth orbit.',
+        'date_last_crawled': '2024-09-20T10:12:00.0000000Z',
+    },
+    {
+        'name': 'Great Wall of China - Wikipedia',
+        'url': 'https://en.wikipedia.org/wiki/Great_Wall_of_China',
+        'snippet': 'A common myth is that the Great Wall can be seen from the Moon. Apollo astronauts reported '
+                   'that no man-made structures are visible at that distance.',
+        'date_last_crawled': '2024-09-25T04:40:00.0000000Z',
+    },
+    {
+        'name': 'Can You See the Great Wall of China From Space? - Scientific American',
+        'url': 'https://www.scientificamerican.com/article/is-chinas-great-wall-visible-from-space/',
+        'snippet': 'The wall is only a few metres wide and roughly the colour of its surroundings, which makes it '
+                   'nearly impossible to spot even from low orbit.',
+        'date_last_crawled': '2024-09-18T22:03:00.0000000Z',
+    },
+    {
+        'name': 'Great Wall visible from space? Chinese astronaut says no - Reuters',
+        'url': 'https://www.reuters.com/article/china-space-wall/',
+        'snippet': "China's first astronaut Yang Liwei said he could not see the Great Wall during his flight.",
+        'date_last_crawled': '2024-09-12T07:55:00.0000000Z',
+    },
+    {
+        'name': 'Top 10 facts about the Great Wall | Travel Blog',
+        'url': 'https://example-travel-blog.com/great-wall-facts',
+        'snippet': 'Fun fact: the Great Wall is the only human-made structure you can see from the Moon!',
+        'date_last_crawled': '2024-08-30T13:21:00.0000000Z',
+    },
+]
+
+
+class RecordingClient:
+    """Counts requests and token usage for every chat completion."""
+
+    def __init__(self, client):
+        self._client = client
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.chat = self
+        self.completions = self
+
+    def create(self, **kwargs):
+        response = self._client.chat.completions.create(**kwargs)
+        with self._lock:
+            self.requests += 1
+            if response.usage:
+                self.prompt_tokens += response.usage.prompt_tokens
+                self.completion_tokens += response.usage.completion_tokens
+        return response
+
+
+def per_source(claim, sources):
+    intents = [app.categorize_source_intent(source) for source in sources]
+    craap_scores_list = [app.compute_craap_score(claim, source) for source in sources]
+    return intents, craap_scores_list
+
+
+def run(label, fn, claim, sources, repeat):
+    recorder = RecordingClient(groq.Groq())
+    app.client = recorder
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(claim, sources)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(
+        f"{label:<12} median {timings[len(timings) // 2]:6.2f}s  "
+        f"requests/run {recorder.requests / repeat:5.1f}  "
+        f"prompt tokens/run {recorder.prompt_tokens / repeat:8.0f}  "
+        f"completion tokens/run {recorder.completion_tokens / repeat:7.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--claim', default=SAMPLE_CLAIM)
+    parser.add_argument('--search', action='store_true', help='fetch sources from Bing instead of the built-in sample')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    sources = app.search_sources_for_claim(args.claim) if args.search else SAMPLE_SOURCES
+    print(f"Claim: {args.claim!r} ({len(sources)} sources, {args.repeat} runs each)")
+    run('per-source', per_source, args.claim, sources, args.repeat)
+    run('batched', app.evaluate_sources, args.claim, sources, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
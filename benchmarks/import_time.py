@@ -0,0 +1,99 @@
+# benchmarks/import_time.py
+"""Measure how long `import app` takes, using `python -X importtime`.
+
+Imports the app in fresh interpreters (caches and database pointed at a temp
+directory, a dummy GROQ_API_KEY) and reports the median total import time
+and the slowest top-level imports. With --compare REV the tree at that git
+revision is exported and measured the same way, to show the difference.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --compare HEAD~1 --runs 7
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def import_once(tree, scratch):
+    env = dict(
+        os.environ,
+        GROQ_API_KEY=os.environ.get('GROQ_API_KEY', 'unused'),
+        DATABASE_URL=f"sqlite:///{os.path.join(scratch, 'import.db')}",
+        LLM_CACHE_PATH=os.path.join(scratch, 'llm_cache.db'),
+        SEARCH_CACHE_PATH=os.path.join(scratch, 'search_cache.db'),
+        ARTICLE_CACHE_PATH=os.path.join(scratch, 'article_cache.db'),
+        SOURCE_PROFILE_PATH=os.path.join(scratch, 'source_profiles.db'),
+        PAGE_CACHE_PATH=os.path.join(scratch, 'page_cache.db'),
+        PYTHONDONTWRITEBYTECODE='1',
+    )
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=tree, env=env, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        sys.exit(f"import app failed in {tree}:\n{result.stderr[-2000:]}")
+    top_level = {}
+    total = None
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, module = int(match.group(2)), len(match.group(3)), match.group(4)
+        if module == 'app':
+            total = cumulative
+        elif depth == 3:
+            # Direct imports of app.py (one space after the bar, plus two per nesting level)
+            top_level[module] = cumulative
+    return wall, total, top_level
+
+
+def measure(label, tree, runs, show):
+    with tempfile.TemporaryDirectory() as scratch:
+        samples = [import_once(tree, scratch) for _ in range(runs)]
+    walls = [wall for wall, _, _ in samples]
+    totals = [total for _, total, _ in samples]
+    print(f"{label}: import app {statistics.median(totals) / 1000:7.1f} ms "
+          f"(interpreter + import {statistics.median(walls) * 1000:7.1f} ms), median of {runs}")
+    slowest = sorted(samples[-1][2].items(), key=lambda item: -item[1])[:show]
+    for module, cumulative in slowest:
+        print(f"    {module:<28} {cumulative / 1000:7.1f} ms")
+    return statistics.median(totals)
+
+
+def export_revision(revision, directory):
+    archive = os.path.join(directory, 'tree.tar')
+    subprocess.run(['git', 'archive', '--output', archive, revision], cwd=ROOT, check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(os.path.join(directory, 'tree'))
+    return os.path.join(directory, 'tree')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--show', type=int, default=10, help='slowest direct imports to list')
+    parser.add_argument('--compare', metavar='REV', help='also measure the tree at this git revision')
+    args = parser.parse_args()
+
+    current = measure('working tree', ROOT, args.runs, args.show)
+    if args.compare:
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = measure(args.compare, export_revision(args.compare, directory), args.runs, args.show)
+        print(f"\nimport app is {baseline / current:.1f}x faster than at {args.compare} "
+              f"({(baseline - current) / 1000:.0f} ms saved)")
+
+
+if __name__ == '__main__':
+    main()
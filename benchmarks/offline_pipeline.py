@@ -0,0 +1,383 @@
+# benchmarks/offline_pipeline.py
+"""Benchmark the fact-check pipeline and routes offline, against stub Groq and Bing servers.
+
+Two local HTTP servers stand in for the Groq chat-completions API and Bing Web
+Search v7. They replay the recorded responses in fixtures/offline_pipeline.json
+(claims per article, Bing result pages, and intent/CRAAP/veracity answers)
+after a configurable latency and jitter, and answer a configurable fraction
+of calls with 429 + Retry-After. The app is imported with GROQ_BASE_URL and
+BING_SEARCH_ENDPOINT pointed at them and a throwaway SQLite database, so no
+API quota is used.
+
+For each concurrency level it drives:
+
+  * pipeline      extract_and_verify_claims() on the fixture articles
+  * POST /        the synchronous results page (STREAM_RESULTS and ASYNC_JOBS off)
+  * GET /news     the first page of checked claims
+  * GET /claim    claim detail pages for the claims saved above
+
+and reports throughput, p50/p95/p99 latency, and Groq/Bing calls and 429s per
+claim. Caches (including source profiles and rendered pages) and claim reuse
+are off unless --warm is given, so every run goes through the whole pipeline
+and every page is rendered; the Groq rate limiter is given effectively
+unlimited budgets unless --production-limits is given.
+
+    python benchmarks/offline_pipeline.py
+    python benchmarks/offline_pipeline.py --concurrency 1 8 32 --requests 40 --groq-latency 0.8 --groq-429 0.05
+"""
+import argparse
+import copy
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIXTURES = os.path.join(ROOT, 'benchmarks', 'fixtures', 'offline_pipeline.json')
+
+
+def stable_index(text, size):
+    # Same input, same fixture, across runs and processes
+    return int(hashlib.sha1(text.encode('utf-8')).hexdigest(), 16) % size
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Keep-alive, like the real APIs
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.answer(self)
+
+    def do_POST(self):
+        self.server.answer(self)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubAPI(ThreadingHTTPServer):
+    """Local HTTP server that answers with `respond(handler, body)` after a simulated delay.
+
+    Each call sleeps latency ± jitter seconds; a `rate_429` fraction of calls
+    get a 429 with a short Retry-After instead. `respond` returns
+    (kind, payload); calls are counted per kind.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, respond, latency, jitter, rate_429, retry_after, seed):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.respond = respond
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.counts = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def snapshot(self):
+        with self._lock:
+            return Counter(self.counts)
+
+    def answer(self, handler):
+        length = int(handler.headers.get('Content-Length') or 0)
+        body = json.loads(handler.rfile.read(length)) if length else None
+        with self._lock:
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            throttled = self.random.random() < self.rate_429
+        time.sleep(delay)
+        if throttled:
+            with self._lock:
+                self.counts['429'] += 1
+            self.send(handler, 429, {'error': {'message': 'Rate limit reached', 'code': 'rate_limit_exceeded'}},
+                      {'Retry-After': str(self.retry_after)})
+            return
+        kind, payload = self.respond(handler, body)
+        with self._lock:
+            self.counts[kind] += 1
+        self.send(handler, 200 if payload is not None else 404, payload or {'error': {'message': 'not found'}})
+
+    @staticmethod
+    def send(handler, status, payload, headers=None):
+        data = json.dumps(payload).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+def requested_keys(prompt):
+    # Keys of the JSON format a prompt asks for (fewer for sources with a cached profile)
+    return [key for key in re.findall(r'^\s*"([^"]+)":', prompt[prompt.rindex('format'):], re.MULTILINE)
+            if key != 'Source']
+
+
+def groq_responder(fixtures):
+    articles = fixtures['articles']
+    answers = fixtures['groq']
+
+    def respond(handler, body):
+        if not handler.path.endswith('/chat/completions') or not body:
+            return 'unknown', None
+        system = body['messages'][0]['content']
+        user = body['messages'][-1]['content']
+        if 'extracts factual claims' in system:
+            kind = 'extract_claims'
+            matches = [article for article in articles if article['title'] in user]
+            content = (matches or articles)[0]['claims']
+        elif 'by intent and evaluates' in system:
+            kind = 'evaluation'
+            keys = requested_keys(user)
+            sections = re.split(r'^Source (\d+):$', user, flags=re.MULTILINE)[1:]
+            entries = []
+            for number, section in zip(sections[::2], sections[1::2]):
+                only = re.search(r'^Only evaluate: (.+)$', section, re.MULTILINE)
+                wanted = re.findall(r'"([^"]+)"', only.group(1)) if only else keys
+                entries.append({'Source': int(number),
+                                **{key: answers['evaluation_source'][key] for key in wanted}})
+            content = json.dumps({'sources': entries})
+        elif 'truthfulness' in system:
+            kind = 'veracity'
+            content = json.dumps(answers['veracity'][stable_index(user, len(answers['veracity']))])
+        elif 'intent' in system:
+            kind, content = 'intent', json.dumps(answers['intent'])
+        else:
+            kind = 'craap'
+            content = json.dumps({key: answers['craap'][key] for key in requested_keys(user)})
+        prompt_tokens = sum(len(message['content']) for message in body['messages']) // 4
+        completion_tokens = len(content) // 4
+        return kind, {
+            'id': f"chatcmpl-{stable_index(user + str(time.time()), 10 ** 12)}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                      'total_tokens': prompt_tokens + completion_tokens},
+        }
+    return respond
+
+
+def bing_responder(fixtures):
+    pages = fixtures['bing']
+
+    def respond(handler, body):
+        query = parse_qs(urlsplit(handler.path).query).get('q', [''])[0]
+        page = copy.deepcopy(pages[stable_index(query, len(pages))])
+        page['queryContext']['originalQuery'] = query
+        # Distinct URLs per query, as real results for different claims would be. The tag goes in the
+        # path: canonicalize_url drops tracking parameters like ?ref=, which would fold them back into one
+        tag = hashlib.sha1(query.encode('utf-8')).hexdigest()[:8]
+        for result in page['webPages']['value']:
+            result['url'] = f"{result['url'].rstrip('/')}/{tag}"
+        return 'search', page
+    return respond
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, max(0, math.ceil(p / 100 * len(sorted_values)) - 1))]
+
+
+def run_level(app, concurrency, requests, call):
+    """Run `call(n)` for n in range(requests) on `concurrency` threads; returns latencies and errors."""
+    numbers = iter(range(requests))
+    lock = threading.Lock()
+    latencies = []
+    errors = []
+
+    def worker():
+        with app.app.app_context():
+            while True:
+                with lock:
+                    number = next(numbers, None)
+                if number is None:
+                    return
+                start = time.perf_counter()
+                try:
+                    call(number)
+                except Exception as e:
+                    errors.append(e)
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sorted(latencies), errors
+
+
+def report(label, concurrency, wall, latencies, errors, claims=None, groq=None, bing=None):
+    per_claim = '-'
+    if claims:
+        calls = sum(count for kind, count in groq.items() if kind != '429')
+        per_claim = (f"{calls / claims:6.2f} {bing['search'] / claims:6.2f} "
+                     f"{(groq['429'] + bing['429']) / claims:6.2f}")
+    print(
+        f"{label:<10} {concurrency:>4} {len(latencies):>6} {len(errors):>4} {len(latencies) / wall:>8.2f} "
+        f"{percentile(latencies, 50) * 1000:>8.0f} {percentile(latencies, 95) * 1000:>8.0f} "
+        f"{percentile(latencies, 99) * 1000:>8.0f}   {per_claim}"
+    )
+    if errors:
+        print(f"{'':<10} first error: {errors[0]!r}")
+
+
+def stage_summary(app):
+    # Mean wall time per pipeline stage, from the histogram behind /metrics
+    totals = {}
+    for name, labels, value in app.tracer.stage_seconds.samples():
+        stage = dict(labels)['stage']
+        if name.endswith('_sum'):
+            totals.setdefault(stage, [0, 0])[0] = value
+        elif name.endswith('_count'):
+            totals.setdefault(stage, [0, 0])[1] = value
+    print(f"\n{'stage':<16} {'calls':>7} {'mean ms':>8}")
+    for stage, (total, count) in sorted(totals.items()):
+        print(f"{stage:<16} {count:>7} {total / count * 1000 if count else 0:>8.1f}")
+
+
+def token_summary(app):
+    # Tokens the stub billed (from the usage field), per model, as counted by the rate limiter
+    print(f"\n{'model':<40} {'calls':>7} {'prompt tok':>11} {'completion tok':>15}")
+    for model, budget in sorted(app.groq_client.stats().items()):
+        print(f"{model:<40} {budget['calls']:>7} {budget['prompt_tokens']:>11} {budget['completion_tokens']:>15}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=16, help='pipeline runs / POSTs per concurrency level')
+    parser.add_argument('--page-requests', type=int, default=100, help='GETs of /news and /claim per level')
+    parser.add_argument('--groq-latency', type=float, default=0.4)
+    parser.add_argument('--groq-jitter', type=float, default=0.2)
+    parser.add_argument('--groq-429', type=float, default=0.0, help='fraction of Groq calls answered with 429')
+    parser.add_argument('--bing-latency', type=float, default=0.15)
+    parser.add_argument('--bing-jitter', type=float, default=0.1)
+    parser.add_argument('--bing-429', type=float, default=0.0, help='fraction of Bing calls answered with 429')
+    parser.add_argument('--retry-after', type=float, default=0.2, help='Retry-After sent with each 429, in seconds')
+    parser.add_argument('--warm', action='store_true',
+                        help='keep the LLM/search/article/source-profile/page caches and claim reuse on')
+    parser.add_argument('--production-limits', action='store_true',
+                        help="keep the app's Groq rpm/tpm budgets instead of lifting them")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    with open(FIXTURES, encoding='utf-8') as f:
+        fixtures = json.load(f)
+    groq_stub = StubAPI(groq_responder(fixtures), args.groq_latency, args.groq_jitter, args.groq_429,
+                        args.retry_after, args.seed).start()
+    bing_stub = StubAPI(bing_responder(fixtures), args.bing_latency, args.bing_jitter, args.bing_429,
+                        args.retry_after, args.seed + 1).start()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.update({
+            'GROQ_API_KEY': 'offline-benchmark',
+            'GROQ_BASE_URL': groq_stub.url,
+            'BING_SEARCH_V7_SUBSCRIPTION_KEY': 'offline-benchmark',
+            'BING_SEARCH_ENDPOINT': f"{bing_stub.url}/v7.0/search",
+            'DATABASE_URL': f"sqlite:///{os.path.join(directory, 'benchmark.db')}",
+            'STREAM_RESULTS': '0',
+            'ASYNC_JOBS': '0',
+            'TRACE_LOG': '',
+        })
+        for name in ('LLM_CACHE', 'SEARCH_CACHE', 'ARTICLE_CACHE', 'SOURCE_PROFILE', 'PAGE_CACHE'):
+            os.environ[f'{name}_PATH'] = os.path.join(directory, f'{name.lower()}.db')
+            os.environ[f'{name}_ENABLED'] = '1' if args.warm else '0'
+        if not args.warm:
+            os.environ['CLAIM_MAX_AGE_HOURS'] = '0'
+        if not args.production_limits:
+            unlimited = {'rpm': 10 ** 6, 'tpm': 10 ** 9, 'concurrency': 64}
+            os.environ['GROQ_MODEL_LIMITS'] = json.dumps({
+                'llama-3.1-70b-versatile': unlimited,
+                'llama3-groq-70b-8192-tool-use-preview': unlimited,
+            })
+
+        import app
+        from flask_migrate import upgrade
+
+        with app.app.app_context():
+            upgrade(directory=os.path.join(ROOT, 'migrations'))
+
+        articles = fixtures['articles']
+        max_claims = app.app.config['MAX_CLAIMS']
+        claims_per_article = [
+            min(len([line for line in article['claims'].splitlines() if line.strip()]), max_claims)
+            for article in articles
+        ]
+
+        def claims_for(requests):
+            return sum(claims_per_article[n % len(articles)] for n in range(requests))
+
+        def run_pipeline(number):
+            app.extract_and_verify_claims(articles[number % len(articles)]['text'])
+
+        def post_index(number):
+            response = app.app.test_client().post(
+                '/', data={'input_type': 'text', 'content': articles[number % len(articles)]['text']}
+            )
+            if response.status_code != 200:
+                raise RuntimeError(f"POST / returned {response.status_code}")
+
+        print(f"Groq stub {args.groq_latency * 1000:.0f}±{args.groq_jitter * 1000:.0f} ms, {args.groq_429:.0%} 429s; "
+              f"Bing stub {args.bing_latency * 1000:.0f}±{args.bing_jitter * 1000:.0f} ms, {args.bing_429:.0%} 429s; "
+              f"caches {'on' if args.warm else 'off'}")
+        print(f"\n{'target':<10} {'conc':>4} {'reqs':>6} {'errs':>4} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+              f"{'p99 ms':>8}   {'groq':>6} {'bing':>6} {'429s':>6}  (per claim)")
+
+        for concurrency in args.concurrency:
+            for label, call in (('pipeline', run_pipeline), ('POST /', post_index)):
+                groq_before, bing_before = groq_stub.snapshot(), bing_stub.snapshot()
+                wall, latencies, errors = run_level(app, concurrency, args.requests, call)
+                report(label, concurrency, wall, latencies, errors, claims_for(args.requests),
+                       groq_stub.snapshot() - groq_before, bing_stub.snapshot() - bing_before)
+
+            with app.app.app_context():
+                claim_ids = app.db.session.scalars(app.db.select(app.Claim.id)).all()
+            for label, path_for in (('GET /news', lambda n: '/news'),
+                                    ('GET /claim', lambda n: f'/claim/{claim_ids[n % len(claim_ids)]}')):
+                def get_page(number, path_for=path_for):
+                    response = app.app.test_client().get(path_for(number))
+                    if response.status_code != 200:
+                        raise RuntimeError(f"GET {path_for(number)} returned {response.status_code}")
+                wall, latencies, errors = run_level(app, concurrency, args.page_requests, get_page)
+                report(label, concurrency, wall, latencies, errors)
+
+        stage_summary(app)
+        token_summary(app)
+        with app.app.app_context():
+            app.db.engine.dispose()
+    groq_stub.shutdown()
+    bing_stub.shutdown()
+
+
+if __name__ == '__main__':
+    main()
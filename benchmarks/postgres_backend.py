@@ -0,0 +1,215 @@
+# benchmarks/postgres_backend.py
+"""Check the app against a throwaway PostgreSQL database and time concurrent saves.
+
+Creates a fresh database, then:
+
+  * runs every migration up, checks the result matches the models
+    (flask db check), migrates down to base and up again
+  * saves results twice to exercise the INSERT ... ON CONFLICT claim upsert,
+    including a re-run without a verdict, which must keep the old one
+  * saves overlapping claims from several threads at once, which must not
+    hit unique violations or leave duplicate claims
+  * renders /news, /search and /claim/<id>
+  * reports save throughput for the thread counts given
+
+The database is dropped afterwards. Point it at a server with --database-url
+(or PG_TEST_URL); without one, a temporary cluster is started with initdb and
+pg_ctl from PATH or --pg-bin (run as a non-root user).
+
+    python benchmarks/postgres_backend.py --database-url postgresql://postgres@localhost/postgres
+    python benchmarks/postgres_backend.py --pg-bin /usr/lib/postgresql/16/bin --threads 1 4 16
+"""
+import argparse
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+import sqlalchemy as sa
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CRITERIA = ['Currency', 'Relevance', 'Authority', 'Accuracy', 'Purpose']
+failures = []
+
+
+def check(condition, message):
+    print(f"{'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        failures.append(message)
+
+
+def start_cluster(pg_bin, directory):
+    def tool(name):
+        path = os.path.join(pg_bin, name) if pg_bin else shutil.which(name)
+        if not path or not os.path.exists(path):
+            sys.exit(f"{name} not found; pass --database-url or --pg-bin")
+        return path
+
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    data = os.path.join(directory, 'data')
+    subprocess.run([tool('initdb'), '-D', data, '-U', 'postgres', '-A', 'trust'], check=True, capture_output=True)
+    subprocess.run(
+        [tool('pg_ctl'), '-D', data, '-l', os.path.join(directory, 'log'), '-w', 'start',
+         '-o', f"-p {port} -k {directory} -c listen_addresses=''"],
+        check=True, capture_output=True
+    )
+    stop = [tool('pg_ctl'), '-D', data, '-m', 'immediate', 'stop']
+    return f"postgresql://postgres@/postgres?host={directory}&port={port}", stop
+
+
+def make_result(text, final_truth_score=0.7, sources=3):
+    return {
+        'claim': text,
+        'sources': [
+            {
+                'name': f'Source {k} for {text}',
+                'url': f'https://example.com/{uuid.uuid4().hex}',
+                'snippet': 'snippet ' * 20,
+                'date_last_crawled': '2024-01-01T00:00:00Z',
+                'intent_category': 'News/Journalism',
+                'intent_explanation': 'Reports the facts.',
+                'craap_scores': [
+                    {'criterion': criterion, 'score': 7.0, 'explanation': 'fine'} for criterion in CRITERIA
+                ],
+            }
+            for k in range(sources)
+        ],
+        'overall_craap_scores': {criterion: 7.0 for criterion in CRITERIA},
+        'veracity_assessment': {'probability': final_truth_score, 'justification': 'Checked.'},
+        'final_truth_score': final_truth_score,
+    }
+
+
+def run_checks(app, threads, saves):
+    from flask_migrate import check as migrate_check, downgrade, upgrade
+
+    directory = os.path.join(ROOT, 'migrations')
+    with app.app.app_context():
+        upgrade(directory=directory)
+        try:
+            migrate_check(directory=directory)
+            check(True, "migrations match the models")
+        except SystemExit:
+            check(False, "migrations match the models")
+        downgrade(directory=directory, revision='base')
+        upgrade(directory=directory)
+        check(True, "migrations run down to base and back up")
+
+        db, Claim, Source = app.db, app.Claim, app.Source
+        app.save_claim_results([make_result('The sky is blue.'), make_result('Water boils at 100 C.')])
+        first_id = db.session.scalar(db.select(Claim.id).where(Claim.text_hash == app.claim_text_hash('The sky is blue.')))
+        checked = db.session.scalar(db.select(Claim.date_checked).where(Claim.id == first_id))
+        app.save_claim_results([make_result('the sky is  blue', final_truth_score=None, sources=0)])
+        claim = db.session.get(Claim, first_id, populate_existing=True)
+        check(db.session.scalar(db.select(db.func.count(Claim.id))) == 2, "re-saving a claim updates it in place")
+        check(claim.final_truth_score == 0.7 and claim.date_checked == checked,
+              "a re-run without a verdict keeps the previous one and its date_checked")
+        check(db.session.scalar(db.select(db.func.count(Source.id)).where(Source.claim_id == first_id)) == 3,
+              "a re-run without a verdict keeps the claim's sources")
+        app.save_claim_results([make_result('The sky is blue.', sources=2)])
+        check(db.session.scalar(db.select(db.func.count(Source.id)).where(Source.claim_id == first_id)) == 2,
+              "a re-run with a verdict replaces the claim's sources")
+
+    errors = []
+    barrier = threading.Barrier(8)
+
+    def racer(number):
+        with app.app.app_context():
+            barrier.wait()
+            try:
+                app.save_claim_results([make_result(f'Shared claim {k}') for k in range(5)]
+                                       + [make_result(f'Own claim {number}')])
+            except Exception as e:
+                errors.append(e)
+
+    workers = [threading.Thread(target=racer, args=(n,)) for n in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    with app.app.app_context():
+        count = app.db.session.scalar(sa.select(sa.func.count(app.Claim.id)))
+        check(not errors and count == 2 + 5 + 8, f"concurrent saves of overlapping claims ({errors[:1] or 'no errors'})")
+
+    client = app.app.test_client()
+    for path in ['/news', '/search?q=sky', f'/claim/{first_id}']:
+        check(client.get(path).status_code == 200, f"GET {path}")
+
+    print(f"\n{'threads':>7} {'saves':>6} {'seconds':>8} {'saves/s':>8}")
+    for thread_count in threads:
+        counter = iter(range(saves))
+        lock = threading.Lock()
+
+        def saver():
+            with app.app.app_context():
+                while True:
+                    with lock:
+                        number = next(counter, None)
+                    if number is None:
+                        return
+                    app.save_claim_results([make_result(f'Bench {thread_count} claim {number} part {k}')
+                                            for k in range(2)])
+
+        start = time.perf_counter()
+        pool = [threading.Thread(target=saver) for _ in range(thread_count)]
+        for worker in pool:
+            worker.start()
+        for worker in pool:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        print(f"{thread_count:>7} {saves:>6} {elapsed:>8.2f} {saves / elapsed:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', default=os.getenv('PG_TEST_URL'))
+    parser.add_argument('--pg-bin', help='directory holding initdb and pg_ctl')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--saves', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        stop = None
+        server_url = args.database_url
+        if not server_url:
+            server_url, stop = start_cluster(args.pg_bin, directory)
+        database = f"factcheck_test_{uuid.uuid4().hex[:8]}"
+        admin = sa.create_engine(server_url, isolation_level='AUTOCOMMIT')
+        with admin.connect() as connection:
+            connection.exec_driver_sql(f'CREATE DATABASE "{database}"')
+        try:
+            url = sa.engine.make_url(server_url).set(database=database)
+            os.environ['DATABASE_URL'] = url.render_as_string(hide_password=False)
+            # Keep the side caches out of the working tree
+            for name in ('LLM_CACHE_PATH', 'SEARCH_CACHE_PATH', 'ARTICLE_CACHE_PATH',
+                         'SOURCE_PROFILE_PATH', 'PAGE_CACHE_PATH'):
+                os.environ[name] = os.path.join(directory, f'{name.lower()}.db')
+            os.environ['ASYNC_JOBS'] = '0'
+            import app
+            try:
+                run_checks(app, args.threads, args.saves)
+            finally:
+                with app.app.app_context():
+                    app.db.engine.dispose()
+        finally:
+            with admin.connect() as connection:
+                connection.exec_driver_sql(f'DROP DATABASE IF EXISTS "{database}"')
+            admin.dispose()
+            if stop:
+                subprocess.run(stop, capture_output=True)
+
+    if failures:
+        sys.exit(f"\n{len(failures)} check(s) failed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+# benchmarks/stats_analytics.py
+"""Time the /stats analytics over a large synthetic score table.
+
+Fills a throwaway SQLite database with --claims claims, --sources sources
+per claim and a CRAAP score per criterion for every source (200k claims
+make 5M score rows), then reports how long ScoreAnalytics takes to load it
+all, to summarize it per day/week/month, and to pick up an incremental
+change: --changed claims re-verified plus as many new ones.
+
+    python benchmarks/stats_analytics.py
+    python benchmarks/stats_analytics.py --claims 400000 --runs 5
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# How SQLAlchemy stores DateTime columns in SQLite, so range comparisons on the text work
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+INTENTS = ['News/Journalism', 'Opinion/Editorial', 'Scientific/Scholarly', 'Government/Official', 'Educational',
+           'Personal Blog/Opinion', 'Unknown']
+
+
+def fill(path, claims, sources, criteria, first_id, start, rng):
+    conn = sqlite3.connect(path)
+    claim_rows = []
+    source_rows = []
+    score_rows = []
+    source_id = conn.execute("SELECT coalesce(max(id), 0) FROM source").fetchone()[0]
+    for claim_id in range(first_id, first_id + claims):
+        checked = start + timedelta(minutes=claim_id)
+        final = None if rng.random() < 0.05 else rng.random()
+        claim_rows.append((claim_id, f'claim {claim_id}', f'{claim_id:064x}', checked.strftime(DATE_FORMAT),
+                           rng.random(), final))
+        for _ in range(sources):
+            source_id += 1
+            source_rows.append((source_id, claim_id, 'name', 'https://example.org', rng.choice(INTENTS)))
+            score_rows.extend((source_id, criterion, rng.randint(0, 10)) for criterion in criteria)
+    conn.executemany(
+        "INSERT INTO claim (id, text, text_hash, date_checked, veracity_probability, final_truth_score) "
+        "VALUES (?, ?, ?, ?, ?, ?)", claim_rows
+    )
+    conn.executemany("INSERT INTO source (id, claim_id, name, url, intent_category) VALUES (?, ?, ?, ?, ?)",
+                     source_rows)
+    conn.executemany("INSERT INTO craap_score (source_id, criterion, score) VALUES (?, ?, ?)", score_rows)
+    conn.commit()
+    conn.close()
+
+
+def reverify(path, claim_ids, criteria, rng):
+    # What save_claim_results does on a re-run: new date_checked, sources and scores replaced
+    conn = sqlite3.connect(path)
+    now = datetime.utcnow().strftime(DATE_FORMAT)
+    marks = ','.join('?' * len(claim_ids))
+    conn.execute(f"UPDATE claim SET date_checked = ?, final_truth_score = ? WHERE id IN ({marks})",
+                 (now, rng.random(), *claim_ids))
+    conn.execute(f"DELETE FROM craap_score WHERE source_id IN (SELECT id FROM source WHERE claim_id IN ({marks}))",
+                 claim_ids)
+    conn.execute(f"DELETE FROM source WHERE claim_id IN ({marks})", claim_ids)
+    for claim_id in claim_ids:
+        source_id = conn.execute(
+            "INSERT INTO source (claim_id, name, url, intent_category) VALUES (?, 'name', 'https://example.org', ?)",
+            (claim_id, rng.choice(INTENTS))
+        ).lastrowid
+        conn.executemany("INSERT INTO craap_score (source_id, criterion, score) VALUES (?, ?, ?)",
+                         [(source_id, criterion, rng.randint(0, 10)) for criterion in criteria])
+    conn.commit()
+    conn.close()
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--claims', type=int, default=200000)
+    parser.add_argument('--sources', type=int, default=5, help='sources per claim')
+    parser.add_argument('--changed', type=int, default=200, help='claims re-verified (and added) before the refresh')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'stats.db')
+        os.environ.update({
+            'GROQ_API_KEY': os.environ.get('GROQ_API_KEY', 'unused'),
+            'DATABASE_URL': f'sqlite:///{path}',
+            'CLAIM_SIMILARITY_ENABLED': '0',
+        })
+        for name in ('LLM_CACHE', 'SEARCH_CACHE', 'ARTICLE_CACHE', 'SOURCE_PROFILE', 'PAGE_CACHE'):
+            os.environ[f'{name}_PATH'] = os.path.join(directory, f'{name.lower()}.db')
+
+        import app
+        from analytics import ScoreAnalytics
+
+        with app.app.app_context():
+            app.db.create_all()
+        start = datetime.utcnow() - timedelta(minutes=args.claims + args.changed + 1)
+        began = time.perf_counter()
+        fill(path, args.claims, args.sources, app.CRAAP_CRITERIA, 1, start, rng)
+        scores = args.claims * args.sources * len(app.CRAAP_CRITERIA)
+        print(f"{args.claims} claims, {args.claims * args.sources} sources, {scores} score rows "
+              f"(filled in {time.perf_counter() - began:.1f} s)")
+
+        analytics = ScoreAnalytics(app.CRAAP_CRITERIA)
+        with app.app.app_context():
+            connection = app.db.session.connection()
+            began = time.perf_counter()
+            analytics.refresh(connection)
+            print(f"\nfull load            {(time.perf_counter() - began) * 1000:9.1f} ms")
+            print(f"no-change refresh    {timed(lambda: analytics.refresh(connection), args.runs) * 1000:9.1f} ms")
+            app.db.session.rollback()
+
+        began = time.perf_counter()
+        analytics.summary()
+        print(f"first summary        {(time.perf_counter() - began) * 1000:9.1f} ms (bins every score row)")
+        for period in ('day', 'week', 'month'):
+            print(f"summary per {period:<8} {timed(lambda: analytics.summary(period), args.runs) * 1000:9.1f} ms")
+
+        # The same aggregate straight from SQL, for comparison and as a check
+        with app.app.app_context():
+            began = time.perf_counter()
+            rows = app.db.session.execute(app.db.text(
+                "SELECT source.intent_category, avg(craap_score.score) FROM craap_score "
+                "JOIN source ON source.id = craap_score.source_id "
+                "WHERE craap_score.criterion = 'Authority' GROUP BY source.intent_category"
+            )).all()
+            elapsed = time.perf_counter() - began
+        by_intent = analytics.summary()['by_intent']
+        worst = max(abs(by_intent[intent]['Authority'] - mean) for intent, mean in rows)
+        print(f"SQL mean Authority by intent {elapsed * 1000:9.1f} ms (largest difference {worst:.4f})")
+
+        reverify(path, rng.sample(range(1, args.claims + 1), args.changed), app.CRAAP_CRITERIA, rng)
+        fill(path, args.changed, args.sources, app.CRAAP_CRITERIA, args.claims + 1, start, rng)
+        with app.app.app_context():
+            began = time.perf_counter()
+            analytics.refresh(app.db.session.connection())
+            print(f"\nincremental refresh  {(time.perf_counter() - began) * 1000:9.1f} ms "
+                  f"({args.changed} re-verified + {args.changed} new claims)")
+        began = time.perf_counter()
+        summary = analytics.summary()
+        print(f"summary after it     {(time.perf_counter() - began) * 1000:9.1f} ms")
+        print(f"\n{summary['claims']} claims, {summary['scores']} score rows after the refresh; "
+              f"verdicts {summary['verdicts']}")
+        with app.app.app_context():
+            app.db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# claim_search.py
+import re
+
+import sqlalchemy as sa
+from markupsafe import Markup, escape
+
+# One FTS5 document per claim: its text and justification plus the names and
+# snippets of all its sources. Triggers rebuild a claim's document whenever
+# the claim or any of its sources change, so the index never needs a batch job.
+REFRESH_DOCUMENTS = """
+    INSERT INTO claim_fts (rowid, text, veracity_justification, source_names, source_snippets)
+    SELECT claim.id, claim.text, claim.veracity_justification,
+        (SELECT group_concat(source.name, ' ') FROM source WHERE source.claim_id = claim.id),
+        (SELECT group_concat(source.snippet, ' ') FROM source WHERE source.claim_id = claim.id)
+    FROM claim WHERE {condition};
+"""
+
+SEARCH_INDEX_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS claim_fts USING fts5(
+        text, veracity_justification, source_names, source_snippets,
+        tokenize = 'porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS claim_fts_claim_insert AFTER INSERT ON claim BEGIN
+        {REFRESH_DOCUMENTS.format(condition='claim.id = new.id')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS claim_fts_claim_update
+    AFTER UPDATE OF text, veracity_justification ON claim BEGIN
+        DELETE FROM claim_fts WHERE rowid = old.id;
+        {REFRESH_DOCUMENTS.format(condition='claim.id = new.id')}
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS claim_fts_claim_delete AFTER DELETE ON claim BEGIN
+        DELETE FROM claim_fts WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS claim_fts_source_insert AFTER INSERT ON source BEGIN
+        DELETE FROM claim_fts WHERE rowid = new.claim_id;
+        {REFRESH_DOCUMENTS.format(condition='claim.id = new.claim_id')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS claim_fts_source_update
+    AFTER UPDATE OF claim_id, name, snippet ON source BEGIN
+        DELETE FROM claim_fts WHERE rowid IN (old.claim_id, new.claim_id);
+        {REFRESH_DOCUMENTS.format(condition='claim.id IN (old.claim_id, new.claim_id)')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS claim_fts_source_delete AFTER DELETE ON source BEGIN
+        DELETE FROM claim_fts WHERE rowid = old.claim_id;
+        {REFRESH_DOCUMENTS.format(condition='claim.id = old.claim_id')}
+    END""",
+]
+
+# Column weights for bm25: claim text matters most, source snippets least
+SEARCH_QUERY = """
+    SELECT claim.id, claim.text, claim.date_checked, claim.veracity_probability, claim.final_truth_score,
+        snippet(claim_fts, 0, char(2), char(3), '...', 24) AS text_highlight,
+        snippet(claim_fts, -1, char(2), char(3), '...', 16) AS match_highlight
+    FROM claim_fts
+    JOIN claim ON claim.id = claim_fts.rowid
+    WHERE claim_fts MATCH :query
+    ORDER BY bm25(claim_fts, 10.0, 4.0, 2.0, 1.0)
+    LIMIT :limit OFFSET :offset
+"""
+
+
+def create_search_index(connection):
+    for statement in SEARCH_INDEX_DDL:
+        connection.exec_driver_sql(statement)
+
+
+def rebuild_search_index(connection):
+    # Re-index every claim from scratch, e.g. for rows written while the triggers were missing
+    connection.exec_driver_sql("DELETE FROM claim_fts")
+    connection.exec_driver_sql(REFRESH_DOCUMENTS.format(condition='1'))
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query that matches all of its words.
+
+    Every word is quoted, so user input can never be parsed as FTS5 syntax;
+    the last word also matches as a prefix to support search-as-you-type.
+    """
+    words = re.findall(r'\w+', text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def highlight(fragment):
+    # snippet() marks matches with \x02/\x03; escape everything else before adding <mark>
+    if fragment is None:
+        return None
+    return Markup(str(escape(fragment)).replace('\x02', '<mark>').replace('\x03', '</mark>'))
+
+
+def search_claims(connection, text, limit=20, offset=0):
+    query = fts_query(text)
+    if query is None:
+        return []
+    statement = sa.text(SEARCH_QUERY).columns(
+        sa.column('id'), sa.column('text'), sa.column('date_checked', sa.DateTime),
+        sa.column('veracity_probability'), sa.column('final_truth_score'),
+        sa.column('text_highlight'), sa.column('match_highlight')
+    )
+    rows = connection.execute(statement, {'query': query, 'limit': limit, 'offset': offset}).mappings()
+    return [
+        dict(row, text_highlight=highlight(row['text_highlight']), match_highlight=highlight(row['match_highlight']))
+        for row in rows
+    ]
@@ -0,0 +1,201 @@
+# claim_similarity.py
+import hashlib
+import os
+import re
+import threading
+import time
+
+import numpy as np
+
+NUM_PERM = 128
+# Largest prime below 2**32, so every permuted hash fits in a uint32
+_PRIME = 4294967291
+_WORD = re.compile(r"\d+(?:[.,]\d+)*%?|[a-z]+")
+_STOPWORDS = frozenset(
+    'a an the of to in on at for by with from and or as is are was were be been being has have had '
+    'that this these those it its their there which who will would percent'.split()
+)
+_NEGATIONS = frozenset('not no never none nobody nothing neither nor without'.split())
+_SUFFIXES = ('ing', 'ed', 'es', 's', 'e')
+# Ids skipped over while indexing are re-checked for this long, in case their transaction commits late
+GAP_TTL = 300
+# At most this many of the ids just below the newest indexed one are tracked as gaps
+MAX_GAPS = 256
+
+
+def _stem(word):
+    # Just enough to match raise/raises/raised or rate/rates
+    if word.isalpha() and len(word) > 4:
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix):
+                return word[:-len(suffix)]
+    return word
+
+
+def _words(text):
+    return _WORD.findall(text.lower().replace("n't", ' not'))
+
+
+def content_words(text):
+    """A claim's words without stopwords, in order, with numbers normalized.
+
+    Claims with the same content words differ only in case, punctuation and
+    stopwords, so they say the same thing; anything more (e.g. "increases"
+    against "decreases") is left to a fresh assessment.
+    """
+    return [
+        word.rstrip('%').replace(',', '') if word[0].isdigit() else word
+        for word in _words(text) if word not in _STOPWORDS
+    ]
+
+
+def claim_features(text):
+    """Word shingles of a claim, and a guard key that near-duplicates must share.
+
+    Shingles are the stemmed content words and adjacent pairs of them. The
+    guard holds the claim's numbers and negations: "rates rose 0.5%" must not
+    match "rates rose 5%", nor "X did not happen" match "X did happen".
+    """
+    words = _words(text)
+    numbers = sorted({word.rstrip('%').replace(',', '') for word in words if word[0].isdigit()})
+    negated = any(word in _NEGATIONS for word in words)
+    tokens = [_stem(word) for word in words if word not in _STOPWORDS and word not in _NEGATIONS]
+    shingles = set(tokens) | {f'{first} {second}' for first, second in zip(tokens, tokens[1:])}
+    guard_text = ' '.join(numbers) + ('|not' if negated else '')
+    guard = int.from_bytes(hashlib.blake2b(guard_text.encode('utf-8'), digest_size=8).digest(), 'little')
+    return shingles, guard
+
+
+class ClaimSimilarityIndex:
+    """MinHash signatures of stored claims, for finding near-duplicates of a new claim.
+
+    Signatures live in NumPy arrays that grow as claims are added, and are
+    appended to an on-disk record file (memory-mapped on the next start) so
+    a restart only has to sign claims added since. A query compares the new
+    claim's signature with every stored one in a single vectorized pass; the
+    fraction of matching positions estimates the Jaccard similarity of the
+    two claims' word shingles. `max_id` is the highest id indexed; ids below
+    it that were never seen are listed by `pending_ids` for a while, since
+    concurrent writers can commit a lower id after a higher one.
+    """
+
+    def __init__(self, path=None, num_perm=NUM_PERM, enabled=True):
+        self.path = path
+        self.num_perm = num_perm
+        self.enabled = enabled
+        self.record = np.dtype([('id', '<i8'), ('guard', '<u8'), ('signature', '<u4', (num_perm,))])
+        # Fixed seed: signatures on disk must stay comparable across restarts
+        rng = np.random.default_rng(20240917)
+        self._a = rng.integers(1, 2 ** 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 31, size=num_perm, dtype=np.uint64)
+        self._lock = threading.Lock()
+        self._records = np.zeros(1024, dtype=self.record)
+        self._size = 0
+        self.max_id = 0
+        # id -> when it was first found missing below max_id
+        self._pending = {}
+        self.queries = 0
+        self.matches = 0
+        if enabled and path and os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        count = os.path.getsize(self.path) // self.record.itemsize
+        if not count:
+            return
+        stored = np.memmap(self.path, dtype=self.record, mode='r', shape=(count,))
+        # Several processes may append the same claim; keep one copy of each, in id order
+        ids, first = np.unique(stored['id'], return_index=True)
+        self._append(np.array(stored[np.sort(first)]))
+        del stored
+        # Claims may have committed under lower ids after the last one written here
+        self._track_gaps(set(ids[-MAX_GAPS:].tolist()), self.max_id - MAX_GAPS, self.max_id)
+
+    def _track_gaps(self, seen, after, up_to):
+        now = time.monotonic()
+        for claim_id in range(max(after + 1, up_to - MAX_GAPS + 1, 1), up_to):
+            if claim_id not in seen:
+                self._pending.setdefault(claim_id, now)
+
+    def _append(self, records):
+        needed = self._size + len(records)
+        if needed > len(self._records):
+            grown = np.zeros(max(needed, 2 * len(self._records)), dtype=self.record)
+            grown[:self._size] = self._records[:self._size]
+            self._records = grown
+        self._records[self._size:needed] = records
+        self._size = needed
+        self.max_id = max(self.max_id, int(records['id'].max()))
+
+    def signature(self, shingles):
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'little')
+             for shingle in shingles),
+            dtype=np.uint64, count=len(shingles)
+        )
+        permuted = (hashes[:, None] * self._a + self._b) % np.uint64(_PRIME)
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def add_many(self, claims):
+        """Index (claim_id, text) pairs above `max_id` or pending; claims without any words are skipped."""
+        if not self.enabled:
+            return
+        with self._lock:
+            rows = []
+            seen = set()
+            for claim_id, text in claims:
+                if claim_id in seen or (claim_id <= self.max_id and claim_id not in self._pending):
+                    continue
+                seen.add(claim_id)
+                self._pending.pop(claim_id, None)
+                shingles, guard = claim_features(text)
+                if shingles:
+                    rows.append((claim_id, guard, self.signature(shingles)))
+            newest = max(seen, default=0)
+            if newest > self.max_id:
+                self._track_gaps(seen, self.max_id, newest)
+                self.max_id = newest
+            if not rows:
+                return
+            records = np.array(rows, dtype=self.record)
+            self._append(records)
+            if self.path:
+                try:
+                    with open(self.path, 'ab') as f:
+                        f.write(records.tobytes())
+                except OSError as e:
+                    print(f"Error writing claim similarity index: {e}")
+
+    def pending_ids(self):
+        """Ids below `max_id` not indexed yet whose claims may still commit, for the next sync to ask for."""
+        cutoff = time.monotonic() - GAP_TTL
+        with self._lock:
+            self._pending = {claim_id: since for claim_id, since in self._pending.items() if since >= cutoff}
+            return sorted(self._pending)
+
+    def query(self, text, min_similarity, limit=5):
+        """Up to `limit` (claim_id, similarity) pairs at or above `min_similarity`, most similar first."""
+        if not self.enabled:
+            return []
+        shingles, guard = claim_features(text)
+        if not shingles:
+            return []
+        signature = self.signature(shingles)
+        with self._lock:
+            records = self._records[:self._size]
+            similarity = (records['signature'] == signature).mean(axis=1)
+            similarity[records['guard'] != guard] = 0.0
+            candidates = np.flatnonzero(similarity >= min_similarity)
+            best = candidates[np.argsort(-similarity[candidates], kind='stable')][:limit]
+            matches = [(int(records['id'][i]), float(similarity[i])) for i in best]
+            self.queries += 1
+            self.matches += bool(matches)
+        return matches
+
+    def stats(self):
+        return {
+            'claims': self._size,
+            'queries': self.queries,
+            'matches': self.matches,
+            'match_rate': self.matches / self.queries if self.queries else 0.0,
+        }
@@ -0,0 +1,94 @@
+# concurrency.py
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+class PipelinePool:
+    """Bounded thread pool for the network-bound parts of the pipeline.
+
+    `max_workers` caps the total number of calls in flight; `provider_limits`
+    optionally caps calls per upstream provider (e.g. {'groq': 8, 'bing': 3}).
+    Tasks submitted here must be leaves: they may not wait on other tasks in
+    the same pool, otherwise a full pool can deadlock.
+    """
+
+    def __init__(self, max_workers=16, provider_limits=None):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='factcheck')
+        self._semaphores = {
+            provider: threading.BoundedSemaphore(limit)
+            for provider, limit in (provider_limits or {}).items()
+            if limit
+        }
+
+    @contextmanager
+    def limit(self, provider):
+        semaphore = self._semaphores.get(provider)
+        if semaphore is None:
+            yield
+            return
+        with semaphore:
+            yield
+
+    def _call(self, provider, fn, args, kwargs):
+        with self.limit(provider):
+            return fn(*args, **kwargs)
+
+    def submit(self, provider, fn, *args, **kwargs):
+        # Run in a copy of the caller's context so per-request state (e.g. trace spans) follows the task
+        context = contextvars.copy_context()
+        return self._executor.submit(context.run, self._call, provider, fn, args, kwargs)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+class EventFeed:
+    """Events published per key (e.g. a job id) in this process, replayed in full to every reader.
+
+    `open` starts a key's feed, `publish` appends to it and wakes its
+    readers, and `close` ends it. A reader joining late first gets
+    everything published so far. `follow` returns None for a key with no
+    open feed here (never opened, already closed, or run by another process).
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._feeds = {}
+
+    def open(self, key):
+        with self._condition:
+            self._feeds.setdefault(key, {'events': [], 'closed': False})
+
+    def publish(self, key, event, payload):
+        with self._condition:
+            feed = self._feeds.get(key)
+            if feed is not None:
+                feed['events'].append((event, payload))
+                self._condition.notify_all()
+
+    def close(self, key):
+        with self._condition:
+            feed = self._feeds.pop(key, None)
+            if feed is not None:
+                feed['closed'] = True
+                self._condition.notify_all()
+
+    def follow(self, key):
+        with self._condition:
+            feed = self._feeds.get(key)
+        return None if feed is None else self._read(feed)
+
+    def _read(self, feed):
+        position = 0
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: feed['closed'] or len(feed['events']) > position)
+                events = feed['events'][position:]
+                closed = feed['closed']
+            yield from events
+            position += len(events)
+            if closed:
+                return
@@ -0,0 +1,159 @@
+# http_client.py
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HTTPStats:
+    """Counters for connection reuse and where request time goes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.connections_opened = 0
+        self.connect_seconds = 0.0
+        self.request_seconds = 0.0
+
+    def add(self, **amounts):
+        with self._lock:
+            for name, amount in amounts.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self):
+        with self._lock:
+            reused = max(self.requests - self.connections_opened, 0)
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'connections_opened': self.connections_opened,
+                'connection_reuse_rate': reused / self.requests if self.requests else 0.0,
+                'connect_seconds': self.connect_seconds,
+                # Everything after the TCP/TLS handshake: request, server time and body transfer
+                'transfer_seconds': max(self.request_seconds - self.connect_seconds, 0.0),
+            }
+
+
+class TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report how long each connect() (DNS + TCP + TLS) took.
+
+    With `pool_block`, a caller waits at most `pool_timeout` seconds for a
+    free connection to a host (requests itself never passes a pool timeout,
+    so urllib3 would wait forever).
+    """
+
+    def __init__(self, stats, pool_timeout=None, **kwargs):
+        self.stats = stats
+        self.pool_timeout = pool_timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        stats = self.stats
+        pool_timeout = self.pool_timeout
+
+        def timed(connection_class):
+            class TimedConnection(connection_class):
+                def connect(self):
+                    start = time.perf_counter()
+                    try:
+                        return super().connect()
+                    finally:
+                        stats.add(connections_opened=1, connect_seconds=time.perf_counter() - start)
+            return TimedConnection
+
+        def bounded(pool_class):
+            class BoundedPool(pool_class):
+                def _get_conn(self, timeout=None):
+                    return super()._get_conn(timeout=pool_timeout if timeout is None else timeout)
+            return BoundedPool
+
+        class TimedHTTPConnectionPool(bounded(HTTPConnectionPool)):
+            ConnectionCls = timed(HTTPConnection)
+
+        class TimedHTTPSConnectionPool(bounded(HTTPSConnectionPool)):
+            ConnectionCls = timed(HTTPSConnection)
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+
+class HTTPClient:
+    """Shared keep-alive session for every outbound fetch.
+
+    Connections are pooled per host (at most `pool_maxsize` open to any one
+    host; extra callers wait up to `pool_timeout` seconds for a free
+    connection, then get a ConnectionError). Requests that fail with a
+    connection error, a timeout or a 429/5xx status are retried up to
+    `max_retries` times with full-jitter exponential backoff, honouring
+    Retry-After when the server sends one. A 429/5xx still failing after the
+    last retry is returned with its body already read, so its connection is
+    back in the pool even if the caller streamed and never reads it.
+    """
+
+    def __init__(self, pool_maxsize=10, timeout=(3.05, 20), max_retries=3, backoff=0.5, max_backoff=10,
+                 pool_timeout=30, user_agent='Mozilla/5.0 (compatible; FactChecker/1.0)'):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.stats = HTTPStats()
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        adapter = TimedAdapter(
+            self.stats, pool_timeout=pool_timeout, pool_connections=32, pool_maxsize=pool_maxsize, pool_block=True
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _delay(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except EmptyPoolError as e:
+                # Every connection to the host stayed busy for pool_timeout; waiting again won't help
+                self.stats.add(requests=1, request_seconds=time.perf_counter() - start)
+                raise requests.ConnectionError(e) from e
+            except (requests.ConnectionError, requests.Timeout):
+                self.stats.add(requests=1, request_seconds=time.perf_counter() - start)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._delay(attempt)
+            else:
+                self.stats.add(requests=1, request_seconds=time.perf_counter() - start)
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                if attempt >= self.max_retries:
+                    response.content
+                    response.close()
+                    return response
+                delay = self._delay(attempt, response)
+                response.close()
+            attempt += 1
+            self.stats.add(retries=1)
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
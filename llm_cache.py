@@ -0,0 +1,143 @@
+# llm_cache.py
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+
+
+class LLMResponseCache:
+    """Content-addressed store of chat completion results in a SQLite file.
+
+    Entries older than `ttl` seconds are treated as misses. When the table
+    grows past `max_entries`, the least recently used rows are evicted.
+    """
+
+    def __init__(self, path, ttl=7 * 24 * 3600, max_entries=10000, enabled=True):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_response (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                usage TEXT,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_response_last_used ON llm_response (last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model, messages, max_tokens, temperature):
+        payload = json.dumps(
+            {'model': model, 'messages': messages, 'max_tokens': max_tokens, 'temperature': temperature},
+            sort_keys=True,
+            separators=(',', ':')
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, usage, created_at FROM llm_response WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl and now - row[2] > self.ttl):
+                if row is not None:
+                    self._conn.execute("DELETE FROM llm_response WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_response SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return {'content': row[0], 'usage': json.loads(row[1]) if row[1] else None}
+
+    def set(self, key, content, usage=None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_response (key, content, usage, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, content, json.dumps(usage) if usage else None, now, now)
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_response").fetchone()
+            if self.max_entries and count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM llm_response WHERE key IN "
+                    "(SELECT key FROM llm_response ORDER BY last_used ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_response")
+            self._conn.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+def _usage_dict(response):
+    usage = getattr(response, 'usage', None)
+    if usage is None:
+        return None
+    return {
+        'prompt_tokens': getattr(usage, 'prompt_tokens', 0),
+        'completion_tokens': getattr(usage, 'completion_tokens', 0),
+        'total_tokens': getattr(usage, 'total_tokens', 0),
+    }
+
+
+def _cached_response(entry):
+    message = SimpleNamespace(content=entry['content'])
+    usage = SimpleNamespace(**entry['usage']) if entry['usage'] else None
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage, cached=True)
+
+
+class _CachedCompletions:
+    def __init__(self, completions, cache):
+        self._completions = completions
+        self._cache = cache
+
+    def create(self, bypass_cache=False, **kwargs):
+        if bypass_cache or not self._cache.enabled:
+            return self._completions.create(**kwargs)
+        key = self._cache.make_key(
+            kwargs.get('model'), kwargs.get('messages'), kwargs.get('max_tokens'), kwargs.get('temperature')
+        )
+        entry = self._cache.get(key)
+        if entry is not None:
+            return _cached_response(entry)
+        response = self._completions.create(**kwargs)
+        self._cache.set(key, response.choices[0].message.content, _usage_dict(response))
+        return response
+
+
+class CachedChatClient:
+    """Drop-in wrapper around a Groq client that serves repeated completions from cache.
+
+    Only `client.chat.completions.create` is intercepted; pass
+    `bypass_cache=True` to force a fresh call.
+    """
+
+    def __init__(self, client, cache):
+        self._client = client
+        self.cache = cache
+        self.chat = SimpleNamespace(completions=_CachedCompletions(client.chat.completions, cache))
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
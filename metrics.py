@@ -0,0 +1,254 @@
+# metrics.py
+import contextvars
+import functools
+import json
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+# Seconds; covers a cached lookup through a slow article download
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _label_text(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34)).replace(chr(10), " ")}"'
+        for name, value in labels
+    )
+    return '{' + pairs + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.type = 'counter'
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, '') for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield self.name, tuple(zip(self.label_names, key)), value
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.type = 'histogram'
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets) + (float('inf'),)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, '') for name in self.label_names)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        with self._lock:
+            values = {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+        for key, (counts, total) in sorted(values.items()):
+            labels = tuple(zip(self.label_names, key))
+            for bound, count in zip(self.buckets, counts):
+                yield f'{self.name}_bucket', labels + (('le', _number(bound)),), count
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, counts[-1]
+
+
+class MetricsRegistry:
+    """Counters and histograms, plus collectors that turn existing stats objects into metrics at scrape time."""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, help_text, labels=()):
+        metric = Counter(name, help_text, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, help_text, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, fn):
+        # fn() returns [(name, type, help, [(labels dict, value), ...]), ...]
+        self._collectors.append(fn)
+        return fn
+
+    def render(self):
+        """Everything in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{_label_text(labels)} {_number(value)}')
+        for collect in self._collectors:
+            try:
+                families = collect()
+            except Exception as e:
+                print(f"Error collecting metrics from {collect.__name__}: {e}")
+                continue
+            for name, metric_type, help_text, samples in families:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                for labels, value in samples:
+                    lines.append(f'{name}{_label_text(sorted(labels.items()))} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+_current_trace = contextvars.ContextVar('trace', default=None)
+_current_span = contextvars.ContextVar('span', default=None)
+
+
+class Tracer:
+    """Times pipeline stages into a histogram and, optionally, logs each request's spans as JSON.
+
+    Every `span(stage)` is observed in `factcheck_stage_seconds` and counted
+    in `factcheck_stage_errors_total` when it raises. Inside a `trace(...)`
+    the spans are also collected (across pool threads, as long as tasks are
+    submitted with the caller's context) and written as one JSON line to
+    `log_path` ('-' for stdout) when the trace ends. `log_path` may also be
+    a callable returning the path, read as each trace starts.
+    """
+
+    def __init__(self, registry, log_path=None):
+        self.log_path = log_path
+        self.stage_seconds = registry.histogram(
+            'factcheck_stage_seconds', 'Wall time of each pipeline stage.', labels=('stage',)
+        )
+        self.stage_errors = registry.counter(
+            'factcheck_stage_errors_total', 'Pipeline stages that raised.', labels=('stage',)
+        )
+        self._log_lock = threading.Lock()
+
+    @contextmanager
+    def trace(self, name, **attributes):
+        log_path = self.log_path() if callable(self.log_path) else self.log_path
+        if not log_path or _current_trace.get() is not None:
+            yield
+            return
+        trace = {'trace_id': uuid.uuid4().hex, 'name': name, 'attributes': attributes, 'spans': []}
+        # set() rather than reset(token): traces are opened inside generators, which may be closed elsewhere
+        _current_trace.set(trace)
+        start = time.time()
+        try:
+            yield
+        finally:
+            _current_trace.set(None)
+            trace['start'] = start
+            trace['duration'] = time.time() - start
+            self._write(trace, log_path)
+
+    @contextmanager
+    def span(self, stage, **attributes):
+        trace = _current_trace.get()
+        record = {'stage': stage, 'attributes': attributes} if trace is not None else None
+        parent = _current_span.get()
+        _current_span.set(record)
+        start = time.perf_counter()
+        started_at = time.time()
+        try:
+            yield record
+        except Exception as e:
+            self.stage_errors.inc(stage=stage)
+            if record is not None:
+                record['error'] = str(e)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_span.set(parent)
+            self.stage_seconds.observe(elapsed, stage=stage)
+            if record is not None:
+                record.update(
+                    span_id=uuid.uuid4().hex[:16],
+                    parent_id=parent.get('span_id') if parent else None,
+                    thread=threading.current_thread().name,
+                    start=started_at,
+                    duration=elapsed,
+                )
+                trace['spans'].append(record)
+
+    def timed(self, stage):
+        # Decorator form of span()
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def annotate(self, **values):
+        # Add to the attributes of the innermost span of the current trace, if any
+        record = _current_span.get()
+        if record is not None:
+            attributes = record['attributes']
+            for name, value in values.items():
+                attributes[name] = attributes.get(name, 0) + value if isinstance(value, (int, float)) else value
+
+    def _write(self, trace, log_path):
+        line = json.dumps(trace, default=str)
+        with self._log_lock:
+            if log_path == '-':
+                print(line, file=sys.stdout, flush=True)
+            else:
+                with open(log_path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+
+
+class _TracedCompletions:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def create(self, **kwargs):
+        response = self._owner.client.chat.completions.create(**kwargs)
+        cached = bool(getattr(response, 'cached', False))
+        usage = getattr(response, 'usage', None)
+        billed = usage is not None and not cached
+        self._owner.tracer.annotate(
+            llm_calls=1,
+            llm_cached=int(cached),
+            prompt_tokens=usage.prompt_tokens if billed else 0,
+            completion_tokens=usage.completion_tokens if billed else 0,
+        )
+        return response
+
+
+class TracedChatClient:
+    """Adds each completion, and the tokens Groq billed for it, to the current trace span."""
+
+    def __init__(self, client, tracer):
+        self.client = client
+        self.tracer = tracer
+        self.chat = SimpleNamespace(completions=_TracedCompletions(self))
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
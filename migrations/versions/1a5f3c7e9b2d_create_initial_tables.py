@@ -0,0 +1,66 @@
+"""Create initial tables
+
+Revision ID: 1a5f3c7e9b2d
+Revises:
+Create Date: 2026-10-17 18:21:09.432871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1a5f3c7e9b2d'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# The schema the app had before migrations were introduced. Databases that
+# were created with db.create_all() back then already have these tables.
+def upgrade():
+    existing = sa.inspect(op.get_bind()).get_table_names()
+    if 'claim' not in existing:
+        op.create_table('claim',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('date_checked', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'overall_craap_score' not in existing:
+        op.create_table('overall_craap_score',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('claim_id', sa.Integer(), nullable=False),
+        sa.Column('criterion', sa.String(length=64), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['claim_id'], ['claim.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'source' not in existing:
+        op.create_table('source',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('claim_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=512), nullable=False),
+        sa.Column('url', sa.String(length=512), nullable=False),
+        sa.Column('snippet', sa.Text(), nullable=True),
+        sa.Column('date_last_crawled', sa.String(length=128), nullable=True),
+        sa.ForeignKeyConstraint(['claim_id'], ['claim.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'craap_score' not in existing:
+        op.create_table('craap_score',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source_id', sa.Integer(), nullable=False),
+        sa.Column('criterion', sa.String(length=64), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('explanation', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['source_id'], ['source.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('craap_score')
+    op.drop_table('source')
+    op.drop_table('overall_craap_score')
+    op.drop_table('claim')
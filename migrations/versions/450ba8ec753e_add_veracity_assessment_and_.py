@@ -1,7 +1,7 @@
 """Add veracity assessment and intentionality categorization
 
 Revision ID: 450ba8ec753e
-Revises: 
+Revises: 1a5f3c7e9b2d
 Create Date: 2024-09-27 01:16:54.519876
 
 """
@@ -11,7 +11,7 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision = '450ba8ec753e'
-down_revision = None
+down_revision = '1a5f3c7e9b2d'
 branch_labels = None
 depends_on = None
 
@@ -0,0 +1,85 @@
+"""Add claim text hash and indexes on lookup columns
+
+Revision ID: b3e8f1a2c5d7
+Revises: 7c1d2e9f4a6b
+Create Date: 2026-10-17 11:03:27.551902
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e8f1a2c5d7'
+down_revision = '7c1d2e9f4a6b'
+branch_labels = None
+depends_on = None
+
+
+def claim_text_hash(text):
+    # Frozen copy of app.claim_text_hash as of this revision
+    normalized = ' '.join(text.casefold().split()).rstrip('.!? ')
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def upgrade():
+    with op.batch_alter_table('claim', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('text_hash', sa.String(length=64), nullable=True))
+
+    # Backfill hashes, newest claim first. Older claims that normalize to the
+    # same text keep a NULL hash so the unique index can be built.
+    claim = sa.table(
+        'claim',
+        sa.column('id', sa.Integer),
+        sa.column('text', sa.Text),
+        sa.column('text_hash', sa.String),
+        sa.column('date_checked', sa.DateTime),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(claim.c.id, claim.c.text).order_by(claim.c.date_checked.desc(), claim.c.id.desc())
+    ).fetchall()
+    seen = set()
+    updates = []
+    for claim_id, text in rows:
+        text_hash = claim_text_hash(text)
+        if text_hash in seen:
+            continue
+        seen.add(text_hash)
+        updates.append({'claim_id': claim_id, 'text_hash': text_hash})
+    if updates:
+        bind.execute(
+            claim.update().where(claim.c.id == sa.bindparam('claim_id')).values(text_hash=sa.bindparam('text_hash')),
+            updates
+        )
+
+    with op.batch_alter_table('claim', schema=None) as batch_op:
+        batch_op.create_index('ix_claim_text_hash', ['text_hash'], unique=True)
+        batch_op.create_index('ix_claim_date_checked_id', ['date_checked', 'id'], unique=False)
+
+    with op.batch_alter_table('source', schema=None) as batch_op:
+        batch_op.create_index('ix_source_claim_id', ['claim_id'], unique=False)
+
+    with op.batch_alter_table('craap_score', schema=None) as batch_op:
+        batch_op.create_index('ix_craap_score_source_id', ['source_id'], unique=False)
+
+    with op.batch_alter_table('overall_craap_score', schema=None) as batch_op:
+        batch_op.create_index('ix_overall_craap_score_claim_id', ['claim_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('overall_craap_score', schema=None) as batch_op:
+        batch_op.drop_index('ix_overall_craap_score_claim_id')
+
+    with op.batch_alter_table('craap_score', schema=None) as batch_op:
+        batch_op.drop_index('ix_craap_score_source_id')
+
+    with op.batch_alter_table('source', schema=None) as batch_op:
+        batch_op.drop_index('ix_source_claim_id')
+
+    with op.batch_alter_table('claim', schema=None) as batch_op:
+        batch_op.drop_index('ix_claim_date_checked_id')
+        batch_op.drop_index('ix_claim_text_hash')
+        batch_op.drop_column('text_hash')
@@ -0,0 +1,82 @@
+"""Add FTS5 full-text search index over claims and sources
+
+Revision ID: d4a9c6e1f0b2
+Revises: b3e8f1a2c5d7
+Create Date: 2026-10-17 13:47:05.118630
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a9c6e1f0b2'
+down_revision = 'b3e8f1a2c5d7'
+branch_labels = None
+depends_on = None
+
+
+# Frozen copy of claim_search.py as of this revision
+REFRESH_DOCUMENTS = """
+    INSERT INTO claim_fts (rowid, text, veracity_justification, source_names, source_snippets)
+    SELECT claim.id, claim.text, claim.veracity_justification,
+        (SELECT group_concat(source.name, ' ') FROM source WHERE source.claim_id = claim.id),
+        (SELECT group_concat(source.snippet, ' ') FROM source WHERE source.claim_id = claim.id)
+    FROM claim WHERE {condition};
+"""
+
+SEARCH_INDEX_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS claim_fts USING fts5(
+        text, veracity_justification, source_names, source_snippets,
+        tokenize = 'porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS claim_fts_claim_insert AFTER INSERT ON claim BEGIN
+        {REFRESH_DOCUMENTS.format(condition='claim.id = new.id')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS claim_fts_claim_update
+    AFTER UPDATE OF text, veracity_justification ON claim BEGIN
+        DELETE FROM claim_fts WHERE rowid = old.id;
+        {REFRESH_DOCUMENTS.format(condition='claim.id = new.id')}
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS claim_fts_claim_delete AFTER DELETE ON claim BEGIN
+        DELETE FROM claim_fts WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS claim_fts_source_insert AFTER INSERT ON source BEGIN
+        DELETE FROM claim_fts WHERE rowid = new.claim_id;
+        {REFRESH_DOCUMENTS.format(condition='claim.id = new.claim_id')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS claim_fts_source_update
+    AFTER UPDATE OF claim_id, name, snippet ON source BEGIN
+        DELETE FROM claim_fts WHERE rowid IN (old.claim_id, new.claim_id);
+        {REFRESH_DOCUMENTS.format(condition='claim.id IN (old.claim_id, new.claim_id)')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS claim_fts_source_delete AFTER DELETE ON source BEGIN
+        DELETE FROM claim_fts WHERE rowid = old.claim_id;
+        {REFRESH_DOCUMENTS.format(condition='claim.id = old.claim_id')}
+    END""",
+]
+
+DROP_SEARCH_INDEX_DDL = [
+    "DROP TRIGGER IF EXISTS claim_fts_source_delete",
+    "DROP TRIGGER IF EXISTS claim_fts_source_update",
+    "DROP TRIGGER IF EXISTS claim_fts_source_insert",
+    "DROP TRIGGER IF EXISTS claim_fts_claim_delete",
+    "DROP TRIGGER IF EXISTS claim_fts_claim_update",
+    "DROP TRIGGER IF EXISTS claim_fts_claim_insert",
+    "DROP TABLE IF EXISTS claim_fts",
+]
+
+
+def upgrade():
+    # FTS5 is SQLite-only; other backends use the substring fallback in /search
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in SEARCH_INDEX_DDL:
+        op.execute(statement)
+    op.execute(REFRESH_DOCUMENTS.format(condition='1'))
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in DROP_SEARCH_INDEX_DDL:
+        op.execute(statement)
@@ -0,0 +1,121 @@
+# page_cache.py
+import sqlite3
+import threading
+import time
+
+# A hit only records its use when the last record is older than this, so hot pages don't cost a write each
+TOUCH_INTERVAL = 60
+
+
+class PageCache:
+    """Rendered HTML pages with their ETag and Last-Modified, stored in SQLite.
+
+    Every page belongs to a group (e.g. one claim, or all /news pages) that
+    `invalidate` clears once the data behind it changes. Each group has a
+    version that `invalidate` bumps: a page is stored by `set` only if its
+    group's version is still the one `get` returned, so a page rendered from
+    rows read before a re-verification can't be cached after it. Once the
+    stored pages exceed `max_bytes`, the least recently used are evicted.
+    """
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024, enabled=True):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS page (
+                page_key TEXT PRIMARY KEY,
+                page_group TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT NOT NULL,
+                last_modified REAL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS page_group (
+                page_group TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_page_group ON page (page_group)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_page_last_used ON page (last_used)")
+        self._conn.commit()
+
+    def get(self, key, group):
+        """Returns (page, version): the cached page dict or None, and the group's current version."""
+        if not self.enabled:
+            return None, None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, last_used FROM page WHERE page_key = ?", (key,)
+            ).fetchone()
+            # Returned on hits too: a hit the caller finds stale is re-rendered and stored over it
+            version = self._conn.execute(
+                "SELECT version FROM page_group WHERE page_group = ?", (group,)
+            ).fetchone()
+            version = version[0] if version else 0
+            if row is None:
+                self.misses += 1
+                return None, version
+            self.hits += 1
+            if now - row[3] > TOUCH_INTERVAL:
+                self._conn.execute("UPDATE page SET last_used = ? WHERE page_key = ?", (now, key))
+                self._conn.commit()
+        return {'body': row[0], 'etag': row[1], 'last_modified': row[2]}, version
+
+    def set(self, key, group, version, body, etag, last_modified=None):
+        """Store a page rendered after `get` returned `version`, unless its group was invalidated since."""
+        if not self.enabled or version is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO page (page_key, page_group, body, etag, last_modified, size, last_used) "
+                "SELECT ?, ?, ?, ?, ?, ?, ? "
+                "WHERE COALESCE((SELECT version FROM page_group WHERE page_group = ?), 0) = ?",
+                (key, group, body, etag, last_modified, len(body), time.time(), group, version)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def invalidate(self, groups):
+        if not self.enabled:
+            return
+        groups = [(group,) for group in set(groups)]
+        with self._lock:
+            self.invalidations += len(groups)
+            self._conn.executemany("DELETE FROM page WHERE page_group = ?", groups)
+            self._conn.executemany(
+                "INSERT INTO page_group (page_group, version) VALUES (?, 1) "
+                "ON CONFLICT (page_group) DO UPDATE SET version = version + 1",
+                groups
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM page").fetchone()
+        if not self.max_bytes or total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self._conn.execute("SELECT page_key, size FROM page ORDER BY last_used ASC"):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM page WHERE page_key = ?", victims)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'invalidations': self.invalidations,
+        }
@@ -0,0 +1,188 @@
+# rate_limit.py
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+
+class TokenBucket:
+    """Refills at `per_minute / 60` units a second, holding at most `capacity` units."""
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1):
+        # Block until `amount` units are available; returns the seconds spent waiting
+        amount = min(amount, self.capacity)
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return time.monotonic() - start
+                self._cond.wait((amount - self.tokens) / self.rate)
+
+    def adjust(self, amount):
+        # Give back (positive) or charge extra (negative) units once the real cost is known
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+            self._cond.notify_all()
+
+
+class AIMDLimiter:
+    """Concurrency limit that grows by one per window of successes and halves on throttling."""
+
+    def __init__(self, max_limit, min_limit=1):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, throttled=False):
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.min_limit, self.limit / 2)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class ModelBudget:
+    def __init__(self, rpm, tpm, max_concurrency):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.concurrency = AIMDLimiter(max_concurrency)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    def record(self, **amounts):
+        with self._lock:
+            for name, amount in amounts.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'prompt_tokens': self.prompt_tokens,
+                'completion_tokens': self.completion_tokens,
+                'throttled': self.throttled,
+                'wait_seconds': self.wait_seconds,
+                'concurrency_limit': self.concurrency.limit,
+            }
+
+
+def _is_rate_limited(error):
+    return getattr(error, 'status_code', None) == 429
+
+
+def _retry_after(error):
+    response = getattr(error, 'response', None)
+    value = response.headers.get('retry-after') if response is not None else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def estimate_tokens(messages, max_tokens):
+    # Roughly four characters per token, plus the full completion allowance
+    prompt_chars = sum(len(message.get('content') or '') for message in messages)
+    return prompt_chars // 4 + (max_tokens or 0)
+
+
+class _RateLimitedCompletions:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def create(self, **kwargs):
+        owner = self._owner
+        budget = owner.budget(kwargs.get('model'))
+        estimate = min(estimate_tokens(kwargs.get('messages', []), kwargs.get('max_tokens')), budget.tokens.capacity)
+        for attempt in range(owner.max_attempts):
+            waited = budget.requests.acquire(1) + budget.tokens.acquire(estimate)
+            start = time.monotonic()
+            budget.concurrency.acquire()
+            waited += time.monotonic() - start
+            budget.record(wait_seconds=waited)
+            try:
+                response = owner.client.chat.completions.create(**kwargs)
+            except Exception as e:
+                throttled = _is_rate_limited(e)
+                budget.concurrency.release(throttled=throttled)
+                # A failed call used none of its budget; the retry (if any) takes its own
+                budget.requests.adjust(1)
+                budget.tokens.adjust(estimate)
+                if not throttled or attempt == owner.max_attempts - 1:
+                    raise
+                budget.record(throttled=1)
+                delay = _retry_after(e) or random.uniform(0, min(owner.max_backoff, 2 ** attempt))
+                time.sleep(delay)
+                continue
+            budget.concurrency.release()
+            usage = getattr(response, 'usage', None)
+            if usage is not None:
+                budget.tokens.adjust(estimate - usage.total_tokens)
+                budget.record(prompt_tokens=usage.prompt_tokens, completion_tokens=usage.completion_tokens)
+            budget.record(calls=1)
+            return response
+
+
+class RateLimitedChatClient:
+    """Wraps a Groq client so completions respect per-model request and token budgets.
+
+    Each model gets a requests-per-minute and tokens-per-minute token bucket
+    and an AIMD concurrency limit. Calls wait for budget instead of failing;
+    a 429 halves the model's concurrency and the call is retried after
+    Retry-After (or a jittered backoff). Token estimates are reconciled with
+    the `usage` the API reports, and a failed attempt gives back its request
+    and token estimate.
+    """
+
+    def __init__(self, client, model_limits, default_limits, max_attempts=8, max_backoff=30):
+        self.client = client
+        self.model_limits = model_limits
+        self.default_limits = default_limits
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+        self._budgets = {}
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=_RateLimitedCompletions(self))
+
+    def budget(self, model):
+        with self._lock:
+            if model not in self._budgets:
+                limits = {**self.default_limits, **self.model_limits.get(model, {})}
+                self._budgets[model] = ModelBudget(limits['rpm'], limits['tpm'], limits['concurrency'])
+            return self._budgets[model]
+
+    def stats(self):
+        with self._lock:
+            budgets = dict(self._budgets)
+        return {model: budget.snapshot() for model, budget in budgets.items()}
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
@@ -0,0 +1,112 @@
+# search_cache.py
+import json
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+# Words that don't change what a search is about; dropped from cache keys
+STOPWORDS = frozenset("""
+a an the and or but of to in on at by for with from as is are was were be been being
+that this these those it its has have had do does did will would can could should
+than then there their they he she his her we our you your i me my
+""".split())
+
+_PUNCTUATION = re.compile(r"[^\w\s%.]|(?<!\d)\.|\.(?!\d)")
+
+
+def normalize_query(text):
+    """Reduce a claim to a cache key that ignores case, punctuation, spacing and stopwords.
+
+    Decimal points and percent signs are kept, so "0.5%" and "5%" stay distinct.
+    """
+    text = _PUNCTUATION.sub(' ', text.lower())
+    words = [word for word in text.split() if word not in STOPWORDS]
+    return ' '.join(words)
+
+
+class SearchResultCache:
+    """Parsed search results per normalized query, stored in SQLite with a TTL."""
+
+    def __init__(self, path, ttl=24 * 3600, enabled=True):
+        self.path = path
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS search_result (
+                query_key TEXT PRIMARY KEY,
+                sources TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    def get(self, query_key):
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sources, created_at FROM search_result WHERE query_key = ?", (query_key,)
+            ).fetchone()
+            if row is None or (self.ttl and time.time() - row[1] > self.ttl):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, query_key, sources):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_result (query_key, sources, created_at) VALUES (?, ?, ?)",
+                (query_key, json.dumps(sources), time.time())
+            )
+            # Expired rows are dead weight; sweep them whenever we write
+            if self.ttl:
+                self._conn.execute("DELETE FROM search_result WHERE created_at < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+class InFlightGroup:
+    """Collapses concurrent calls for the same key into a single upstream call.
+
+    The first caller for a key runs `fn`; callers arriving while it is still
+    running wait for and share its result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+        if not leader:
+            return call.result()
+        try:
+            result = fn(*args, **kwargs)
+            call.set_result(result)
+            return result
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
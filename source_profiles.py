@@ -0,0 +1,105 @@
+# source_profiles.py
+import json
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+from article_cache import canonicalize_url
+
+# CRAAP criteria that describe the source itself rather than how it bears on a claim
+SOURCE_CRITERIA = ('Currency', 'Authority', 'Purpose')
+# Parts of a profile shared by every page of a domain; Currency is kept per page
+DOMAIN_FIELDS = ('intent', 'Authority', 'Purpose')
+
+
+def source_domain(url):
+    host = (urlsplit(url.strip()).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class SourceProfileCache:
+    """Claim-independent parts of a source's evaluation, per canonical URL and per domain, in SQLite with a TTL.
+
+    A profile maps 'intent' to {'category', 'explanation'} and each of
+    SOURCE_CRITERIA to {'score', 'explanation'}. Pages store the whole
+    profile; their domain keeps only DOMAIN_FIELDS, so another page of a
+    known site only needs its Currency scored. `get` merges the two, with
+    the page's own values taking precedence.
+    """
+
+    def __init__(self, path, ttl=7 * 24 * 3600, enabled=True):
+        self.path = path
+        self.ttl = ttl
+        self.enabled = enabled
+        self.url_hits = 0
+        self.domain_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS source_profile (
+                profile_key TEXT PRIMARY KEY,
+                profile TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _keys(url):
+        return 'url:' + canonicalize_url(url), 'domain:' + source_domain(url)
+
+    def _load(self, key):
+        row = self._conn.execute(
+            "SELECT profile, created_at FROM source_profile WHERE profile_key = ?", (key,)
+        ).fetchone()
+        if row is None or (self.ttl and time.time() - row[1] > self.ttl):
+            return {}
+        return json.loads(row[0])
+
+    def get(self, url):
+        """The cached profile for `url` ({} if nothing is known about the page or its domain)."""
+        if not self.enabled:
+            return {}
+        url_key, domain_key = self._keys(url)
+        with self._lock:
+            page = self._load(url_key)
+            domain = self._load(domain_key)
+            if page:
+                self.url_hits += 1
+            elif domain:
+                self.domain_hits += 1
+            else:
+                self.misses += 1
+        return {**domain, **page}
+
+    def set(self, url, profile):
+        """Merge `profile` into what is stored for `url`, and its DOMAIN_FIELDS into the domain's."""
+        if not self.enabled or not profile:
+            return
+        url_key, domain_key = self._keys(url)
+        now = time.time()
+        with self._lock:
+            for key, values in ((url_key, profile),
+                                (domain_key, {name: profile[name] for name in DOMAIN_FIELDS if name in profile})):
+                if not values:
+                    continue
+                merged = {**self._load(key), **values}
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO source_profile (profile_key, profile, created_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(merged), now)
+                )
+            # Expired rows are dead weight; sweep them whenever we write
+            if self.ttl:
+                self._conn.execute("DELETE FROM source_profile WHERE created_at < ?", (now - self.ttl,))
+            self._conn.commit()
+
+    def stats(self):
+        total = self.url_hits + self.domain_hits + self.misses
+        return {
+            'url_hits': self.url_hits,
+            'domain_hits': self.domain_hits,
+            'misses': self.misses,
+            'hit_rate': (self.url_hits + self.domain_hits) / total if total else 0.0,
+        }
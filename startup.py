@@ -0,0 +1,55 @@
+# startup.py
+import threading
+
+
+class LazyObject:
+    """Stands in for an object that is only built, by `factory()`, on first attribute access.
+
+    Keeps expensive imports and clients (e.g. the Groq SDK) out of module
+    import; construction happens once even when several threads race to it.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._target = None
+        self._lock = threading.Lock()
+
+    def _resolve(self):
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    self._target = self._factory()
+        return self._target
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+
+_nltk_checked = {}
+_nltk_lock = threading.Lock()
+
+
+def ensure_nltk_data(resource, data_dir, download=False):
+    """Check once per process that an NLTK resource (e.g. 'tokenizers/punkt') is installed.
+
+    `data_dir` is searched ahead of NLTK's default paths. A missing resource
+    is downloaded into `data_dir` only when `download` is set; otherwise a
+    warning is printed. Returns whether the resource is available.
+    """
+    with _nltk_lock:
+        if resource in _nltk_checked:
+            return _nltk_checked[resource]
+        import nltk
+        if data_dir and data_dir not in nltk.data.path:
+            nltk.data.path.insert(0, data_dir)
+        try:
+            nltk.data.find(resource)
+            found = True
+        except LookupError:
+            name = resource.rsplit('/', 1)[-1]
+            found = bool(download) and nltk.download(name, download_dir=data_dir, quiet=True)
+            if not found:
+                print(f"NLTK resource '{resource}' not found; install it with "
+                      f"`python -m nltk.downloader -d {data_dir} {name}`")
+        _nltk_checked[resource] = found
+        return found
@@ -0,0 +1,236 @@
+# structured_output.py
+import json
+import re
+import threading
+
+# Score, optionally "out of" a scale, then the explanation after any dash, colon or bar:
+# "8 - ...", "7.5 – ...", "8/10 — ...", "[9] out of 10: ..."
+_SCORE = re.compile(
+    r'^\s*\[?\s*(\d+(?:\.\d+)?)\s*\]?\s*(?:(?:/|out\s+of)\s*(\d+(?:\.\d+)?))?\s*[-–—:|,.]*\s*(.*)$',
+    re.DOTALL | re.IGNORECASE
+)
+_NUMBER = re.compile(r'(\d*\.?\d+)\s*(%)?')
+
+
+def _key(name):
+    return re.sub(r'[\W_]+', '', name).lower()
+
+
+def parse_score(value):
+    """A 0-10 score with its explanation, from a number, a string or a {"score", "explanation"} object."""
+    explanation = ''
+    if isinstance(value, dict):
+        fields = {_key(name): item for name, item in value.items()}
+        explanation = str(fields.get('explanation') or fields.get('reason') or '').strip()
+        value = fields.get('score')
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        score = float(value)
+    elif isinstance(value, str):
+        match = _SCORE.match(value)
+        if not match:
+            raise ValueError(f"no score in {value!r}")
+        score = float(match.group(1))
+        if match.group(2):
+            score = score * 10 / float(match.group(2))
+        explanation = explanation or match.group(3).strip()
+    else:
+        raise ValueError(f"no score in {value!r}")
+    if not 0 <= score <= 10:
+        raise ValueError(f"score {score} is outside 0-10")
+    return {'score': score, 'explanation': explanation}
+
+
+def parse_probability(value):
+    # Accepts 0.8, "0.8", "80%" and 80 (read as a percentage)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        probability, percent = float(value), False
+    else:
+        match = _NUMBER.search(str(value))
+        if not match:
+            raise ValueError(f"no probability in {value!r}")
+        probability, percent = float(match.group(1)), bool(match.group(2))
+    if percent or 1 < probability <= 100:
+        probability /= 100
+    if not 0 <= probability <= 1:
+        raise ValueError(f"probability {probability} is outside 0-1")
+    return probability
+
+
+def category_parser(categories):
+    """Parser for a category number from `categories` ({number: name}), also accepting the name."""
+    names = {name.lower(): number for number, name in categories.items()}
+
+    def parse(value):
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and int(value) in categories:
+            return int(value)
+        text = str(value).strip()
+        match = re.match(r'\[?\s*(\d+)', text)
+        if match and int(match.group(1)) in categories:
+            return int(match.group(1))
+        for name, number in names.items():
+            if name in text.lower():
+                return number
+        raise ValueError(f"unknown category {value!r}")
+    return parse
+
+
+def parse_text(value):
+    if isinstance(value, (dict, list)):
+        raise ValueError("expected text")
+    return str(value).strip()
+
+
+class Field:
+    """One value expected in a model response: its label, a parser, and whether it must be present."""
+
+    def __init__(self, name, parse, required=True, default=None, aliases=()):
+        self.name = name
+        self.parse = parse
+        self.required = required
+        self.default = default
+        self.keys = {_key(name), *(_key(alias) for alias in aliases)}
+        labels = '|'.join(re.escape(label) for label in (name, *aliases))
+        self.line = re.compile(rf'^[\s*#>_-]*(?:{labels})[\s*_]*[:=]\s*(.+?)\s*$', re.IGNORECASE | re.MULTILINE)
+
+
+def load_json_object(text):
+    # JSON mode returns a bare object, but tolerate code fences and chatter around it
+    text = re.sub(r'^\s*```(?:json)?|```\s*$', '', text.strip())
+    start, end = text.find('{'), text.rfind('}')
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(text[start:end + 1])
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def parse_record(content, fields):
+    """Pull `fields` out of a JSON object (dict or text) or, failing that, "Label: value" lines.
+
+    Returns (values, missing, used_json). Optional fields that can't be read
+    get their default; required ones are listed in `missing`.
+    """
+    data = content if isinstance(content, dict) else load_json_object(content)
+    values = {}
+    missing = []
+    used_json = False
+    for field in fields:
+        value = None
+        if data:
+            for name, raw in data.items():
+                if _key(name) in field.keys:
+                    try:
+                        value = field.parse(raw)
+                        used_json = True
+                    except ValueError:
+                        pass
+                    break
+        if value is None and isinstance(content, str):
+            match = field.line.search(content)
+            if match:
+                try:
+                    value = field.parse(match.group(1).strip().strip('",'))
+                except ValueError:
+                    pass
+        if value is None:
+            if field.required:
+                missing.append(field.name)
+                continue
+            value = field.default
+        values[field.name] = value
+    return values, missing, used_json
+
+
+def reask_prompt(missing):
+    fields = ', '.join(f'"{name}"' for name in missing)
+    return (f"Some values in your answer were missing or unreadable: {fields}. "
+            f"Reply with a JSON object containing only these keys, in the format asked for above.")
+
+
+def json_schema_hint(describe, indent='  '):
+    # Example object for the prompt, e.g. {"Probability": [value between 0 and 1], ...}
+    lines = ',\n'.join(f'{indent}"{name}": {value}' for name, value in describe.items())
+    return f"{{\n{lines}\n{indent[:-2]}}}"
+
+
+class ParseStats:
+    """How often structured responses parse: first time, after a re-ask, or not at all."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, name, outcome, amount=1):
+        with self._lock:
+            counts = self._counts.setdefault(name, {})
+            counts[outcome] = counts.get(outcome, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            snapshot = {name: dict(counts) for name, counts in self._counts.items()}
+        for counts in snapshot.values():
+            responses = counts.get('responses', 0)
+            counts['first_pass_rate'] = counts.get('parsed', 0) / responses if responses else 0.0
+        return snapshot
+
+
+def failed_generation(error):
+    # Groq rejects JSON-mode output that isn't valid JSON, but returns the text it generated
+    body = getattr(error, 'body', None)
+    if isinstance(body, dict):
+        body = body.get('error', body)
+        if isinstance(body, dict):
+            return body.get('failed_generation')
+    return None
+
+
+def complete_json(client, stats, name, messages, json_mode=True, **kwargs):
+    """Run a completion in JSON mode and return its text.
+
+    If JSON mode rejects the output as invalid JSON, the generation Groq
+    sends back with the error is returned instead, so the tolerant parser
+    can still use it.
+    """
+    if json_mode:
+        kwargs['response_format'] = {'type': 'json_object'}
+    try:
+        response = client.chat.completions.create(messages=messages, **kwargs)
+        return response.choices[0].message.content or ''
+    except Exception as e:
+        generation = failed_generation(e)
+        if generation is None:
+            raise
+        stats.record(name, 'invalid_json')
+        return generation
+
+
+def request_record(client, stats, name, fields, messages, json_mode=True, **kwargs):
+    """Ask for one JSON record, parse it tolerantly, and re-ask once for any missing fields.
+
+    Returns (values, missing).
+    """
+    content = complete_json(client, stats, name, messages, json_mode, **kwargs)
+    stats.record(name, 'responses')
+    values, missing, used_json = parse_record(content, fields)
+    stats.record(name, 'json' if used_json else 'text_fallback')
+    if not missing:
+        stats.record(name, 'parsed')
+        return values, missing
+
+    stats.record(name, 'reasked')
+    retry_fields = [field for field in fields if field.name in missing]
+    followup = messages + [
+        {'role': 'assistant', 'content': content},
+        {'role': 'user', 'content': reask_prompt(missing)},
+    ]
+    try:
+        retry_values, missing, _ = parse_record(
+            complete_json(client, stats, name, followup, json_mode, **kwargs), retry_fields
+        )
+        values.update(retry_values)
+    except Exception as e:
+        print(f"Error re-asking for {name} fields {missing}: {e}")
+    stats.record(name, 'failed' if missing else 'recovered')
+    return values, missing